@@ -1,7 +1,7 @@
-const CACHE_NAME = 'shulkwisec-v8-media';
-const STATIC_CACHE = 'shulkwisec-static-v8';
-const MEDIA_CACHE = 'shulkwisec-media-v8';
-const DOCUMENT_CACHE = 'shulkwisec-docs-v8';
+const CACHE_NAME = 'shulkwisec-v9-media';
+const STATIC_CACHE = 'shulkwisec-static-v9';
+const MEDIA_CACHE = 'shulkwisec-media-v9';
+const DOCUMENT_CACHE = 'shulkwisec-docs-v9';
 
 const ASSETS_TO_CACHE = [
     '/',
@@ -44,6 +44,19 @@ function getCacheStrategy(request) {
     const url = new URL(request.url);
     const extension = url.pathname.split('.').pop().toLowerCase();
 
+    // Content-addressed media (/media/<hash>.<ext>): a name never changes content, cache forever
+    if (url.origin === self.location.origin && url.pathname.startsWith('/media/')) {
+        return { cache: MEDIA_CACHE, strategy: 'cache-first', maxAge: Infinity };
+    }
+
+    // Search index: shard names carry a content hash, meta.json points at the current ones
+    if (url.origin === self.location.origin && url.pathname.startsWith('/search/')) {
+        if (url.pathname.endsWith('/meta.json')) {
+            return { cache: STATIC_CACHE, strategy: 'network-first', maxAge: 60 * 60 * 1000 }; // 1 hour
+        }
+        return { cache: STATIC_CACHE, strategy: 'cache-first', maxAge: Infinity };
+    }
+
     // Media files (images, videos, GIFs)
     const mediaExtensions = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'svg', 'mp4', 'webm', 'ogg', 'mov'];
     if (mediaExtensions.includes(extension)) {
@@ -94,8 +94,13 @@ export default function BlogItem({ id, date, title, excerpt, link, pin, banner }
           return (
             <img
               src={bannerData.url}
+              srcSet={bannerData.srcSet}
+              sizes={bannerData.srcSet ? "(min-width: 768px) 768px, 100vw" : undefined}
+              width={bannerData.width}
+              height={bannerData.height}
               alt={altText}
-              className="w-full h-full object-cover"
+              className="w-full h-full object-cover bg-cover bg-center"
+              style={bannerData.placeholder ? { backgroundImage: `url(${bannerData.placeholder})` } : undefined}
               loading="lazy"
             />
           );
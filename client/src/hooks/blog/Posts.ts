@@ -25,8 +25,9 @@ export const useBlogPosts = () => {
                 reposToSync = [singleRepo];
             }
 
-            // Clean up list
-            reposToSync = reposToSync.filter(url => url && url.trim() !== "");
+            // Clean up list; sources the manager already synced are part of staticPosts
+            const syncedSources = (config?.syncedSources ?? {}) as Record<string, unknown>;
+            reposToSync = reposToSync.filter(url => url && url.trim() !== "" && !(url in syncedSources));
 
             if (reposToSync.length > 0) {
                 try {
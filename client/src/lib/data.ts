@@ -1,3 +1,4 @@
+/// <reference types="vite/client" />
 import templateData from '@/data/template.json';
 import { BlogPost } from '@/types/blog';
 import {
@@ -26,16 +27,29 @@ function decodeContent(content: string, encoding: boolean | undefined): string {
     return content;
 }
 
+// Sharded storage (blog.storage === "sharded"): bodies live in data/posts/<id>.md
+// and are split into their own chunks, fetched only when a post is opened.
+const postBodies = import.meta.glob('../data/posts/*.md', { query: '?raw', import: 'default' }) as Record<string, () => Promise<string>>;
+
+export async function loadPostContent(post: BlogPost): Promise<string> {
+    if (post.content || !post.contentFile) return post.content;
+    const loader = postBodies[`../data/${post.contentFile}`];
+    return loader ? loader() : '';
+}
+
 export const blogPosts: BlogPost[] = templateData.blog.posts.map((post: any) => ({
     id: post.id,
     date: post.date,
     title: post.title,
     excerpt: post.excerpt,
-    content: decodeContent(post.content, post.encoding),
+    content: post.contentFile ? '' : decodeContent(post.content, post.encoding),
+    contentFile: post.contentFile,
     banner: post.banner,
     tags: post.tags,
     encoding: post.encoding,
-    pin: post.pin === true
+    pin: post.pin === true,
+    source: post.source,
+    images: post.images
 }));
 
 export const siteConfig: SiteConfig = templateData.site as SiteConfig;
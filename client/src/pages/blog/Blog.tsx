@@ -13,6 +13,7 @@ import { Button } from '@/components/ui/button';
 import { siteConfig, blogPosts } from '@/lib/data';
 import { BlogPost } from '@/types/blog';
 import { useReadLater } from '@/hooks/blog/ReadLater';
+import { searchPostIds } from '@/services/blog/searchIndex';
 import { Bookmark } from 'lucide-react';
 
 export default function SimpleBlog() {
@@ -25,6 +26,8 @@ export default function SimpleBlog() {
   const [sortOrder, setSortOrder] = useState('newest');
   const [showSavedOnly, setShowSavedOnly] = useState(false);
   const [currentPage, setCurrentPage] = useState(1);
+  // Posts whose excerpt, tags or body match too, from the prebuilt index (null: not loaded/available)
+  const [indexMatches, setIndexMatches] = useState<Set<string> | null>(null);
   const POSTS_PER_PAGE = siteConfig.pagination_per_page || 6;
 
   // Handle URL parameters for App Shortcuts (e.g., /?saved=true)
@@ -40,6 +43,21 @@ export default function SimpleBlog() {
     setCurrentPage(1);
   }, [searchTerm, selectedTag, sortOrder, showSavedOnly]);
 
+  useEffect(() => {
+    setIndexMatches(null);
+    if (!searchTerm.trim()) return;
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      searchPostIds(searchTerm, language)
+        .then(ids => { if (!cancelled) setIndexMatches(ids); })
+        .catch(error => console.error("Search index unavailable", error));
+    }, 150);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchTerm, language]);
+
   const allTags = useMemo(() => {
     const tags = new Set(blogPosts.flatMap((post: BlogPost) => post.tags || []));
     return ['all', ...Array.from(tags)];
@@ -49,7 +67,8 @@ export default function SimpleBlog() {
     return blogPosts
       .filter((post: BlogPost) => {
         const title = post.title[language] || post.title['en'] || Object.values(post.title)[0] || '';
-        const matchesSearch = title.toLowerCase().includes(searchTerm.toLowerCase());
+        const matchesSearch = title.toLowerCase().includes(searchTerm.toLowerCase()) ||
+          (indexMatches !== null && indexMatches.has(post.id));
         const matchesTag = selectedTag === 'all' || (post.tags && post.tags.includes(selectedTag));
         const matchesSaved = !showSavedOnly || savedPosts.includes(post.id);
         return matchesSearch && matchesTag && matchesSaved;
@@ -65,7 +84,7 @@ export default function SimpleBlog() {
         const dateB = new Date(b.date).getTime();
         return sortOrder === 'newest' ? dateB - dateA : dateA - dateB;
       });
-  }, [searchTerm, selectedTag, sortOrder, showSavedOnly, blogPosts, language, savedPosts]);
+  }, [searchTerm, selectedTag, sortOrder, showSavedOnly, blogPosts, language, savedPosts, indexMatches]);
 
   // Pagination Logic
   const totalPages = Math.ceil(filteredAndSortedPosts.length / POSTS_PER_PAGE);
@@ -6,7 +6,7 @@ import { useBlogPosts } from '@/hooks/blog/Posts';
 import { useLanguage } from '@/contexts/Language';
 import { useTheme } from '@/contexts/Theme';
 import Giscus from '@giscus/react';
-import { commentsConfig } from '@/lib/data';
+import { commentsConfig, loadPostContent } from '@/lib/data';
 import { Badge } from '@/components/ui/badge';
 import { ArrowLeft, Pin, Play } from 'lucide-react';
 import { Button } from '@/components/ui/button';
@@ -18,13 +18,25 @@ import SEO from '@/components/layout/SEO';
 import { useMediaModal } from '@/contexts/MediaModal';
 
 import DOMPurify from 'dompurify';
-import React, { useRef, useMemo, useState } from 'react';
+import React, { useRef, useMemo, useState, useEffect } from 'react';
 import { motion, useScroll, useSpring } from 'framer-motion';
 
 import 'katex/dist/katex.min.css';
 import { useContentEnhancements } from '@/hooks/blog/ContentEnhancements';
 
-import { BlogPost as BlogPostType, BannerMedia } from '@/types/blog';
+import { BlogPost as BlogPostType, BannerMedia, ImageMeta } from '@/types/blog';
+
+// Give body images the size/placeholder the manager recorded, so they reserve space before loading.
+// `src` may come anywhere in a raw HTML tag; sizes or styles the author already set are kept.
+const sizeImages = (html: string, images?: Record<string, ImageMeta>) =>
+  !images ? html : html.replace(/<img\b[^>]*>/gi, (tag) => {
+    const src = tag.match(/\ssrc\s*=\s*(?:"([^"]*)"|'([^']*)')/i);
+    const meta = src && images[(src[1] ?? src[2]).replace(/&amp;/g, '&')];
+    if (!meta || /\s(width|height)\s*=/i.test(tag)) return tag;
+    const style = meta.placeholder && !/\sstyle\s*=/i.test(tag)
+      ? ` style="background:url(${meta.placeholder}) center/cover"` : '';
+    return `<img width="${meta.width}" height="${meta.height}"${style}${tag.slice(4)}`;
+  });
 
 // Configure DOMPurify to open external links in new tab
 DOMPurify.addHook('afterSanitizeAttributes', (node) => {
@@ -42,7 +54,7 @@ export default function BlogPost() {
   const { posts, loading } = useBlogPosts();
   const { t, language } = useLanguage();
   const { theme } = useTheme();
-  const post = posts.find((p: BlogPostType) => p.id === params?.id);
+  const listedPost = posts.find((p: BlogPostType) => p.id === params?.id);
   const contentRef = useRef<HTMLDivElement>(null);
 
   const postId = params?.id || '';
@@ -60,6 +72,22 @@ export default function BlogPost() {
   // Media modal for clickable banners
   const { showMedia } = useMediaModal();
 
+  // Sharded posts ship without a body; fetch its chunk on demand
+  const [lazyContent, setLazyContent] = useState<string | null>(null);
+  useEffect(() => {
+    setLazyContent(null);
+    if (!listedPost || listedPost.content || !listedPost.contentFile) return;
+    let isMounted = true;
+    loadPostContent(listedPost).then((content) => {
+      if (isMounted) setLazyContent(content);
+    });
+    return () => {
+      isMounted = false;
+    };
+  }, [listedPost]);
+
+  const post = listedPost && lazyContent !== null ? { ...listedPost, content: lazyContent } : listedPost;
+
   // Calculate reading metrics
   const stats = useMemo(() => {
     if (!post?.content) return { words: 0, time: 0 };
@@ -71,7 +99,7 @@ export default function BlogPost() {
   // Memoize markdown parsing
   const htmlContent = useMemo(() => {
     if (!post?.content) return '';
-    const rawHtml = marked.parse(post.content) as string;
+    const rawHtml = sizeImages(marked.parse(post.content) as string, post.images);
     return DOMPurify.sanitize(rawHtml, {
       ADD_TAGS: [
         'span', 'div', 'pre', 'code', 'svg', 'path', 'circle', 'rect',
@@ -84,7 +112,7 @@ export default function BlogPost() {
         'xlink:href', 'target', 'rel', 'id'
       ]
     });
-  }, [post?.content]);
+  }, [post?.content, post?.images]);
 
   useContentEnhancements(contentRef, htmlContent, theme);
 
@@ -241,8 +269,13 @@ export default function BlogPost() {
                     <div className="relative group cursor-pointer" onClick={handleMediaClick}>
                       <img
                         src={bannerData.url}
+                        srcSet={bannerData.srcSet}
+                        sizes={bannerData.srcSet ? "(min-width: 768px) 768px, 100vw" : undefined}
+                        width={bannerData.width}
+                        height={bannerData.height}
                         alt={altText}
-                        className="w-full h-full object-cover group-hover:opacity-95 transition-opacity"
+                        className="w-full h-full object-cover bg-cover bg-center group-hover:opacity-95 transition-opacity"
+                        style={bannerData.placeholder ? { backgroundImage: `url(${bannerData.placeholder})` } : undefined}
                         loading="lazy"
                       />
                       <div className="absolute top-4 right-4 bg-black/60 text-white px-3 py-1.5 rounded-lg text-sm opacity-0 group-hover:opacity-100 transition-opacity">
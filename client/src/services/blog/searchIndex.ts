@@ -0,0 +1,122 @@
+// Prebuilt full-text index written at build time (`python -m manager search-index`) to /search/<lang>/.
+// meta.json lists the posts and which shard file holds each term prefix; shards are
+// fetched only when a query needs them and kept for the rest of the session.
+
+interface SearchMeta {
+    version: number;
+    lang: string;
+    docs: string[];
+    shards: Record<string, string>;
+}
+
+type Shard = Record<string, number[]>;
+
+const metaCache = new Map<string, Promise<SearchMeta | null>>();
+const shardCache = new Map<string, Promise<Shard>>();
+
+// Same rules as manager/search.py tokenize(): lowercase words, CJK runs split per character
+const WORD_RE = /[\p{L}\p{N}_]+/gu;
+const CJK_RE = /[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]/;
+
+export function tokenize(text: string): string[] {
+    const tokens: string[] = [];
+    for (const word of text.toLowerCase().match(WORD_RE) ?? []) {
+        if (CJK_RE.test(word)) {
+            tokens.push(...Array.from(word));
+        } else {
+            tokens.push(word);
+        }
+    }
+    return tokens;
+}
+
+function loadMeta(language: string): Promise<SearchMeta | null> {
+    let meta = metaCache.get(language);
+    if (!meta) {
+        meta = fetch(`/search/${encodeURIComponent(language)}/meta.json`)
+            .then(res => (res.ok ? res.json() : null))
+            .catch(() => null);
+        metaCache.set(language, meta);
+    }
+    return meta;
+}
+
+function loadShard(language: string, file: string): Promise<Shard> {
+    const url = `/search/${encodeURIComponent(language)}/${file}`;
+    let shard = shardCache.get(url);
+    if (!shard) {
+        shard = fetch(url).then(res => {
+            if (!res.ok) throw new Error(`Search shard ${url}: ${res.status}`);
+            return res.json();
+        });
+        // A failed fetch may succeed next time
+        shard.catch(() => shardCache.delete(url));
+        shardCache.set(url, shard);
+    }
+    return shard;
+}
+
+// Shards are keyed by a term's first character, or its first two when that shard grew large
+function shardFile(meta: SearchMeta, term: string): string | undefined {
+    const chars = Array.from(term);
+    return meta.shards[chars.slice(0, 2).join('')] ?? meta.shards[chars[0]];
+}
+
+// Every shard that can hold a term starting with `prefix`: its own shard, or for a one-character
+// prefix whose shard was split, all the two-character shards under it
+function prefixFiles(meta: SearchMeta, prefix: string): string[] {
+    const files = Object.entries(meta.shards)
+        .filter(([key]) => key.startsWith(prefix) || prefix.startsWith(key))
+        .map(([, file]) => file);
+    return Array.from(new Set(files));
+}
+
+function decodePostings(meta: SearchMeta, deltas: number[], into: Set<string>) {
+    let doc = 0;
+    for (const delta of deltas) {
+        doc += delta;
+        into.add(meta.docs[doc]);
+    }
+}
+
+async function exactMatches(meta: SearchMeta, language: string, term: string): Promise<Set<string>> {
+    const ids = new Set<string>();
+    const file = shardFile(meta, term);
+    if (!file) return ids;
+    const shard = await loadShard(language, file);
+    if (shard[term]) decodePostings(meta, shard[term], ids);
+    return ids;
+}
+
+async function prefixMatches(meta: SearchMeta, language: string, prefix: string): Promise<Set<string>> {
+    const ids = new Set<string>();
+    const shards = await Promise.all(prefixFiles(meta, prefix).map(file => loadShard(language, file)));
+    for (const shard of shards) {
+        for (const key in shard) {
+            if (key.startsWith(prefix)) decodePostings(meta, shard[key], ids);
+        }
+    }
+    return ids;
+}
+
+/**
+ * Ids of the posts matching every term of `query` in titles, excerpts, tags or content;
+ * the last term also matches as a prefix of any length (search-as-you-type), like
+ * PostSearchIndex.search in manager/search.py.
+ * Resolves to null when no index was published for `language`.
+ */
+export async function searchPostIds(query: string, language: string): Promise<Set<string> | null> {
+    const meta = await loadMeta(language);
+    if (!meta) return null;
+
+    const terms = tokenize(query);
+    if (terms.length === 0) return null;
+
+    const last = terms[terms.length - 1];
+    const groups = await Promise.all([
+        ...Array.from(new Set(terms.slice(0, -1))).map(term => exactMatches(meta, language, term)),
+        prefixMatches(meta, language, last),
+    ]);
+
+    return groups.reduce((acc, ids) => new Set(Array.from(acc).filter(id => ids.has(id))));
+}
@@ -3,6 +3,16 @@ export interface BannerMedia {
     type?: 'image' | 'video' | 'gif' | 'embed' | 'slides' | 'doc';
     alt?: string;
     thumbnail?: string; // For videos or documents
+    srcSet?: string; // Width variants written by the manager's image pipeline
+    width?: number;
+    height?: number;
+    placeholder?: string; // Tiny blurred data: URI painted until the image loads
+}
+
+export interface ImageMeta {
+    width: number;
+    height: number;
+    placeholder?: string;
 }
 
 export interface BlogPost {
@@ -11,8 +21,17 @@ export interface BlogPost {
     title: Record<string, string>;
     excerpt: Record<string, string>;
     content: string;
+    contentFile?: string; // Sharded storage: body is loaded lazily from data/<contentFile>
     banner?: string | BannerMedia; // Support both simple string and rich media object
     tags?: string[];
     encoding?: boolean;
     pin?: boolean;
+    source?: PostSource; // Set on posts materialized from blog.externalSources
+    images?: Record<string, ImageMeta>; // Body image src -> size/placeholder, written by the manager
+}
+
+export interface PostSource {
+    repo: string;
+    path: string;
+    sha: string;
 }
@@ -0,0 +1,5 @@
+"""Sahb data manager.
+
+`app.py` is the customtkinter GUI; `python -m manager` is the headless CLI.
+Keep this module free of GUI imports so the CLI starts without tkinter.
+"""
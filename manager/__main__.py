@@ -0,0 +1,7 @@
+import sys
+
+from manager.cli import main
+
+# Guarded so worker processes (spawn start method) can import this module safely
+if __name__ == "__main__":
+    sys.exit(main())
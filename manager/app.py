@@ -1,33 +1,53 @@
 import customtkinter as ctk
 import json
 import os
+import sys
 from tkinter import messagebox
 from typing import Any, Dict
 from datetime import datetime
-import base64
 import urllib.parse
 import tkinter
 
 import shutil
-import zipfile
-import subprocess
+import queue
+import threading
 from tkinter import filedialog
 
+if __package__ in (None, ""):
+    # Launched as `python app.py` (run.bat): make the `manager` package importable
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from manager.config import PATH_CLIENT_DATA, PATH_CLIENT_PUBLIC, PATH_IMAGES, PATH_REPO_ROOT
+from manager.store import ContentStore
+from manager import posts as post_ops
+from manager.seo import generate_seo_files
+from manager import publish
+from manager.changes import PendingChanges
+from manager import images
+from manager.icons import generate_icons
+from manager.assets import AssetStore
+from manager.bundle import import_pwa_zip
+from manager.thumbs import load_thumbnail
+from manager.search import PostSearchIndex
+from manager.sources import materialize_sources
+from manager.remote import localize_media
+from manager.probe import probe_posts
+from manager import profiling
+
 # Configuration
 ctk.set_appearance_mode("Dark") 
 ctk.set_default_color_theme("blue")
 
-PATH_TO_JSON = os.path.join(os.path.dirname(__file__), "..", "client", "src", "data", "template.json")
-PATH_CLIENT_DATA = os.path.join(os.path.dirname(__file__), "..", "client", "src", "data")
-PATH_CLIENT_PUBLIC = os.path.join(os.path.dirname(__file__), "..", "client", "public")
-PATH_MANIFEST = os.path.join(PATH_CLIENT_PUBLIC, "manifest.json")
-
 # Fonts
 FONT_HEADER = ("Segoe UI", 24, "bold")
 FONT_SUBHEADER = ("Segoe UI", 18, "bold")
 FONT_LABEL = ("Segoe UI", 12)
 FONT_MONO = ("Consolas", 12)
 
+# Idle time after the last keystroke before the post body is synced/encoded
+CONTENT_SYNC_DELAY_MS = 800
+GUIDE_IMAGE_WIDTH = 380
+
 class MultilingualEntry(ctk.CTkFrame):
     def __init__(self, master, label_text, languages=None, **kwargs):
         super().__init__(master, fg_color="transparent", **kwargs)
@@ -128,6 +148,192 @@ class LabeledEntry(ctk.CTkFrame):
         widget.bind("<Button-3>", lambda e: menu.tk_popup(e.x_root, e.y_root))
 
 
+class VirtualPostList(ctk.CTkFrame):
+    """Post list that only builds widgets for the visible rows.
+
+    A fixed pool of row frames is recycled while scrolling, so the widget
+    count stays constant no matter how many posts there are.
+    """
+    ROW_HEIGHT = 52
+
+    def __init__(self, master, on_select, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.on_select = on_select
+        self.items = []
+        self.selected = None
+        self.offset = 0
+        self.rows = []
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.grid(row=0, column=0, sticky="nsew")
+        self.viewport.grid_columnconfigure(0, weight=1)
+        # Size comes from the parent only; the row pool must not grow the viewport
+        self.viewport.grid_propagate(False)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.viewport.bind("<Configure>", lambda e: self._ensure_rows(e.height))
+        self._bind_wheel(self.viewport)
+
+    def set_items(self, items, selected=None):
+        self.items = items
+        if selected is not None:
+            self.selected = selected
+        self.offset = max(0, min(self.offset, self._max_offset()))
+        self.render()
+
+    def set_selected(self, item):
+        self.selected = item
+        self.render()
+
+    # --- Scrolling ---
+    def _visible_count(self):
+        return max(1, self.viewport.winfo_height() // self.ROW_HEIGHT)
+
+    def _max_offset(self):
+        return max(0, len(self.items) - self._visible_count())
+
+    def yview(self, *args):
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.offset = int(round(float(args[1]) * len(self.items)))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self._visible_count() if args[2] == "pages" else 1)
+            self.offset += step
+        self.offset = max(0, min(self.offset, self._max_offset()))
+        self.render()
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.yview("scroll", -1, "units")
+        else:
+            self.yview("scroll", 1, "units")
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", self._on_wheel)
+        widget.bind("<Button-5>", self._on_wheel)
+
+    # --- Row pool ---
+    def _ensure_rows(self, height):
+        needed = max(1, height // self.ROW_HEIGHT + 1)
+        while len(self.rows) < needed:
+            self.rows.append(self._create_row(len(self.rows)))
+        self.render()
+
+    def _create_row(self, slot):
+        card = ctk.CTkFrame(self.viewport, border_width=1, border_color="gray30", height=self.ROW_HEIGHT - 8)
+        card.pack_propagate(False)
+        card.grid(row=slot, column=0, sticky="ew", pady=4)
+        title = ctk.CTkLabel(card, text="", font=("Segoe UI", 12, "bold"), anchor="w")
+        title.pack(fill="x", padx=5, pady=(5, 0))
+        date = ctk.CTkLabel(card, text="", font=("Segoe UI", 10), text_color="gray", anchor="w")
+        date.pack(fill="x", padx=5, pady=(0, 5))
+
+        for w in (card, title, date):
+            w.bind("<Button-1>", lambda e, s=slot: self._click(s))
+            self._bind_wheel(w)
+        return card, title, date
+
+    def _click(self, slot):
+        idx = self.offset + slot
+        if idx < len(self.items):
+            self.on_select(self.items[idx])
+
+    def render(self):
+        for slot, (card, title, date) in enumerate(self.rows):
+            idx = self.offset + slot
+            if idx >= len(self.items):
+                card.grid_remove()
+                continue
+            post = self.items[idx]
+            title.configure(text=(post.get("title") or {}).get("en", "Untitled"))
+            date.configure(text=post.get("date", "No Date"))
+            card.configure(border_color="#3498db" if post is self.selected else "gray30")
+            card.grid()
+
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self._visible_count()) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+
+class PushResult:
+    def __init__(self, error=None):
+        self.error = error
+
+
+class PushProgressPanel(ctk.CTkToplevel):
+    """Shows git output of a background push and lets the user cancel it.
+
+    The worker thread only puts output lines (and finally a `PushResult`) on
+    `self.lines`; the Tk side drains it with `after()` polling, since Tk
+    widgets must not be touched from other threads.
+    """
+    POLL_MS = 100
+
+    def __init__(self, master, on_cancel, on_done):
+        super().__init__(master)
+        self.title("Pushing updates")
+        self.geometry("640x360")
+        self.transient(master)
+        self.lines = queue.Queue()
+        self.on_cancel = on_cancel
+        self.on_done = on_done
+
+        self.status = ctk.CTkLabel(self, text="Pushing...", font=FONT_SUBHEADER)
+        self.status.pack(anchor="w", padx=15, pady=(15, 5))
+        self.progress = ctk.CTkProgressBar(self, mode="indeterminate")
+        self.progress.pack(fill="x", padx=15, pady=5)
+        self.progress.start()
+        self.log = ctk.CTkTextbox(self, font=FONT_MONO)
+        self.log.pack(fill="both", expand=True, padx=15, pady=5)
+        self.button = ctk.CTkButton(self, text="Cancel", fg_color="#c0392b", hover_color="#e74c3c", command=self.cancel)
+        self.button.pack(anchor="e", padx=15, pady=(5, 15))
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+        self.after(self.POLL_MS, self.drain)
+
+    def drain(self):
+        last_progress = False
+        while True:
+            try:
+                line = self.lines.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(line, PushResult):
+                self.log.see("end")
+                self.on_done(self, line.error)
+                return
+            # git redraws "Writing objects:  42%" style lines, replace instead of appending
+            is_progress = "%" in line and not line.startswith("$")
+            if is_progress and last_progress:
+                self.log.delete("end-2l", "end-1c")
+            self.log.insert("end", line + "\n")
+            last_progress = is_progress
+        self.log.see("end")
+        self.after(self.POLL_MS, self.drain)
+
+    def cancel(self):
+        if self.on_cancel is None:
+            self.destroy()
+            return
+        self.status.configure(text="Cancelling...")
+        self.button.configure(state="disabled")
+        self.on_cancel()
+
+    def finish(self, text):
+        self.on_cancel = None
+        self.progress.stop()
+        self.progress.configure(mode="determinate")
+        self.progress.set(1)
+        self.status.configure(text=text)
+        self.button.configure(text="Close", state="normal", fg_color="#3498db", hover_color="#2980b9")
+
+
 class DataManagerApp(ctk.CTk):
     # ... (Keep Init)
     def __init__(self):
@@ -136,13 +342,17 @@ class DataManagerApp(ctk.CTk):
         self.title("Sahb | Data Center Manager")
         self.geometry("1400x900") # Increased size for multi columns
 
+        self.store = ContentStore()
+        self.pending = PendingChanges(PATH_REPO_ROOT)  # files to stage on the next push
         self.data: Dict[str, Any] = {}
         self.manifest_data: Dict[str, Any] = {}
         self.current_post = None
+        self._content_sync_job = None
+        self.search_index = None  # built on first search, then kept up to date
         self.load_data()
         
         # Helper to get langs
-        self.get_languages = lambda: self.data.get("site", {}).get("languages", ["en", "ar"])
+        self.get_languages = self.store.get_languages
 
         # Main Layout (Sidebar + Content)
         self.grid_columnconfigure(1, weight=1)
@@ -197,12 +407,17 @@ class DataManagerApp(ctk.CTk):
         self.frame_achievements = ctk.CTkScrollableFrame(self.content_area)
         self.frame_settings = ctk.CTkScrollableFrame(self.content_area)
 
-        self.setup_dashboard()
-        self.setup_about()
-        self.setup_blog()
-        self.setup_sync() 
-        self.setup_achievements()
-        self.setup_settings()
+        # Name -> (frame, builder). Each frame is built on its first visit and kept afterwards
+        self.frames = {
+            "General Info": (self.frame_dashboard, self.setup_dashboard),
+            "About & Skills": (self.frame_about, self.setup_about),
+            "Blog Posts": (self.frame_blog, self.setup_blog),
+            "External Sync": (self.frame_sync, self.setup_sync),
+            "Achievements": (self.frame_achievements, self.setup_achievements),
+            "Settings": (self.frame_settings, self.setup_settings),
+        }
+        self.built_frames = set()
+        self.save_btn.configure(command=self.global_save_wrapper)
 
         # Default View
         self.select_frame_by_name("General Info")
@@ -303,19 +518,14 @@ class DataManagerApp(ctk.CTk):
                 btn.configure(fg_color="transparent", text_color="#a0a0a0")
 
         # Handle Frame Switching
-        self.frame_dashboard.grid_forget()
-        self.frame_about.grid_forget()
-        self.frame_blog.grid_forget()
-        self.frame_sync.grid_forget()
-        self.frame_achievements.grid_forget()
-        self.frame_settings.grid_forget()
-
-        if name == "General Info": self.frame_dashboard.grid(row=0, column=0, sticky="nsew")
-        elif name == "About & Skills": self.frame_about.grid(row=0, column=0, sticky="nsew")
-        elif name == "Blog Posts": self.frame_blog.grid(row=0, column=0, sticky="nsew")
-        elif name == "External Sync": self.frame_sync.grid(row=0, column=0, sticky="nsew")
-        elif name == "Achievements": self.frame_achievements.grid(row=0, column=0, sticky="nsew")
-        elif name == "Settings": self.frame_settings.grid(row=0, column=0, sticky="nsew")
+        for frame, _ in self.frames.values():
+            frame.grid_forget()
+
+        frame, builder = self.frames[name]
+        if name not in self.built_frames:
+            builder()
+            self.built_frames.add(name)
+        frame.grid(row=0, column=0, sticky="nsew")
 
     # ... (rest of methods)
 
@@ -330,6 +540,10 @@ class DataManagerApp(ctk.CTk):
         self.refresh_sync_list()
         
         ctk.CTkButton(f, text="+ Add Repository", command=self.add_sync_repo).pack(pady=20)
+        ctk.CTkButton(f, text="⬇️  Sync Now", command=self.sync_external_sources,
+                      fg_color="#8e44ad", hover_color="#9b59b6").pack(pady=(0, 20))
+        ctk.CTkLabel(f, text="Synced repositories are stored as static posts, so visitors make no GitHub API calls.",
+                     font=FONT_LABEL, text_color="gray").pack(anchor="w")
 
     def refresh_sync_list(self):
         for w in self.sync_container.winfo_children():
@@ -358,39 +572,59 @@ class DataManagerApp(ctk.CTk):
         # Binding
         def update_url(val):
             self.data["blog"]["externalSources"][idx] = val
+            self.store.mark_dirty()
         entry.bind("<KeyRelease>", lambda e: update_url(entry.get()))
         
         ctk.CTkButton(row, text="Remove", width=60, fg_color="#e74c3c", 
                       command=lambda: self.delete_sync_repo(idx)).grid(row=0, column=1, padx=5)
 
+    def sync_external_sources(self):
+        self.status_label.configure(text="Syncing sources...")
+        self.update_idletasks()
+        try:
+            reports = materialize_sources(self.store)
+        except Exception as e:
+            self.status_label.configure(text="Sync Failed")
+            messagebox.showerror("Sync Error", f"Failed to sync sources: {e}")
+            return
+
+        self.search_index = None
+        if "Blog Posts" in self.built_frames:
+            self.refresh_blog_list()
+        self.status_label.configure(text="Synced at " + datetime.now().strftime("%H:%M:%S"))
+        summary = "\n".join(r.summary() for r in reports) or "No GitHub URLs to sync."
+        if any(r.error for r in reports):
+            messagebox.showwarning("Sync", summary + "\n\nSave to write the posts.")
+        else:
+            messagebox.showinfo("Sync", summary + "\n\nSave to write the posts.")
+
     def add_sync_repo(self):
         if "blog" not in self.data: self.data["blog"] = {}
         if "externalSources" not in self.data["blog"]: self.data["blog"]["externalSources"] = []
         
         self.data["blog"]["externalSources"].append("")
+        self.store.mark_dirty()
         self.refresh_sync_list()
 
     def delete_sync_repo(self, idx):
         self.data["blog"]["externalSources"].pop(idx)
+        self.store.mark_dirty()
         self.refresh_sync_list()
 
     def load_data(self):
         try:
-            with open(PATH_TO_JSON, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
+            self.store.load_data()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load JSON: {e}")
-            self.data = {}
+            self.store.data = {}
+        self.data = self.store.data
 
         try:
-            if os.path.exists(PATH_MANIFEST):
-                with open(PATH_MANIFEST, 'r', encoding='utf-8') as f:
-                    self.manifest_data = json.load(f)
-            else:
-                self.manifest_data = {}
+            self.store.load_manifest()
         except Exception as e:
             messagebox.showwarning("Warning", f"Failed to load manifest.json: {e}")
-            self.manifest_data = {}
+            self.store.manifest_data = {}
+        self.manifest_data = self.store.manifest_data
 
     def save_data(self):
         # Trigger update from current edits if possible
@@ -399,13 +633,14 @@ class DataManagerApp(ctk.CTk):
 
         try:
             # Validate Skills JSON
-            skills_json = json.loads(self.skills_text.get("1.0", "end").strip())
-            self.data["about"]["skills"]["items"] = skills_json
+            if hasattr(self, 'skills_text'):
+                skills_json = json.loads(self.skills_text.get("1.0", "end").strip())
+                self.store.assign(self.data["about"]["skills"], "items", skills_json)
             
             # Save Pagination settings if exists
             if hasattr(self, 'pagination_entry'):
                 try:
-                    self.data["site"]["pagination_per_page"] = int(self.pagination_entry.get())
+                    self.store.assign(self.data["site"], "pagination_per_page", int(self.pagination_entry.get()))
                 except:
                     pass # Ignore invalid int
             
@@ -414,37 +649,30 @@ class DataManagerApp(ctk.CTk):
                 if "site" not in self.data: self.data["site"] = {}
                 if "comments" not in self.data["site"]: 
                     self.data["site"]["comments"] = {"provider": "giscus", "giscus": {}}
+                    self.store.mark_dirty()
                 
                 g_conf = self.data["site"]["comments"]["giscus"]
-                g_conf["repo"] = self.comm_repo.get()
-                g_conf["repoId"] = self.comm_repo_id.get()
-                g_conf["category"] = self.comm_cat.get()
-                g_conf["categoryId"] = self.comm_cat_id.get()
+                self.store.assign(g_conf, "repo", self.comm_repo.get())
+                self.store.assign(g_conf, "repoId", self.comm_repo_id.get())
+                self.store.assign(g_conf, "category", self.comm_cat.get())
+                self.store.assign(g_conf, "categoryId", self.comm_cat_id.get())
                 
                 # Ensure defaults if missing
+                defaults = {"mapping": "pathname", "strict": "0", "reactionsEnabled": "1", "emitMetadata": "0",
+                            "inputPosition": "top", "theme": "preferred_color_scheme", "loading": "lazy", "lang": "en"}
                 if "provider" not in self.data["site"]["comments"]:
-                    self.data["site"]["comments"]["provider"] = "giscus"
-                if "mapping" not in g_conf: g_conf["mapping"] = "pathname"
-                if "strict" not in g_conf: g_conf["strict"] = "0"
-                if "reactionsEnabled" not in g_conf: g_conf["reactionsEnabled"] = "1"
-                if "emitMetadata" not in g_conf: g_conf["emitMetadata"] = "0"
-                if "inputPosition" not in g_conf: g_conf["inputPosition"] = "top"
-                if "theme" not in g_conf: g_conf["theme"] = "preferred_color_scheme"
-                if "loading" not in g_conf: g_conf["loading"] = "lazy"
-                if "lang" not in g_conf: g_conf["lang"] = "en"
+                    self.store.assign(self.data["site"]["comments"], "provider", "giscus")
+                for key, value in defaults.items():
+                    if key not in g_conf: self.store.assign(g_conf, key, value)
 
         except Exception:
              pass 
 
         try:
-            with open(PATH_TO_JSON, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=2, ensure_ascii=False)
-            
-            if self.manifest_data:
-                with open(PATH_MANIFEST, 'w', encoding='utf-8') as f:
-                    json.dump(self.manifest_data, f, indent=2, ensure_ascii=False)
+            written = self.store.save()
+            self.pending.record(*written, *self.store.removed)
 
-            self.status_label.configure(text="Saved at " + datetime.now().strftime("%H:%M:%S"))
+            self.status_label.configure(text=f"Saved at {datetime.now().strftime('%H:%M:%S')} ({len(written)} files)")
             self.generate_seo_files()
             messagebox.showinfo("Success", "Data saved successfully and SEO files optimized!")
         except Exception as e:
@@ -453,125 +681,65 @@ class DataManagerApp(ctk.CTk):
     def generate_seo_files(self):
         """Generates sitemap.xml and robots.txt based on current data."""
         try:
-            site_url = self.data.get("site", {}).get("url", "https://shulkwisec.github.io")
-            if site_url.endswith('/'):
-                site_url = site_url[:-1]
-            
-            posts = self.data.get("blog", {}).get("posts", [])
-            today = datetime.now().strftime("%Y-%m-%d")
-
-            # 1. Sitemap.xml
-            sitemap_path = os.path.join(PATH_CLIENT_PUBLIC, "sitemap.xml")
-            sitemap_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-            sitemap_content += '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-            
-            # Home
-            sitemap_content += f'  <url>\n    <loc>{site_url}/</loc>\n    <lastmod>{today}</lastmod>\n    <changefreq>daily</changefreq>\n    <priority>1.0</priority>\n  </url>\n'
-            
-            # About
-            sitemap_content += f'  <url>\n    <loc>{site_url}/about</loc>\n    <lastmod>{today}</lastmod>\n    <changefreq>monthly</changefreq>\n    <priority>0.8</priority>\n  </url>\n'
-
-            # External Pages
-            external_pages = self.data.get("site", {}).get("external", [])
-            for page in external_pages:
-                p_url = page.get("url")
-                if p_url:
-                    if not p_url.startswith('/'):
-                        p_url = '/' + p_url
-                    sitemap_content += f'  <url>\n    <loc>{site_url}{p_url}</loc>\n    <lastmod>{today}</lastmod>\n    <changefreq>monthly</changefreq>\n    <priority>0.8</priority>\n  </url>\n'
-            
-            # Posts
-            # Posts
-            for post in posts:
-                p_id = post.get("id")
-                p_date_raw = post.get("date", today)
-                # Try parsing date
-                try:
-                    # Attempt standard formats
-                    dt = datetime.strptime(p_date_raw, "%B %d, %Y")
-                    p_date = dt.strftime("%Y-%m-%d")
-                except ValueError:
-                    try:
-                        dt = datetime.strptime(p_date_raw, "%Y-%m-%d")
-                        p_date = dt.strftime("%Y-%m-%d")
-                    except ValueError:
-                        # Fallback to today if parsing fails
-                        p_date = today
-
-                if p_id:
-                    sitemap_content += f'  <url>\n    <loc>{site_url}/post/{p_id}</loc>\n    <lastmod>{p_date}</lastmod>\n    <priority>0.7</priority>\n  </url>\n'
-
-            sitemap_content += '</urlset>'
-
-            with open(sitemap_path, 'w', encoding='utf-8') as f:
-                f.write(sitemap_content)
-
-            # 2. Robots.txt
-            robots_path = os.path.join(PATH_CLIENT_PUBLIC, "robots.txt")
-            robots_content = f"User-agent: *\nAllow: /\n\nSitemap: {site_url}/sitemap.xml"
-            with open(robots_path, 'w', encoding='utf-8') as f:
-                f.write(robots_content)
-
+            removed = []
+            self.pending.record(*generate_seo_files(self.data, removed=removed), *removed)
             print("✅ SEO files (sitemap.xml, robots.txt) generated/updated.")
         except Exception as e:
             print(f"❌ Error generating SEO files: {e}")
 
     def push_to_remote(self):
-        # Determine the root of the repository (one level up from manager)
-        repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-
-        # 1. Check git config
+        # 1. Check git install & remote
         try:
-             # Check if git is installed/configured
-             subprocess.check_output(["git", "--version"], cwd=repo_root) 
-        except:
-             messagebox.showerror("Error", "Git is not installed or not in PATH.")
-             return
+            publish.check_git(PATH_REPO_ROOT)
+        except publish.GitError as e:
+            messagebox.showerror("Git Error", str(e))
+            return
 
+        # 2. Check git config
         try:
-             user_name = subprocess.check_output(["git", "config", "user.name"], cwd=repo_root).strip()
-             user_email = subprocess.check_output(["git", "config", "user.email"], cwd=repo_root).strip()
-             if not user_name or not user_email:
+             if not publish.has_git_identity(PATH_REPO_ROOT):
                  if messagebox.askyesno("Git Config", "Git user.name/email not set. Configure now? (Uses 'Ghost' default)"):
-                      subprocess.check_call(["git", "config", "user.name", "Ghost"], cwd=repo_root)
-                      subprocess.check_call(["git", "config", "user.email", "ghost@sahb.local"], cwd=repo_root)
+                      publish.set_default_identity(PATH_REPO_ROOT)
                  else:
                       return
         except Exception as e:
              messagebox.showwarning("Git Config", f"Could not check git config: {e}")
              return
-             
-        # 2. Check remote
-        try:
-            remote = subprocess.check_output(["git", "remote", "-v"], cwd=repo_root).strip()
-            if not remote:
-                 # Check if user wants to add one? For now just error.
-                 messagebox.showerror("Git Error", "No remote repository configured. Please add a remote origin manually.")
-                 return
-        except:
-            messagebox.showerror("Git Error", "Not a git repository.")
-            return
 
-        # 3. Add, Commit, Push
-        try:
-            self.status_label.configure(text="Pushing...")
-            self.update_idletasks()
-            
-            # Execute git add from the repository root to include all changes
-            subprocess.check_call(["git", "add", "."], cwd=repo_root)
-            
-            # Check if there are changes to commit
-            status = subprocess.check_output(["git", "status", "--porcelain"], cwd=repo_root)
-            if status:
-                subprocess.check_call(["git", "commit", "-m", f"Update from Manager {datetime.now().strftime('%Y-%m-%d %H:%M')}"], cwd=repo_root)
-            
-            subprocess.check_call(["git", "push"], cwd=repo_root)
-            
+        # 3. Add, Commit, Push on a worker thread so the window stays responsive
+        cancel_event = threading.Event()
+        panel = PushProgressPanel(self, on_cancel=cancel_event.set, on_done=self._push_finished)
+        self.status_label.configure(text="Pushing...")
+        self.push_btn.configure(state="disabled")
+
+        # Only what the manager wrote gets staged, never the whole checkout
+        paths = self.pending.paths()
+        self._pushed = (paths, self.pending.generation)
+
+        def worker():
+            try:
+                with profiling.span("push_changes", files=len(paths)):
+                    publish.push_changes(PATH_REPO_ROOT, on_output=panel.lines.put, cancel_event=cancel_event, paths=paths)
+                panel.lines.put(PushResult())
+            except Exception as e:
+                panel.lines.put(PushResult(e))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _push_finished(self, panel, error):
+        self.push_btn.configure(state="normal")
+        if error is None:
+            # Files saved while the push ran stay pending for the next one
+            self.pending.discard(*self._pushed)
             self.status_label.configure(text="Pushed at " + datetime.now().strftime("%H:%M:%S"))
-            messagebox.showinfo("Success", "Successfully pushed changes to GitHub!")
-        except Exception as e:
+            text = "✅ Successfully pushed changes to GitHub!"
+        elif isinstance(error, publish.PushCancelled):
+            self.status_label.configure(text="Push Cancelled")
+            text = "Push cancelled."
+        else:
             self.status_label.configure(text="Push Failed")
-            messagebox.showerror("Push Error", f"Failed to push changes: {e}\nCheck console/logs for details.")
+            text = f"❌ Failed to push changes: {error}"
+        panel.finish(text)
     def setup_dashboard(self):
         f = self.frame_dashboard
         ctk.CTkLabel(f, text="General Information", font=FONT_HEADER).pack(anchor="w", pady=(0, 20))
@@ -609,26 +777,29 @@ class DataManagerApp(ctk.CTk):
         self.site_subtitle.set(site.get("subtitle"))
         self.site_desc.set(site.get("description"))
         self.site_url.set(site.get("url", "https://shulkwisec.github.io"))
-        
-        self.save_btn.configure(command=self.global_save_wrapper)
 
     def global_save_wrapper(self):
-        # Pull General Data
-        self.data["owner"]["name"] = self.owner_name.get()
-        self.data["owner"]["bio"] = self.owner_bio.get()
-        self.data["owner"]["email"] = self.owner_email.get()
-        
-        self.data["site"]["title"] = self.site_title.get()
-        self.data["site"]["subtitle"] = self.site_subtitle.get()
-        self.data["site"]["description"] = self.site_desc.get()
-        self.data["site"]["url"] = self.site_url.get()
+        # Frames never opened hold no edits; their data is saved as loaded
+        if "General Info" in self.built_frames:
+            self.pull_general_info()
+        if "About & Skills" in self.built_frames:
+            self.pull_about()
+        self.save_data()
+
+    def pull_general_info(self):
+        self.store.assign(self.data["owner"], "name", self.owner_name.get())
+        self.store.assign(self.data["owner"], "bio", self.owner_bio.get())
+        self.store.assign(self.data["owner"], "email", self.owner_email.get())
         
-        # Pull About Data
-        self.data["about"]["aboutTitle"] = self.about_title.get()
-        self.data["about"]["aboutText"] = self.about_text.get()
-        self.data["about"]["bio"] = self.about_bio.get()
+        self.store.assign(self.data["site"], "title", self.site_title.get())
+        self.store.assign(self.data["site"], "subtitle", self.site_subtitle.get())
+        self.store.assign(self.data["site"], "description", self.site_desc.get())
+        self.store.assign(self.data["site"], "url", self.site_url.get())
 
-        self.save_data()
+    def pull_about(self):
+        self.store.assign(self.data["about"], "aboutTitle", self.about_title.get())
+        self.store.assign(self.data["about"], "aboutText", self.about_text.get())
+        self.store.assign(self.data["about"], "bio", self.about_bio.get())
 
     # --- ABOUT ---
     def setup_about(self):
@@ -690,50 +861,11 @@ class DataManagerApp(ctk.CTk):
         t_comm.grid_columnconfigure(1, weight=1) # Form
         t_comm.grid_rowconfigure(0, weight=1)
 
-        # 1. Guide Section (Left Column)
-        guide_container = ctk.CTkFrame(t_comm, fg_color="transparent")
-        guide_container.grid(row=0, column=0, sticky="nsew", padx=(0, 10))
-        
-        ctk.CTkLabel(guide_container, text="Setup Guide", font=FONT_HEADER).pack(anchor="w", pady=(0, 10))
-        
-        guide_scroll = ctk.CTkScrollableFrame(guide_container, fg_color="transparent")
-        guide_scroll.pack(fill="both", expand=True)
-        
-        steps = [
-            ("1. Enable Discussions", "Enable 'Discussions' in your GitHub repository settings.", "enable_disccs_at_repo.png"),
-            ("2. Configure Giscus", "Visit https://giscus.app and enter your repo username/name.", "giscus_configrations_example.png"),
-            ("3. Mapping & Category", "Select 'Discussion title contains page pathname' and choose a Category (e.g. Announcements).", "select_discussion_category.png"),
-            ("4. Copy Config", "Scroll to the bottom to find the values (repoId, categoryId, etc) and paste them into the form on the right ->", "giscus_github_get_configrations_from_there.png")
-        ]
-        
-        PATH_IMAGES = os.path.join(os.path.dirname(__file__), "..", "images")
-        from PIL import Image
-        
-        for title, desc, img_name in steps:
-            step_frame = ctk.CTkFrame(guide_scroll, fg_color="#2b2b2b")
-            step_frame.pack(fill="x", pady=10, padx=5)
-            
-            ctk.CTkLabel(step_frame, text=title, font=("Segoe UI", 14, "bold"), text_color="#3498db").pack(anchor="w", padx=10, pady=(10, 5))
-            ctk.CTkLabel(step_frame, text=desc, font=FONT_LABEL, wraplength=350, justify="left").pack(anchor="w", padx=10, pady=(0, 10))
-            
-            # Load Image
-            try:
-                img_path = os.path.join(PATH_IMAGES, img_name)
-                if os.path.exists(img_path):
-                    pil_img = Image.open(img_path)
-                    w, h = pil_img.size
-                    ratio = h / w
-                    target_w = 380
-                    target_h = int(target_w * ratio)
-                    
-                    ctk_img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=(target_w, target_h))
-                    
-                    img_lbl = ctk.CTkLabel(step_frame, image=ctk_img, text="")
-                    img_lbl.pack(pady=10)
-                else:
-                    ctk.CTkLabel(step_frame, text=f"[Image not found: {img_name}]", text_color="red").pack()
-            except Exception as e:
-                ctk.CTkLabel(step_frame, text=f"[Error: {e}]", text_color="red").pack()
+        # 1. Guide Section (Left Column), filled on first visit of the tab
+        self.comments_guide = ctk.CTkFrame(t_comm, fg_color="transparent")
+        self.comments_guide.grid(row=0, column=0, sticky="nsew", padx=(0, 10))
+        self._lazy_settings_tabs = {"Comments": self.build_comments_guide}
+        tabview.configure(command=lambda: self.on_settings_tab(tabview.get()))
 
         # 2. Configuration Form (Right Column)
         form_container = ctk.CTkFrame(t_comm, fg_color="transparent")
@@ -802,7 +934,7 @@ class DataManagerApp(ctk.CTk):
         t_img = tabview.tab("Images")
         ctk.CTkLabel(t_img, text="Favicon & PWA Icons", font=FONT_SUBHEADER).pack(anchor="w", pady=10)
         
-        ctk.CTkLabel(t_img, text="Manage site icons. For full PWA support, generate assets using PWABuilder.", text_color="gray").pack(anchor="w")
+        ctk.CTkLabel(t_img, text="Manage site icons. 'Generate Icons' renders every PWA/Windows/Android/iOS size from one square image; a PWABuilder ZIP still works too.", text_color="gray").pack(anchor="w")
         link_lbl = ctk.CTkLabel(t_img, text="https://www.pwabuilder.com/imageGenerator", text_color="#3498db", cursor="hand2")
         link_lbl.pack(anchor="w", pady=(0, 10))
         link_lbl.bind("<Button-1>", lambda e: os.system("start https://www.pwabuilder.com/imageGenerator"))
@@ -811,7 +943,11 @@ class DataManagerApp(ctk.CTk):
         img_btn_frame.pack(fill="x", pady=10)
 
         ctk.CTkButton(img_btn_frame, text="Upload Favicon (Direct)", command=self.upload_favicon_direct).pack(side="left", padx=5)
+        ctk.CTkButton(img_btn_frame, text="Generate Icons from Image", fg_color="#2ecc71", hover_color="#27ae60",
+                      command=self.generate_pwa_icons).pack(side="left", padx=5)
         ctk.CTkButton(img_btn_frame, text="Upload PWA ZIP (from PWABuilder)", command=self.upload_pwa_zip).pack(side="left", padx=5)
+        ctk.CTkButton(img_btn_frame, text="Localize Remote Post Images", command=self.localize_post_media).pack(side="left", padx=5)
+        ctk.CTkButton(img_btn_frame, text="Probe Image Sizes", command=self.probe_post_images).pack(side="left", padx=5)
 
         # --- PWA Manifest Tab ---
         self.setup_pwa_manifest(tabview.tab("PWA Manifest"))
@@ -833,45 +969,128 @@ class DataManagerApp(ctk.CTk):
         # --- Swipeable Routes Tab ---
         self.setup_swipeable_routes(tabview.tab("Swipeable Routes"))
 
+    def on_settings_tab(self, name):
+        builder = self._lazy_settings_tabs.pop(name, None)
+        if builder:
+            builder()
+
+    def build_comments_guide(self):
+        guide_container = self.comments_guide
+        
+        ctk.CTkLabel(guide_container, text="Setup Guide", font=FONT_HEADER).pack(anchor="w", pady=(0, 10))
+        
+        guide_scroll = ctk.CTkScrollableFrame(guide_container, fg_color="transparent")
+        guide_scroll.pack(fill="both", expand=True)
+        
+        steps = [
+            ("1. Enable Discussions", "Enable 'Discussions' in your GitHub repository settings.", "enable_disccs_at_repo.png"),
+            ("2. Configure Giscus", "Visit https://giscus.app and enter your repo username/name.", "giscus_configrations_example.png"),
+            ("3. Mapping & Category", "Select 'Discussion title contains page pathname' and choose a Category (e.g. Announcements).", "select_discussion_category.png"),
+            ("4. Copy Config", "Scroll to the bottom to find the values (repoId, categoryId, etc) and paste them into the form on the right ->", "giscus_github_get_configrations_from_there.png")
+        ]
+        
+        for title, desc, img_name in steps:
+            step_frame = ctk.CTkFrame(guide_scroll, fg_color="#2b2b2b")
+            step_frame.pack(fill="x", pady=10, padx=5)
+            
+            ctk.CTkLabel(step_frame, text=title, font=("Segoe UI", 14, "bold"), text_color="#3498db").pack(anchor="w", padx=10, pady=(10, 5))
+            ctk.CTkLabel(step_frame, text=desc, font=FONT_LABEL, wraplength=350, justify="left").pack(anchor="w", padx=10, pady=(0, 10))
+            
+            # Load Image (scaled copy cached on disk, keyed by the source's mtime)
+            try:
+                img_path = os.path.join(PATH_IMAGES, img_name)
+                if os.path.exists(img_path):
+                    pil_img = load_thumbnail(img_path, GUIDE_IMAGE_WIDTH)
+                    
+                    ctk_img = ctk.CTkImage(light_image=pil_img, dark_image=pil_img, size=pil_img.size)
+                    
+                    img_lbl = ctk.CTkLabel(step_frame, image=ctk_img, text="")
+                    img_lbl.pack(pady=10)
+                else:
+                    ctk.CTkLabel(step_frame, text=f"[Image not found: {img_name}]", text_color="red").pack()
+            except Exception as e:
+                ctk.CTkLabel(step_frame, text=f"[Error: {e}]", text_color="red").pack()
+
     def upload_favicon_direct(self):
         file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.png;*.ico;*.jpg;*.jpeg")])
         if file_path:
             try:
-                dest = os.path.join(PATH_CLIENT_PUBLIC, "favicon.png")
-                shutil.copy2(file_path, dest)
+                self.ingest_image(file_path, "", content_addressed=False, name="favicon.png", keep_format=True)
                 messagebox.showinfo("Success", "Favicon updated successfully!")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to upload favicon: {e}")
 
+    def generate_pwa_icons(self):
+        file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.png;*.jpg;*.jpeg;*.webp")])
+        if not file_path:
+            return
+        try:
+            self.status_label.configure(text="Generating icons...")
+            self.update_idletasks()
+            written = generate_icons(file_path, PATH_CLIENT_PUBLIC, self.manifest_data)
+        except ImportError:
+            messagebox.showerror("Error", "Pillow is required: pip install -r requirements.txt")
+            return
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to generate icons: {e}")
+            return
+        finally:
+            self.status_label.configure(text="Ready")
+        self.pending.record(*written)
+        self.store.mark_dirty("manifest")
+        self.refresh_pwa_icons()
+        messagebox.showinfo("Success", f"Generated {len(written)} icons. Save to update manifest.json.")
+
+    def localize_post_media(self):
+        if self.current_post:
+            self.save_current_content(force=True)
+        try:
+            self.status_label.configure(text="Downloading images...")
+            self.update_idletasks()
+            report = localize_media(self.store)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to localize images: {e}")
+            return
+        finally:
+            self.status_label.configure(text="Ready")
+        self.pending.record(*report.written)
+        if self.current_post and self.current_post.get("id") in report.posts:
+            self.load_post_into_editor(self.current_post)
+        failed = "".join(f"\n{url}: {error}" for url, error in list(report.failed.items())[:10])
+        messagebox.showinfo("Localize Images", report.summary() + (f"\n\nFailed:{failed}" if failed else "")
+                            + "\n\nSave to update the posts.")
+
+    def probe_post_images(self):
+        if self.current_post:
+            self.save_current_content(force=True)
+        try:
+            self.status_label.configure(text="Probing images...")
+            self.update_idletasks()
+            report = probe_posts(self.store)
+        except ImportError:
+            messagebox.showerror("Error", "Pillow is required: pip install -r requirements.txt")
+            return
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to probe images: {e}")
+            return
+        finally:
+            self.status_label.configure(text="Ready")
+        messagebox.showinfo("Probe Images", report.summary() + "\n\nSave to update the posts.")
+
     def upload_pwa_zip(self):
         file_path = filedialog.askopenfilename(filetypes=[("ZIP files", "*.zip")])
         if file_path:
             try:
-                with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                    # Extract to temp or directly? User said "extract on the site configuration".
-                    # Usually PWABuilder zip has 'manifest.json' and 'images/' (or 'icons/').
-                    # We extract to client/public
-                    zip_ref.extractall(PATH_CLIENT_PUBLIC)
-                
-                # Auto-update favicon.png from extracted assets if available
-                # Common PWABuilder path: android/android-launchericon-512-512.png
-                possible_icons = [
-                    os.path.join(PATH_CLIENT_PUBLIC, "android", "android-launchericon-512-512.png"),
-                    os.path.join(PATH_CLIENT_PUBLIC, "android", "android-launchericon-192-192.png"),
-                    os.path.join(PATH_CLIENT_PUBLIC, "windows11", "Square150x150Logo.scale-200.png"),
-                    os.path.join(PATH_CLIENT_PUBLIC, "ios", "180.png")
-                ]
-                
-                dest_favicon = os.path.join(PATH_CLIENT_PUBLIC, "favicon.png")
-                
-                for icon_path in possible_icons:
-                    if os.path.exists(icon_path):
-                        shutil.copy2(icon_path, dest_favicon)
-                        break
-                
-                messagebox.showinfo("Success", "PWA assets extracted and favicon updated.")
+                # Only members listed by the bundle's icons.json/manifest.json, traversal-safe, unchanged files skipped
+                report = import_pwa_zip(file_path, PATH_CLIENT_PUBLIC, self.manifest_data)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to extract ZIP: {e}")
+                return
+            self.pending.record(*report.written)
+            if report.icons_merged:
+                self.store.mark_dirty("manifest")
+                self.refresh_pwa_icons()
+            messagebox.showinfo("Success", f"PWA assets imported: {report.summary()}.")
 
     def upload_ext_page(self):
         file_path = filedialog.askopenfilename(filetypes=[("Markdown files", "*.md"), ("All files", "*.*")])
@@ -880,6 +1099,7 @@ class DataManagerApp(ctk.CTk):
                 filename = os.path.basename(file_path)
                 dest = os.path.join(PATH_CLIENT_DATA, filename)
                 shutil.copy2(file_path, dest)
+                self.pending.record(dest)
                 
                 # Add to external links
                 if "site" not in self.data: self.data["site"] = {}
@@ -892,6 +1112,7 @@ class DataManagerApp(ctk.CTk):
                 }
                 
                 self.data["site"]["external"].append(new_link)
+                self.store.mark_dirty()
                 self.refresh_ext_links()
                 messagebox.showinfo("Success", f"Uploaded {filename} and added link.")
                 
@@ -919,6 +1140,7 @@ class DataManagerApp(ctk.CTk):
             langs.append(code)
             if "site" not in self.data: self.data["site"] = {}
             self.data["site"]["languages"] = langs
+            self.store.mark_dirty()
             self.new_lang_code.delete(0, "end")
             self.refresh_supported_languages()
             self.refresh_translations() # Re-render translation rows with new column
@@ -930,6 +1152,7 @@ class DataManagerApp(ctk.CTk):
             if lang in langs:
                  langs.remove(lang)
                  self.data["site"]["languages"] = langs
+                 self.store.mark_dirty()
                  self.refresh_supported_languages()
                  self.refresh_translations()
                  messagebox.showinfo("Wait", "Please restart the application to apply changes fully.")
@@ -968,6 +1191,7 @@ class DataManagerApp(ctk.CTk):
              def update_t(k=key, l=lang, e=entry):
                  if k not in self.data["translations"]: self.data["translations"][k] = {}
                  self.data["translations"][k][l] = e.get()
+                 self.store.mark_dirty()
              
              entry.bind("<KeyRelease>", lambda e, k=key, l=lang, ent=entry: update_t(k, l, ent))
 
@@ -989,12 +1213,14 @@ class DataManagerApp(ctk.CTk):
             return
             
         self.data["translations"][new_key] = {"en": "", "ar": ""}
+        self.store.mark_dirty()
         self.new_key_entry.delete(0, "end")
         self.refresh_translations()
 
     def delete_translation(self, key):
         if messagebox.askyesno("Confirm", f"Delete translation key '{key}'?"):
             del self.data["translations"][key]
+            self.store.mark_dirty()
             self.refresh_translations()
 
     def refresh_ext_links(self):
@@ -1021,6 +1247,7 @@ class DataManagerApp(ctk.CTk):
             def update_ext_link(idx=i, nf=name_frames, ue=url_entry):
                 self.data["site"]["external"][idx]["name"] = nf.get()
                 self.data["site"]["external"][idx]["url"] = ue.get()
+                self.store.mark_dirty()
                 
             name_frames.bind_change(lambda x: update_ext_link())
             url_entry.bind("<KeyRelease>", lambda x: update_ext_link())
@@ -1036,10 +1263,12 @@ class DataManagerApp(ctk.CTk):
         name_dict = {l: ("New Link" if l == 'en' else f"New Link ({l})") for l in langs}
         
         self.data["site"]["external"].append({"name": name_dict, "url": "#"})
+        self.store.mark_dirty()
         self.refresh_ext_links()
 
     def delete_ext_link(self, idx):
         self.data["site"]["external"].pop(idx)
+        self.store.mark_dirty()
         self.refresh_ext_links()
 
     # --- BLOG (Enhanced) ---
@@ -1052,15 +1281,19 @@ class DataManagerApp(ctk.CTk):
         # Left Column: Post List
         list_container = ctk.CTkFrame(self.frame_blog, corner_radius=0)
         list_container.grid(row=0, column=0, sticky="nsew", padx=(0, 10))
-        list_container.grid_rowconfigure(1, weight=1)
+        list_container.grid_rowconfigure(2, weight=1)
         list_container.grid_columnconfigure(0, weight=1)
 
         ctk.CTkLabel(list_container, text="Posts", font=FONT_SUBHEADER).grid(row=0, column=0, padx=10, pady=10, sticky="w")
-        self.post_scroll = ctk.CTkScrollableFrame(list_container, fg_color="transparent")
-        self.post_scroll.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        self.post_search = ctk.CTkEntry(list_container, placeholder_text="Search title, tags, content...")
+        self.post_search.grid(row=1, column=0, sticky="ew", padx=10, pady=(0, 5))
+        self.post_search.bind("<KeyRelease>", lambda e: self.refresh_blog_list())
+
+        self.post_list = VirtualPostList(list_container, on_select=self.load_post_into_editor)
+        self.post_list.grid(row=2, column=0, sticky="nsew", padx=5, pady=5)
 
         add_btn = ctk.CTkButton(list_container, text="+ New Post", command=self.add_post)
-        add_btn.grid(row=2, column=0, padx=10, pady=10, sticky="ew")
+        add_btn.grid(row=3, column=0, padx=10, pady=10, sticky="ew")
 
         # Right Column: Editor
         self.editor_container = ctk.CTkScrollableFrame(self.frame_blog, corner_radius=10)
@@ -1073,42 +1306,21 @@ class DataManagerApp(ctk.CTk):
             self.load_post_into_editor(posts[0])
 
     def refresh_blog_list(self):
-        for widget in self.post_scroll.winfo_children():
-            widget.destroy()
-        
         posts = self.data.get("blog", {}).get("posts", [])
-        for post in posts:
-            self.create_post_card(post)
-
-    def create_post_card(self, post):
-        card = ctk.CTkFrame(self.post_scroll, border_width=1, border_color="gray30")
-        card.pack(fill="x", pady=4)
-        
-        # Title
-        title = post.get("title", {}).get("en", "Untitled")
-        lbl = ctk.CTkLabel(card, text=title, font=("Segoe UI", 12, "bold"), anchor="w")
-        lbl.pack(fill="x", padx=5, pady=(5,0))
-        
-        # Date
-        date = post.get("date", "No Date")
-        ctk.CTkLabel(card, text=date, font=("Segoe UI", 10), text_color="gray", anchor="w").pack(fill="x", padx=5, pady=(0, 5))
-
-        # Make clicking the card load the post
-        card.bind("<Button-1>", lambda e, p=post: self.load_post_into_editor(p))
-        lbl.bind("<Button-1>", lambda e, p=post: self.load_post_into_editor(p))
-
-    def load_post_into_editor(self, post):
-        if self.current_post:
-            self.save_current_post_edits()
-        
-        self.current_post = post
-        
-        # Clear Editor
-        for widget in self.editor_container.winfo_children():
-            widget.destroy()
+        query = self.post_search.get().strip()
+        if query:
+            if self.search_index is None:
+                self.search_index = PostSearchIndex()
+                self.search_index.build(posts)
+            posts = self.search_index.search(query)
+        self.post_list.set_items(posts, selected=self.current_post)
+
+    def build_post_editor(self):
+        """Creates the post editor form once; load_post_into_editor only repopulates it."""
+        form = self.post_form = ctk.CTkFrame(self.editor_container, fg_color="transparent")
 
         # Header
-        header_frame = ctk.CTkFrame(self.editor_container, fg_color="transparent")
+        header_frame = ctk.CTkFrame(form, fg_color="transparent")
         header_frame.pack(fill="x", pady=10)
         ctk.CTkLabel(header_frame, text="Editing Post", font=FONT_HEADER).pack(side="left")
         
@@ -1117,14 +1329,12 @@ class DataManagerApp(ctk.CTk):
         del_btn.pack(side="right")
 
         # Fields
-        self.edit_id = LabeledEntry(self.editor_container, "ID (Slug)")
-        self.edit_id.set(post.get("id"))
+        self.edit_id = LabeledEntry(form, "ID (Slug)")
         self.edit_id.pack(fill="x", pady=5)
         self.edit_id.bind_change(lambda v: self.update_post_field("id", v))
         self.edit_id.enable_context_menu()
         
-        self.edit_date = LabeledEntry(self.editor_container, "Date")
-        self.edit_date.set(post.get("date"))
+        self.edit_date = LabeledEntry(form, "Date")
         self.edit_date.pack(fill="x", pady=5)
         self.edit_date.bind_change(lambda v: self.update_post_field("date", v))
         self.edit_date.enable_context_menu()
@@ -1132,84 +1342,122 @@ class DataManagerApp(ctk.CTk):
         # Multilingual Fields
         langs = self.get_languages()
 
-        self.edit_title = MultilingualEntry(self.editor_container, "Title", languages=langs)
-        self.edit_title.set(post.get("title"))
+        self.edit_title = MultilingualEntry(form, "Title", languages=langs)
         self.edit_title.pack(fill="x", pady=5)
         self.edit_title.bind_change(lambda v: self.update_post_field("title", v))
         self.edit_title.enable_context_menu()
 
-        self.edit_excerpt = MultilingualEntry(self.editor_container, "Excerpt", languages=langs)
-        self.edit_excerpt.set(post.get("excerpt"))
+        self.edit_excerpt = MultilingualEntry(form, "Excerpt", languages=langs)
         self.edit_excerpt.pack(fill="x", pady=5)
         self.edit_excerpt.bind_change(lambda v: self.update_post_field("excerpt", v))
         self.edit_excerpt.enable_context_menu()
 
-        self.edit_tags = LabeledEntry(self.editor_container, "Tags (comma separated)")
-        self.edit_tags.set(", ".join(post.get("tags", [])))
+        banner_row = ctk.CTkFrame(form, fg_color="transparent")
+        banner_row.pack(fill="x", pady=5)
+        self.edit_banner = LabeledEntry(banner_row, "Banner (image URL)")
+        self.edit_banner.pack(side="left", fill="x", expand=True)
+        self.edit_banner.bind_change(self.update_post_banner)
+        self.edit_banner.enable_context_menu()
+        ctk.CTkButton(banner_row, text="Upload", width=80, command=self.upload_post_banner).pack(side="left", padx=(5, 0), anchor="s")
+
+        self.edit_tags = LabeledEntry(form, "Tags (comma separated)")
         self.edit_tags.pack(fill="x", pady=5)
         self.edit_tags.bind_change(lambda v: self.update_post_field("tags", [t.strip() for t in v.split(",") if t.strip()]))
         self.edit_tags.enable_context_menu()
 
         # Options Row
-        opts_frame = ctk.CTkFrame(self.editor_container, fg_color="transparent")
+        opts_frame = ctk.CTkFrame(form, fg_color="transparent")
         opts_frame.pack(fill="x", pady=5)
 
         # Pin
-        self.pin_var = ctk.BooleanVar(value=post.get("pin", False))
+        self.pin_var = ctk.BooleanVar(value=False)
         ctk.CTkCheckBox(opts_frame, text="Pin Post", variable=self.pin_var, 
                         command=lambda: self.update_post_field("pin", self.pin_var.get())).pack(side="left", padx=(0, 20))
 
-        # Check for Encoding State
-        raw_content = post.get("content", "")
-        was_encoded = post.get("encoding", False)
-        
-        # Helper detection checks
-        decoded_text = raw_content
-        
-        if not was_encoded and len(raw_content) > 0:
-            # Auto-detect Base64 (heuristic)
-            try:
-                candidate_bytes = base64.b64decode(raw_content)
-                candidate_str = candidate_bytes.decode('utf-8')
-                
-                # Ensure line endings are normalized
-                candidate_str = candidate_str.replace('\r\n', '\n')
-                
-                decoded_text = candidate_str
-                was_encoded = True
-                post["encoding"] = True
-            except:
-                pass
-        elif was_encoded:
-            try:
-                candidate_bytes = base64.b64decode(raw_content)
-                candidate_str = candidate_bytes.decode('utf-8')
-                candidate_str = candidate_str.replace('\r\n', '\n')
-                decoded_text = candidate_str
-            except Exception as e:
-                decoded_text = f"Error decoding: {e}\n\n{raw_content}"
-
         # Encoding Toggle
-        self.is_encoded_var = ctk.BooleanVar(value=was_encoded)
+        self.is_encoded_var = ctk.BooleanVar(value=False)
         ctk.CTkCheckBox(opts_frame, text="Encode Content (Base64)", variable=self.is_encoded_var, 
                         command=self.toggle_encoding).pack(side="left")
 
-        ctk.CTkLabel(self.editor_container, text="Content (Markdown)", font=FONT_LABEL).pack(anchor="w", pady=(10,0))
-        self.edit_content = ctk.CTkTextbox(self.editor_container, height=400, font=FONT_MONO)
+        ctk.CTkLabel(form, text="Content (Markdown)", font=FONT_LABEL).pack(anchor="w", pady=(10,0))
+        self.edit_content = ctk.CTkTextbox(form, height=400, font=FONT_MONO)
         self.edit_content.pack(fill="x", pady=5)
         
-        # Insert the resolved text
-        self.edit_content.insert("1.0", decoded_text)
-        
         # Context Menu for Textbox
         self.create_context_menu(self.edit_content._textbox)
         
-        # Content auto-save binding
-        self.edit_content.bind("<KeyRelease>", lambda e: self.save_current_content())
+        # Content auto-save binding (debounced, the body is only pulled & encoded once typing pauses)
+        self.edit_content.bind("<KeyRelease>", lambda e: self.schedule_content_sync())
+
+    def load_post_into_editor(self, post):
+        if self.current_post:
+            self.save_current_post_edits()
+        
+        self.current_post = post
+        self.post_list.set_selected(post)
+
+        if not hasattr(self, "post_form"):
+            self.build_post_editor()
+
+        # Repopulate the existing widgets
+        self.edit_id.set(post.get("id"))
+        self.edit_date.set(post.get("date"))
+        self.edit_title.set(post.get("title"))
+        self.edit_excerpt.set(post.get("excerpt"))
+        banner = post.get("banner")
+        self.edit_banner.set(banner.get("url", "") if isinstance(banner, dict) else banner)
+        self.edit_tags.set(", ".join(post.get("tags", [])))
+        self.pin_var.set(post.get("pin", False))
+
+        # Check for Encoding State
+        decoded_text, was_encoded = post_ops.decode_content(post)
+        if was_encoded:
+            post["encoding"] = True
+        self.is_encoded_var.set(was_encoded)
+
+        # Insert the resolved text
+        self.edit_content.delete("1.0", "end")
+        self.edit_content.insert("1.0", decoded_text)
+        self.edit_content._textbox.edit_modified(False)
+        self.edit_content._textbox.yview_moveto(0)
+
+        if not self.post_form.winfo_manager():
+            self.post_form.pack(fill="both", expand=True)
+
+    def update_post_banner(self, url):
+        banner = self.current_post.get("banner") if self.current_post else None
+        if isinstance(banner, dict):
+            # Variants/dimensions belong to the old file, only keep descriptive fields
+            banner = {k: v for k, v in banner.items() if k in ("type", "alt", "thumbnail")}
+            banner["url"] = url
+            self.update_post_field("banner", banner)
+        else:
+            self.update_post_field("banner", url)
+
+    def upload_post_banner(self):
+        if not self.current_post:
+            return
+        file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.png;*.jpg;*.jpeg;*.webp;*.gif")])
+        if not file_path:
+            return
+        try:
+            name = self.current_post.get("id", "banner") + os.path.splitext(file_path)[1]
+            result = self.ingest_image(file_path, "images/posts", name=name)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to upload image: {e}")
+            return
+        banner = {"url": result.src, "type": "gif" if result.type == "image/gif" else "image"}
+        if result.variants:
+            banner.update(srcSet=result.srcset(), width=result.width, height=result.height)
+        self.update_post_field("banner", banner)
+        self.edit_banner.set(result.src)
 
     def update_post_field(self, key, value):
         if self.current_post:
             self.current_post[key] = value
+            self.store.mark_post_dirty(self.current_post)
+            if self.search_index is not None:
+                self.search_index.update_field(self.current_post, key)
 
     def create_context_menu(self, widget):
         menu = tkinter.Menu(widget, tearoff=0)
@@ -1220,65 +1468,70 @@ class DataManagerApp(ctk.CTk):
         menu.add_command(label="Select All", command=lambda: widget.event_generate("<<SelectAll>>"))
         widget.bind("<Button-3>", lambda e: menu.tk_popup(e.x_root, e.y_root))
 
-    def save_current_content(self):
-        if self.current_post:
-            content = self.edit_content.get("1.0", "end").strip()
-            
-            if self.is_encoded_var.get():
-                try:
-                    # STRICT Base64 encoding (No URL Quote)
-                    # This ensures cleanest data and no "escaped char" confusion
-                    encoded = base64.b64encode(content.encode('utf-8')).decode('utf-8')
-                    self.current_post["content"] = encoded
-                    self.current_post["encoding"] = True
-                except:
-                     self.current_post["content"] = content
-                     self.current_post["encoding"] = False 
-            else:
-                self.current_post["content"] = content
-                self.current_post["encoding"] = False
+    def schedule_content_sync(self):
+        # Cheap per keystroke: nothing to do until the Text widget reports a change
+        if not self.edit_content._textbox.edit_modified():
+            return
+        self.cancel_content_sync()
+        self._content_sync_job = self.after(CONTENT_SYNC_DELAY_MS, self.save_current_content)
+
+    def cancel_content_sync(self):
+        if self._content_sync_job is not None:
+            self.after_cancel(self._content_sync_job)
+            self._content_sync_job = None
+
+    def save_current_content(self, force=False):
+        self.cancel_content_sync()
+        if not self.current_post:
+            return
+        # Skip pulling/encoding the whole body when it wasn't edited since the last sync
+        if not force and not self.edit_content._textbox.edit_modified():
+            return
+
+        content = self.edit_content.get("1.0", "end").strip()
+        stored, encoding = post_ops.encode_content(content, self.is_encoded_var.get())
+        if self.current_post.get("content") != stored or self.current_post.get("encoding") != encoding:
+            self.current_post["content"] = stored
+            self.current_post["encoding"] = encoding
+            self.store.mark_post_dirty(self.current_post)
+            post_ops.remember_decoded(self.current_post, content)
+            if self.search_index is not None:
+                self.search_index.update_field(self.current_post, "content")
+        self.edit_content._textbox.edit_modified(False)
 
     def toggle_encoding(self):
         # Trigger save to re-process content based on new checkbox state
-        self.save_current_content()
+        self.save_current_content(force=True)
 
     def save_current_post_edits(self):
         if not self.current_post: return
         self.save_current_content()
 
     def add_post(self):
-        langs = self.get_languages()
-        
-        # Initial empty values for all configured languages
-        title_dict = {l: (f"New Post ({l.upper()})" if l == 'en' else f"New Post ({l})") for l in langs}
-        excerpt_dict = {l: "Summary..." for l in langs}
-        
-        new_post = {
-            "id": "new-post-" + datetime.now().strftime("%Y%m%d%H%M%S"),
-            "date": datetime.now().strftime("%B %d, %Y"),
-            "title": title_dict,
-            "excerpt": excerpt_dict,
-            "content": "# Content",
-            "tags": [],
-            "pin": False
-        }
+        new_post = post_ops.new_post(self.get_languages())
         if "blog" not in self.data:
             self.data["blog"] = {"posts": []}
         if "posts" not in self.data["blog"]:
             self.data["blog"]["posts"] = []
             
         self.data["blog"]["posts"].insert(0, new_post)
+        self.store.mark_post_dirty(new_post)
+        if self.search_index is not None:
+            self.search_index.add_post(new_post)
         self.refresh_blog_list()
         self.load_post_into_editor(new_post)
 
     def delete_current_post(self):
         if messagebox.askyesno("Confirm", "Delete this post?"):
             self.data["blog"]["posts"].remove(self.current_post)
+            self.store.mark_dirty()
+            if self.search_index is not None:
+                self.search_index.remove_post(self.current_post)
+            self.cancel_content_sync()
             self.current_post = None
             self.refresh_blog_list()
-            # Clear editor
-            for widget in self.editor_container.winfo_children():
-                widget.destroy()
+            # Hide the editor (kept for the next post)
+            self.post_form.pack_forget()
 
     # --- ACHIEVEMENTS ---
     def setup_achievements(self):
@@ -1319,6 +1572,7 @@ class DataManagerApp(ctk.CTk):
         # Real-time binding
         def update_ach(data, key):
             ach[key] = data
+            self.store.mark_dirty()
             
         f_title.bind_change(lambda d: update_ach(d, "title"))
         f_sub.bind_change(lambda d: update_ach(d, "subtitle"))
@@ -1336,10 +1590,12 @@ class DataManagerApp(ctk.CTk):
         s_dict = {l: "Desc" for l in langs}
         
         self.data["achievements"].append({"title": t_dict, "subtitle": s_dict, "fallback": "#"})
+        self.store.mark_dirty()
         self.refresh_achievements()
 
     def delete_ach(self, idx):
         self.data["achievements"].pop(idx)
+        self.store.mark_dirty()
         self.refresh_achievements()
 
     # --- SWIPEABLE ROUTES ---
@@ -1357,6 +1613,7 @@ class DataManagerApp(ctk.CTk):
         self.swipe_all_var = ctk.BooleanVar(value=("*" in routes))
         
         def toggle_all():
+            self.store.mark_dirty()
             if self.swipe_all_var.get():
                 self.data["site"]["swipeableRoutes"] = ["*"]
                 self.refresh_swipe_routes() 
@@ -1394,6 +1651,7 @@ class DataManagerApp(ctk.CTk):
                  # Ensure we are updating the list in place
                  if idx < len(self.data["site"]["swipeableRoutes"]):
                     self.data["site"]["swipeableRoutes"][idx] = val
+                    self.store.mark_dirty()
             
             # Using simple lambda binding (careful with closure)
             entry.bind("<KeyRelease>", lambda e, idx=i, ent=entry: update_r(ent.get(), idx))
@@ -1405,10 +1663,12 @@ class DataManagerApp(ctk.CTk):
 
     def add_swipe_route(self):
          self.data["site"]["swipeableRoutes"].append("")
+         self.store.mark_dirty()
          self.refresh_swipe_routes()
 
     def delete_swipe_route(self, idx):
          self.data["site"]["swipeableRoutes"].pop(idx)
+         self.store.mark_dirty()
          self.refresh_swipe_routes()
 
     # --- PWA MANIFEST ---
@@ -1530,25 +1790,47 @@ class DataManagerApp(ctk.CTk):
         self.pwa_id.pack(fill="x", pady=5)
         self.pwa_id.bind_change(lambda v: self.update_manifest_field("id", v))
 
-    def upload_image_to_path(self, subfolder="icons"):
-        """Helper to upload an image and return web-relative path"""
+    def upload_image_to_path(self, subfolder="icons", photo=False, entry=None):
+        """Helper to upload an image and return web-relative path.
+
+        Icons keep their format/size; photos (screenshots, banners) are
+        downscaled to WebP with width variants. `entry` (a manifest icon or
+        screenshot dict) gets its `sizes`/`type` filled from the result.
+        """
         file_path = filedialog.askopenfilename(filetypes=[("Image files", "*.png;*.jpg;*.jpeg;*.svg;*.webp;*.ico")])
         if file_path:
             try:
-                dest_dir = os.path.join(PATH_CLIENT_PUBLIC, subfolder)
-                os.makedirs(dest_dir, exist_ok=True)
-                
-                filename = os.path.basename(file_path)
-                dest_path = os.path.join(dest_dir, filename)
-                shutil.copy2(file_path, dest_path)
-                
-                return f"/{subfolder}/{filename}" if subfolder else f"/{filename}"
+                result = self.ingest_image(file_path, subfolder, keep_format=not photo)
+                if entry is not None and result.width:
+                    entry["sizes"] = f"{result.width}x{result.height}"
+                    entry["type"] = result.type
+                return result.src
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to upload image: {e}")
         return None
 
+    def ingest_image(self, file_path, subfolder, content_addressed=True, **options):
+        """Runs an upload through the image pipeline (plain copy if Pillow is missing).
+
+        Results are moved into the content-addressed /media/ store unless
+        `content_addressed` is False (files other code refers to by name).
+        """
+        dest_dir = os.path.join(PATH_CLIENT_PUBLIC, subfolder)
+        try:
+            result = images.optimize_image(file_path, dest_dir, web_prefix=subfolder, **options)
+        except ImportError:
+            os.makedirs(dest_dir, exist_ok=True)
+            filename = options.get("name") or os.path.basename(file_path)
+            dest_path = os.path.join(dest_dir, filename)
+            shutil.copy2(file_path, dest_path)
+            result = images.ImageResult(src=f"/{subfolder}/{filename}" if subfolder else f"/{filename}", files=[dest_path])
+        if content_addressed:
+            result = AssetStore(PATH_CLIENT_PUBLIC).store_image_result(result)
+        self.pending.record(*result.files)
+        return result
+
     def update_manifest_field(self, key, value):
-        self.manifest_data[key] = value
+        self.store.assign(self.manifest_data, key, value, section="manifest")
 
     def refresh_pwa_icons(self):
         for w in self.pwa_icons_container.winfo_children():
@@ -1565,11 +1847,13 @@ class DataManagerApp(ctk.CTk):
             f_src.pack(side="left", padx=5, pady=5, fill="x", expand=True)
 
             def upload_icon_btn(e=f_src, idx=i):
-                path = self.upload_image_to_path("icons")
+                path = self.upload_image_to_path("icons", entry=self.manifest_data["icons"][idx])
                 if path:
                     e.delete(0, "end")
                     e.insert(0, path)
                     self.manifest_data["icons"][idx]["src"] = path
+                    self.store.mark_dirty("manifest")
+                    self.refresh_pwa_icons()
 
             ctk.CTkButton(row, text="Upload", width=60, command=upload_icon_btn).pack(side="left", padx=2)
             
@@ -1586,6 +1870,7 @@ class DataManagerApp(ctk.CTk):
                 self.manifest_data["icons"][idx]["src"] = s.get()
                 self.manifest_data["icons"][idx]["sizes"] = sz.get()
                 self.manifest_data["icons"][idx]["type"] = t.get()
+                self.store.mark_dirty("manifest")
             
             f_src.bind("<KeyRelease>", lambda e: update_icon())
             f_sizes.bind("<KeyRelease>", lambda e: update_icon())
@@ -1597,10 +1882,12 @@ class DataManagerApp(ctk.CTk):
     def add_pwa_icon(self):
         if "icons" not in self.manifest_data: self.manifest_data["icons"] = []
         self.manifest_data["icons"].append({"src": "", "sizes": "512x512", "type": "image/png", "purpose": "any"})
+        self.store.mark_dirty("manifest")
         self.refresh_pwa_icons()
 
     def delete_pwa_icon(self, idx):
         self.manifest_data["icons"].pop(idx)
+        self.store.mark_dirty("manifest")
         self.refresh_pwa_icons()
 
     def refresh_pwa_screenshots(self):
@@ -1624,11 +1911,13 @@ class DataManagerApp(ctk.CTk):
             f_src.pack(side="left", fill="x", expand=True, padx=(5, 2), pady=2)
 
             def upload_ss_btn(e=f_src, idx=i):
-                path = self.upload_image_to_path("Presentation")
+                path = self.upload_image_to_path("Presentation", photo=True, entry=self.manifest_data["screenshots"][idx])
                 if path:
                     e.delete(0, "end")
                     e.insert(0, path)
                     self.manifest_data["screenshots"][idx]["src"] = path
+                    self.store.mark_dirty("manifest")
+                    self.refresh_pwa_screenshots()
 
             ctk.CTkButton(r1, text="Upload", width=60, command=upload_ss_btn).pack(side="left", padx=2, pady=2)
             
@@ -1655,6 +1944,7 @@ class DataManagerApp(ctk.CTk):
                 self.manifest_data["screenshots"][idx]["label"] = l.get()
                 self.manifest_data["screenshots"][idx]["sizes"] = sz.get()
                 self.manifest_data["screenshots"][idx]["form_factor"] = ff.get()
+                self.store.mark_dirty("manifest")
             
             f_src.bind("<KeyRelease>", lambda e: update_ss())
             f_label.bind("<KeyRelease>", lambda e: update_ss())
@@ -1667,10 +1957,12 @@ class DataManagerApp(ctk.CTk):
     def add_pwa_screenshot(self):
         if "screenshots" not in self.manifest_data: self.manifest_data["screenshots"] = []
         self.manifest_data["screenshots"].append({"src": "", "sizes": "1920x1080", "type": "image/png", "form_factor": "wide", "label": ""})
+        self.store.mark_dirty("manifest")
         self.refresh_pwa_screenshots()
 
     def delete_pwa_screenshot(self, idx):
         self.manifest_data["screenshots"].pop(idx)
+        self.store.mark_dirty("manifest")
         self.refresh_pwa_screenshots()
 
     def refresh_pwa_shortcuts(self):
@@ -1722,6 +2014,7 @@ class DataManagerApp(ctk.CTk):
                         self.manifest_data["shortcuts"][idx]["icons"] = [{"src": path, "sizes": "192x192"}]
                     else:
                         self.manifest_data["shortcuts"][idx]["icons"][0]["src"] = path
+                    self.store.mark_dirty("manifest")
 
             ctk.CTkButton(col3, text="Upload Icon", width=100, command=upload_sc_icon).pack(pady=2)
 
@@ -1734,6 +2027,7 @@ class DataManagerApp(ctk.CTk):
                 sc_item["url"] = u.get()
                 if "icons" not in sc_item: sc_item["icons"] = [{"src": ic.get(), "sizes": "192x192"}]
                 else: sc_item["icons"][0]["src"] = ic.get()
+                self.store.mark_dirty("manifest")
             
             f_name.bind("<KeyRelease>", lambda e: update_sc())
             f_desc.bind("<KeyRelease>", lambda e: update_sc())
@@ -1747,12 +2041,22 @@ class DataManagerApp(ctk.CTk):
     def add_pwa_shortcut(self):
         if "shortcuts" not in self.manifest_data: self.manifest_data["shortcuts"] = []
         self.manifest_data["shortcuts"].append({"name": "New Shortcut", "short_name": "New", "description": "", "url": "/", "icons": [{"src": "/favicon.png", "sizes": "192x192"}]})
+        self.store.mark_dirty("manifest")
         self.refresh_pwa_shortcuts()
 
     def delete_pwa_shortcut(self, idx):
         self.manifest_data["shortcuts"].pop(idx)
+        self.store.mark_dirty("manifest")
         self.refresh_pwa_shortcuts()
 
+# Spans recorded when profiling is on (SAHB_PROFILE=<report.json> or --profile <report.json>)
+profiling.profiler.instrument(DataManagerApp, "load_data", "setup_*", "build_*", "refresh_*",
+                              "save_data", "push_to_remote", "select_frame_by_name")
+
 if __name__ == "__main__":
-    app = DataManagerApp()
+    if "--profile" in sys.argv[1:-1]:
+        profiling.profiler.enable(sys.argv[sys.argv.index("--profile") + 1])
+    with profiling.span("startup"):
+        app = DataManagerApp()
+    app.after_idle(profiling.profiler.snapshot, "startup")
     app.mainloop()
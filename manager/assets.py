@@ -0,0 +1,169 @@
+"""Content-addressed media store under `client/public/media/`.
+
+Every blob is stored once as `<sha256 prefix><ext>`, so identical uploads
+share one file and a name never changes meaning. The service worker can
+therefore cache `/media/` forever. `AssetStore.migrate()` moves the files
+that template.json/manifest.json point at into the store and rewrites those
+references, including paths inside post markdown and `srcSet` strings.
+"""
+import hashlib
+import os
+import re
+import shutil
+from typing import Any, Dict, List
+
+from manager.config import PATH_CLIENT_PUBLIC
+from manager.posts import encode_content, stored_body
+
+MEDIA_DIRNAME = "media"
+HASH_LENGTH = 16  # hex chars of sha256, 64 bits
+# Names other files (index.html, sw.js, icons.json, OS conventions) depend on
+PINNED_FILES = {"favicon.png", "rug.svg", "manifest.json", "icons.json", "sw.js"}
+PINNED_DIRS = ("windows11/", "android/", "ios/")
+
+# Root-relative paths to media files; URLs with a host are left alone
+ASSET_RE = re.compile(
+    r"(?<![\w/:.])(/[^\s\"'()<>,?#]+?\.(?:png|jpe?g|webp|avif|gif|svg|ico|mp4|webm|pdf))(?=[\s\"'()<>,?#]|$)",
+    re.IGNORECASE,
+)
+# Files scanned before pruning an original, so nothing still linked is removed
+_REFERENCE_FILES = ("index.html", "sw.js", "icons.json")
+
+
+def file_digest(path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class AssetStore:
+    def __init__(self, public_dir=PATH_CLIENT_PUBLIC):
+        self.public_dir = public_dir
+        self.media_dir = os.path.join(public_dir, MEDIA_DIRNAME)
+        self._adopted: Dict[str, str] = {}  # original web path -> media web path
+        self.written: List[str] = []
+        self.deduplicated = 0  # blobs that already existed
+        self.bytes_saved = 0
+
+    def web_to_fs(self, web_path):
+        return os.path.join(self.public_dir, *web_path.lstrip("/").split("/"))
+
+    def is_media(self, web_path):
+        return web_path.startswith(f"/{MEDIA_DIRNAME}/")
+
+    def put_file(self, path, move=False) -> str:
+        """Stores `path` by content and returns its `/media/...` web path."""
+        ext = os.path.splitext(path)[1].lower()
+        name = file_digest(path)[:HASH_LENGTH] + ext
+        dest = os.path.join(self.media_dir, name)
+        if os.path.exists(dest):
+            self.deduplicated += 1
+            self.bytes_saved += os.path.getsize(path)
+            if move:
+                os.remove(path)
+        else:
+            os.makedirs(self.media_dir, exist_ok=True)
+            (shutil.move if move else shutil.copy2)(path, dest)
+            self.written.append(dest)
+        return f"/{MEDIA_DIRNAME}/{name}"
+
+    def store_image_result(self, result):
+        """Moves the files of an `images.ImageResult` into the store and points the result at them."""
+        by_web = {}
+        files = []
+        for path in result.files:
+            rel = os.path.relpath(path, self.public_dir).replace(os.sep, "/")
+            new_web = self.put_file(path, move=True)
+            by_web["/" + rel] = new_web
+            files.append(self.web_to_fs(new_web))
+        result.src = by_web.get(result.src, result.src)
+        for variant in result.variants:
+            variant["src"] = by_web.get(variant["src"], variant["src"])
+        result.files = sorted(set(files))
+        return result
+
+    def adopt(self, web_path):
+        """Media path for a referenced public file, or None if it must keep its name."""
+        if web_path in self._adopted:
+            return self._adopted[web_path]
+        rel = web_path.lstrip("/")
+        if self.is_media(web_path) or rel in PINNED_FILES or rel.startswith(PINNED_DIRS):
+            return None
+        fs_path = self.web_to_fs(web_path)
+        if not os.path.isfile(fs_path):
+            return None
+        self._adopted[web_path] = self.put_file(fs_path)
+        return self._adopted[web_path]
+
+    def rewrite_text(self, text):
+        def repl(match):
+            return self.adopt(match.group(1)) or match.group(1)
+        return ASSET_RE.sub(repl, text)
+
+    def rewrite_tree(self, node, skip_keys=()) -> bool:
+        """Rewrites asset paths in every string of a JSON tree in place. Returns True if anything changed."""
+        changed = False
+        items = node.items() if isinstance(node, dict) else enumerate(node) if isinstance(node, list) else ()
+        for key, value in list(items):
+            if key in skip_keys:
+                continue
+            if isinstance(value, str):
+                new = self.rewrite_text(value)
+                if new != value:
+                    node[key] = new
+                    changed = True
+            elif isinstance(value, (dict, list)):
+                changed |= self.rewrite_tree(value, skip_keys)
+        return changed
+
+    def migrate(self, content_store, prune=False) -> Dict[str, Any]:
+        """Moves every asset referenced by template.json/manifest.json into the store.
+
+        Marks the touched sections/posts dirty on `content_store`; the caller saves.
+        With prune=True, originals that are no longer referenced anywhere
+        (JSON, post bodies, index.html, sw.js, icons.json) are deleted.
+        """
+        data = content_store.data
+        for post in data.get("blog", {}).get("posts", []):
+            body = stored_body(post)
+            new_body = self.rewrite_text(body)
+            if new_body != body:
+                post["content"], post["encoding"] = encode_content(new_body, bool(post.get("encoding")))
+                content_store.mark_post_dirty(post)
+            if self.rewrite_tree(post, skip_keys=("content",)):
+                content_store.mark_post_dirty(post)
+        if self.rewrite_tree(data, skip_keys=("posts",)):
+            content_store.mark_dirty()
+        if self.rewrite_tree(content_store.manifest_data):
+            content_store.mark_dirty("manifest")
+
+        removed = self.prune_originals(content_store) if prune else []
+        return {"adopted": len(self._adopted), "written": self.written, "removed": removed,
+                "deduplicated": self.deduplicated, "bytes_saved": self.bytes_saved}
+
+    def prune_originals(self, content_store) -> List[str]:
+        texts = [stored_body(p) for p in content_store.data.get("blog", {}).get("posts", [])]
+        texts.append(repr({k: v for k, v in content_store.data.items() if k != "blog"}))
+        texts.append(repr(content_store.data.get("blog", {}).get("posts", [])))
+        texts.append(repr(content_store.manifest_data))
+        data_dir = os.path.dirname(content_store.json_path)
+        candidates = [os.path.join(self.public_dir, name) for name in _REFERENCE_FILES]
+        # client/index.html and the markdown pages next to template.json
+        candidates.append(os.path.join(os.path.dirname(self.public_dir), "index.html"))
+        candidates += [os.path.join(data_dir, n) for n in os.listdir(data_dir) if n.endswith(".md")]
+        for path in candidates:
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    texts.append(f.read())
+        haystack = "\n".join(texts)
+
+        removed = []
+        for web_path in self._adopted:
+            if web_path not in haystack:
+                fs_path = self.web_to_fs(web_path)
+                if os.path.exists(fs_path):
+                    os.remove(fs_path)
+                    removed.append(fs_path)
+        return removed
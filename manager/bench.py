@@ -0,0 +1,253 @@
+"""Benchmarks of the data layer on synthetic sites: `python -m manager.bench`.
+
+Generates template.json data sets of any size (posts x languages x
+translation keys x body size, inline or sharded storage) in a temp dir and
+times the headless operations on them: load, decode, save, sitemap, search
+and validate. Every parameter takes several values and the full matrix is
+run. Results go to a JSON file; pass `--compare` with an older file to print
+the ratio per operation.
+"""
+import argparse
+import base64
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict
+
+from manager.config import PATH_REPO_ROOT, STORAGE_SHARDED
+from manager.store import ContentStore
+from manager import posts as post_ops
+from manager.search import PostSearchIndex
+from manager.seo import generate_seo_files
+
+LANGUAGES = ("en", "ar", "zh-cn", "fr", "de", "es", "ja", "ru")
+_WORDS = ("security", "agent", "bounty", "recon", "payload", "kernel", "exploit", "parser", "cache", "token",
+          "network", "scanner", "fuzzing", "memory", "thread", "browser", "session", "report", "vector", "cloud")
+_CJK = "安全漏洞赏金代理技能网络扫描内存缓存线程报告浏览器会话"
+SEARCH_QUERIES = ("security", "kernel exp", "cloud scanner token", "安全", "nomatch")
+
+
+def _sentence(rng, lang, words=12):
+    if lang in ("zh-cn", "ja"):
+        return "".join(rng.choice(_CJK) for _ in range(words * 2)) + "。"
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _markdown(rng, size_bytes):
+    parts, total = [], 0
+    while total < size_bytes:
+        kind = rng.random()
+        if kind < 0.1:
+            block = f"## {_sentence(rng, 'en', 4)}"
+        elif kind < 0.2:
+            block = "```python\n" + "\n".join(f"{rng.choice(_WORDS)} = {rng.randint(0, 999)}" for _ in range(6)) + "\n```"
+        elif kind < 0.25:
+            block = f"![{rng.choice(_WORDS)}](/images/posts/{rng.choice(_WORDS)}-{rng.randint(1, 99)}.webp)"
+        else:
+            block = " ".join(_sentence(rng, "en") for _ in range(4))
+        parts.append(block)
+        total += len(block) + 2
+    return "\n\n".join(parts)[:size_bytes]
+
+
+def synthetic_data(posts=100, languages=3, translations=100, content_kib=4, seed=0) -> Dict[str, Any]:
+    """A template.json-shaped dict; same arguments always give the same data."""
+    rng = random.Random(seed)
+    langs = list(LANGUAGES[:languages])
+    for i in range(len(langs), languages):
+        langs.append(f"x{i}")
+
+    def localized(words):
+        return {l: _sentence(rng, l, words) for l in langs}
+
+    start = date(2020, 1, 1)
+    blog_posts = []
+    for i in range(posts):
+        body = _markdown(rng, content_kib * 1024)
+        blog_posts.append({
+            "id": f"post-{i:05d}",
+            "banner": f"/images/posts/banner-{i % 50}.webp",
+            "date": (start + timedelta(days=i % 2000)).strftime("%B %d, %Y"),
+            "title": localized(6),
+            "excerpt": localized(30),
+            "content": base64.b64encode(body.encode("utf-8")).decode("ascii"),
+            "tags": [f"#{w}" for w in rng.sample(_WORDS, 4)],
+            "pin": i < 3,
+            "encoding": True,
+        })
+
+    return {
+        "about": {"aboutTitle": localized(3), "aboutText": localized(40), "bio": localized(60),
+                  "skills": {"items": [{"name": w, "level": rng.randint(1, 100)} for w in _WORDS]}},
+        "site": {"external": [], "title": localized(3), "subtitle": localized(6), "description": localized(20),
+                 "url": "https://example.github.io", "swipeableRoutes": [], "pagination_per_page": 10,
+                 "languages": langs},
+        "owner": {"name": localized(2), "bio": localized(10), "email": "owner@example.com"},
+        "blog": {"posts": blog_posts},
+        "achievements": [],
+        "translations": {f"key_{k}": localized(3) for k in range(translations)},
+    }
+
+
+def _time(fn: Callable[[], Any], repeat, setup: Callable[[], Any] = None) -> Dict[str, Any]:
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return {"best_ms": round(min(runs), 3), "median_ms": round(statistics.median(runs), 3),
+            "runs_ms": [round(r, 3) for r in runs]}
+
+
+def run_case(workdir, params, repeat=3) -> Dict[str, Any]:
+    """Writes one synthetic site under `workdir` and times every operation on it."""
+    shutil.rmtree(workdir, ignore_errors=True)
+    os.makedirs(workdir)
+    json_path = os.path.join(workdir, "template.json")
+    public_dir = os.path.join(workdir, "public")
+
+    seed_store = ContentStore(json_path, os.path.join(workdir, "manifest.json"))
+    seed_store.data = synthetic_data(params["posts"], params["languages"], params["translations"],
+                                     params["content_kib"])
+    if params["storage"] == STORAGE_SHARDED:
+        seed_store.set_storage(STORAGE_SHARDED)
+    seed_store.save(force=True)
+    del seed_store
+
+    store = ContentStore(json_path, os.path.join(workdir, "manifest.json"))
+    ops = {"load": _time(store.load_data, repeat)}
+    data = store.data
+    posts = data["blog"]["posts"]
+
+    def decode_all():
+        for post in posts:
+            post_ops.decode_content(post)
+
+    ops["decode_cold"] = _time(decode_all, repeat, setup=post_ops.decode_cache.clear)
+    ops["decode_warm"] = _time(decode_all, repeat)
+
+    def drop_files():
+        # Nothing on disk matches any more, so every file is written
+        os.remove(json_path)
+        shutil.rmtree(store.posts_dir, ignore_errors=True)
+
+    ops["save_full"] = _time(lambda: store.save(force=True), repeat, setup=drop_files)
+    ops["save_noop"] = _time(store.save, repeat, setup=store.mark_all_dirty)
+
+    def touch_one():
+        post = posts[len(posts) // 2]
+        post["title"]["en"] += "!"
+        store.mark_post_dirty(post)
+
+    ops["save_one_post"] = _time(store.save, repeat, setup=touch_one)
+
+    ops["sitemap"] = _time(lambda: generate_seo_files(data, public_dir), repeat)
+
+    index = PostSearchIndex()
+    ops["search_build"] = _time(lambda: index.build(posts), repeat)
+    ops["search_query"] = _time(lambda: [index.search(q, limit=20) for q in SEARCH_QUERIES], repeat)
+
+    ops["validate"] = _time(lambda: post_ops.validate_data(data), repeat)
+
+    size = os.path.getsize(json_path)
+    if params["storage"] == STORAGE_SHARDED:
+        shard_dir = store.posts_dir
+        size += sum(os.path.getsize(os.path.join(shard_dir, n)) for n in os.listdir(shard_dir))
+    return {"params": params, "bytes_on_disk": size, "ops": ops}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PATH_REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def _case_key(params):
+    return tuple(sorted(params.items()))
+
+
+def compare(current, previous_path):
+    with open(previous_path, 'r', encoding='utf-8') as f:
+        previous = {_case_key(r["params"]): r for r in json.load(f)["results"]}
+    for result in current["results"]:
+        old = previous.get(_case_key(result["params"]))
+        if old is None:
+            continue
+        print(f"\n{_label(result['params'])} vs {previous_path}")
+        for op, timing in result["ops"].items():
+            before = old["ops"].get(op)
+            if before and before["best_ms"]:
+                ratio = timing["best_ms"] / before["best_ms"]
+                print(f"  {op:<14} {before['best_ms']:>10.2f} -> {timing['best_ms']:>10.2f} ms  x{ratio:.2f}")
+
+
+def _label(params):
+    return (f"{params['posts']} posts, {params['languages']} langs, {params['translations']} keys, "
+            f"{params['content_kib']} KiB, {params['storage']}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m manager.bench", description=__doc__.split("\n")[0])
+    parser.add_argument("--posts", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--languages", type=int, nargs="+", default=[3])
+    parser.add_argument("--translations", type=int, nargs="+", default=[100], help="Translation keys")
+    parser.add_argument("--content-kib", type=int, nargs="+", default=[4], help="Markdown body size per post")
+    parser.add_argument("--storage", nargs="+", default=["inline"], choices=["inline", STORAGE_SHARDED])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per operation (best and median are kept)")
+    parser.add_argument("--output", help="Results JSON (default: bench-<timestamp>.json)")
+    parser.add_argument("--compare", metavar="OLD_JSON", help="Print ratios against an earlier results file")
+    parser.add_argument("--workdir", help="Where the synthetic sites are written (default: a temp dir)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    matrix = [dict(zip(("posts", "languages", "translations", "content_kib", "storage"), combo))
+              for combo in itertools.product(args.posts, args.languages, args.translations,
+                                             args.content_kib, args.storage)]
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": args.repeat,
+        "results": [],
+    }
+    root = args.workdir or tempfile.mkdtemp(prefix="sahb-bench-")
+    try:
+        for i, params in enumerate(matrix):
+            print(f"▶️  [{i + 1}/{len(matrix)}] {_label(params)}")
+            result = run_case(os.path.join(root, f"case-{i}"), params, args.repeat)
+            report["results"].append(result)
+            print("   " + ", ".join(f"{op} {t['best_ms']:.1f}" for op, t in result["ops"].items()) + " (ms)")
+    finally:
+        if not args.workdir:
+            shutil.rmtree(root, ignore_errors=True)
+
+    output = args.output or f"bench-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""Safe import of PWA asset bundles (the ZIP PWABuilder's image generator produces).
+
+Only members the bundle's own listing references are extracted: `icons.json`
+entries and/or the `icons` of a bundled `manifest.json`. Member names are
+checked against path traversal, symlinks are refused, and members are
+streamed to disk in chunks. A member whose size and CRC-32 (the checksum the
+ZIP already stores) match the file on disk is skipped without decompressing.
+"""
+import json
+import os
+import posixpath
+import stat
+import zipfile
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from manager.fileio import atomic_open
+
+LISTING_NAMES = ("icons.json", "manifest.json")
+# Checked in order when refreshing favicon.png from the bundle
+FAVICON_CANDIDATES = (
+    "android/android-launchericon-512-512.png",
+    "android/android-launchericon-192-192.png",
+    "windows11/Square150x150Logo.scale-200.png",
+    "ios/180.png",
+)
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class ImportReport:
+    written: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    rejected: List[str] = field(default_factory=list)  # unsafe or missing members
+    bytes_written: int = 0
+    bytes_skipped: int = 0
+    icons_merged: int = 0
+
+    def summary(self):
+        return (f"{len(self.written)} files written ({self.bytes_written / 1024:.1f} KiB), "
+                f"{len(self.skipped)} unchanged ({self.bytes_skipped / 1024:.1f} KiB skipped), "
+                f"{self.icons_merged} manifest icons merged"
+                + (f", {len(self.rejected)} rejected" if self.rejected else ""))
+
+
+def safe_member_path(name) -> Optional[str]:
+    """Normalized relative path for a member name, or None if it could escape the target dir."""
+    name = name.replace("\\", "/")
+    if name.startswith("/") or (len(name) > 1 and name[1] == ":"):
+        return None
+    norm = posixpath.normpath(name)
+    if norm in (".", "") or norm.startswith("../") or norm == ".." or "/../" in f"/{norm}/":
+        return None
+    return norm
+
+
+def _is_symlink(info: zipfile.ZipInfo):
+    return stat.S_ISLNK(info.external_attr >> 16)
+
+
+def _dest_path(root, rel) -> Optional[str]:
+    """Real path of `rel` under `root`, or None if it resolves outside it (e.g. via a symlinked dir)."""
+    dest = os.path.realpath(os.path.join(root, *rel.split("/")))
+    return dest if dest.startswith(root + os.sep) else None
+
+
+def _icon_available(icon, root, available) -> bool:
+    rel = safe_member_path(str(icon.get("src", "")).lstrip("/"))
+    if rel is None:
+        return False
+    if rel in available:
+        return True
+    dest = _dest_path(root, rel)
+    return dest is not None and os.path.isfile(dest)
+
+
+def _crc32_of(path):
+    crc = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc & 0xFFFFFFFF
+
+
+def _read_listing(zf: zipfile.ZipFile, members: Dict[str, zipfile.ZipInfo]):
+    """Returns (referenced member paths, icon entries for the site manifest)."""
+    referenced, manifest_icons, listing_icons = set(), None, []
+    for listing in LISTING_NAMES:
+        info = members.get(listing)
+        if info is None:
+            continue
+        try:
+            doc = json.loads(zf.read(info).decode("utf-8-sig"))
+        except (ValueError, UnicodeDecodeError):
+            continue
+        referenced.add(listing)
+        icons = doc.get("icons", []) if isinstance(doc, dict) else []
+        for icon in icons:
+            src = safe_member_path(str(icon.get("src", "")).lstrip("/"))
+            if src:
+                referenced.add(src)
+        if listing == "manifest.json":
+            manifest_icons = icons
+        else:
+            listing_icons = icons
+
+    if manifest_icons is None:
+        # icons.json lists every platform tile; only the launcher icons belong in the web manifest
+        manifest_icons = [dict(icon, type="image/png", purpose="any maskable") for icon in listing_icons
+                          if str(icon.get("src", "")).startswith("android/")
+                          and icon.get("sizes") in ("192x192", "512x512")]
+    return referenced, manifest_icons
+
+
+def merge_icons(manifest: Dict[str, Any], icons) -> int:
+    """Adds/updates bundle icons in `manifest["icons"]` (keyed by src). Returns how many changed."""
+    existing = manifest.setdefault("icons", [])
+    by_src = {icon.get("src"): icon for icon in existing}
+    changed = 0
+    for icon in icons:
+        entry = dict(icon, src="/" + str(icon.get("src", "")).lstrip("/"))
+        current = by_src.get(entry["src"])
+        if current is None:
+            existing.append(entry)
+            by_src[entry["src"]] = entry
+            changed += 1
+        elif any(current.get(k) != v for k, v in entry.items()):
+            current.update(entry)
+            changed += 1
+    return changed
+
+
+def import_pwa_zip(zip_path, public_dir, manifest: Dict[str, Any], update_favicon=True) -> ImportReport:
+    report = ImportReport()
+    root = os.path.realpath(public_dir)
+    available = set()  # member paths now on disk, written or unchanged
+
+    with zipfile.ZipFile(zip_path) as zf:
+        members = {}
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            path = safe_member_path(info.filename)
+            if path is None or _is_symlink(info):
+                report.rejected.append(info.filename)
+                continue
+            members[path] = info
+
+        referenced, icons = _read_listing(zf, members)
+        if not referenced:
+            raise ValueError("ZIP has no icons.json or manifest.json listing its icons.")
+        # The bundle's manifest.json is merged, never copied over the site's own
+        referenced.discard("manifest.json")
+
+        for rel in sorted(referenced):
+            info = members.get(rel)
+            if info is None:
+                report.rejected.append(rel)
+                continue
+            dest = _dest_path(root, rel)
+            if dest is None:
+                report.rejected.append(rel)
+                continue
+
+            if (os.path.isfile(dest) and os.path.getsize(dest) == info.file_size
+                    and _crc32_of(dest) == info.CRC):
+                report.skipped.append(dest)
+                report.bytes_skipped += info.file_size
+                available.add(rel)
+                continue
+
+            with zf.open(info) as src, atomic_open(dest) as out:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    out.write(chunk)
+            report.written.append(dest)
+            report.bytes_written += info.file_size
+            available.add(rel)
+
+    # An icon whose member was rejected or missing is only listed if the site already has the file
+    icons = [icon for icon in icons if _icon_available(icon, root, available)]
+    report.icons_merged = merge_icons(manifest, icons)
+
+    if update_favicon:
+        for rel in FAVICON_CANDIDATES:
+            candidate = os.path.join(root, *rel.split("/"))
+            if os.path.exists(candidate):
+                favicon = os.path.join(root, "favicon.png")
+                with open(candidate, 'rb') as f:
+                    payload = f.read()
+                if not os.path.exists(favicon) or _crc32_of(favicon) != zlib.crc32(payload) & 0xFFFFFFFF:
+                    with atomic_open(favicon) as out:
+                        out.write(payload)
+                    report.written.append(favicon)
+                    report.bytes_written += len(payload)
+                break
+    return report
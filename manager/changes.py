@@ -0,0 +1,94 @@
+"""Files the manager wrote (or deleted) since the last push.
+
+`push` stages and commits exactly these paths instead of `git add .` over
+the whole checkout. The list is kept in the repository's git dir so a
+`python -m manager save` followed by a separate `python -m manager push`
+(or a GUI restart in between) still knows what to publish.
+"""
+import json
+import os
+
+from manager.config import PATH_REPO_ROOT
+from manager.fileio import atomic_write_text, dump_json
+
+PENDING_FILENAME = "sahb-manager-pending.json"
+
+
+def git_dir(repo_root=PATH_REPO_ROOT):
+    dot_git = os.path.join(repo_root, ".git")
+    if os.path.isdir(dot_git):
+        return dot_git
+    if os.path.isfile(dot_git):
+        # Worktrees/submodules: ".git" is a file containing "gitdir: <path>"
+        with open(dot_git, 'r', encoding='utf-8') as f:
+            line = f.read().strip()
+        if line.startswith("gitdir:"):
+            return os.path.normpath(os.path.join(repo_root, line[len("gitdir:"):].strip()))
+    return None
+
+
+class PendingChanges:
+    def __init__(self, repo_root=PATH_REPO_ROOT):
+        self.repo_root = os.path.abspath(repo_root)
+        directory = git_dir(self.repo_root)
+        self.path = os.path.join(directory, PENDING_FILENAME) if directory else None
+        self._paths = set()
+        # Bumped by every record(); remembers when each path was last recorded in this process,
+        # so a push only forgets files that were not written again while it ran
+        self.generation = 0
+        self._recorded_at = {}
+        self.load()
+
+    def load(self):
+        self._paths = set()
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._paths = set(json.load(f))
+            except (OSError, ValueError):
+                pass
+
+    def record(self, *paths):
+        """Remembers files (absolute or repo-relative) to publish. Paths outside the repo are ignored."""
+        before = len(self._paths)
+        self.generation += 1
+        for path in paths:
+            rel = os.path.relpath(os.path.abspath(os.path.join(self.repo_root, path)), self.repo_root)
+            if rel.startswith(os.pardir) or os.path.isabs(rel):
+                continue
+            rel = rel.replace(os.sep, "/")
+            self._paths.add(rel)
+            self._recorded_at[rel] = self.generation
+        if len(self._paths) != before:
+            self._persist()
+
+    def paths(self):
+        return sorted(self._paths)
+
+    def discard(self, paths, since=None):
+        """Forgets `paths` once they were pushed.
+
+        With `since` (the `generation` read when the push took its snapshot),
+        paths recorded again after that are kept: their newer content was not
+        part of the push. Paths other processes recorded meanwhile are kept too.
+        """
+        self.load()
+        for path in paths:
+            if since is None or self._recorded_at.get(path, 0) <= since:
+                self._paths.discard(path)
+        if self._paths:
+            self._persist()
+        elif self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def clear(self):
+        self._paths = set()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def _persist(self):
+        if self.path:
+            atomic_write_text(self.path, dump_json(sorted(self._paths)))
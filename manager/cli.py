@@ -0,0 +1,379 @@
+"""Headless entry point: `python -m manager <command>`.
+
+Runs the same operations as the DataManagerApp buttons without importing
+tkinter/customtkinter, so content pipelines can script them.
+"""
+import argparse
+import os
+import sys
+import time
+import zipfile
+
+from manager.config import (
+    PATH_TO_JSON, PATH_MANIFEST, PATH_CLIENT_PUBLIC, PATH_DIST, PATH_REPO_ROOT,
+    STORAGE_INLINE, STORAGE_SHARDED,
+)
+from manager.store import ContentStore, SECTION_MANIFEST
+from manager import posts as post_ops
+from manager.seo import build_site_model, generate_seo_files, render_social_cards
+from manager.search import PostSearchIndex, write_static_index
+from manager.changes import PendingChanges
+from manager.images import PHOTO_MAX_WIDTH, optimize_images
+from manager.icons import generate_icons
+from manager.assets import AssetStore
+from manager.bundle import import_pwa_zip
+from manager.publish import GitError, check_git, has_git_identity, push_changes
+from manager.sources import materialize_sources
+from manager.remote import DOWNLOAD_WORKERS, localize_media
+from manager.probe import probe_posts
+from manager.profiling import profiler, span
+
+
+def cmd_validate(store, args):
+    problems = post_ops.validate_data(store.data)
+    for p in problems:
+        print(f"⚠️  {p}")
+    print(f"{len(problems)} problem(s) found.")
+    return 1 if problems else 0
+
+
+def cmd_seo(store, args):
+    removed = []
+    written = generate_seo_files(store.data, args.public, removed=removed)
+    for path in written:
+        print(f"✅ Wrote {path}")
+    PendingChanges(args.repo).record(*written, *removed)
+    return 0
+
+
+def cmd_prerender(store, args):
+    model = build_site_model(store.data, os.path.dirname(args.data))
+    if not os.path.exists(os.path.join(args.dist, "index.html")):
+        print(f"⚠️  Missing {args.dist}/index.html, run the Vite build first. Skipping prerender.")
+        return 0
+    written, skipped = render_social_cards(model, args.dist, workers=args.workers, force=args.force)
+    for route in written:
+        print(f"  ✓ Created: {route}")
+    print(f"✨ Social cards: {len(written)} written, {skipped} unchanged.")
+    return 0
+
+
+def cmd_search_index(store, args):
+    # Build output like the social cards: written into dist, never committed
+    written = write_static_index(store.data, args.dist)
+    print(f"🔎 Search index: {len(written)} files written to {args.dist}/search"
+          + ("" if written else " (posts unchanged)"))
+    return 0
+
+
+def cmd_save(store, args):
+    return _save(store, args, force=True)
+
+
+def _save(store, args, force=False):
+    written = store.save(force=force)
+    for path in written:
+        print(f"✅ Wrote {path}")
+    if not written:
+        print("No content changes.")
+    PendingChanges(args.repo).record(*written, *store.removed)
+    return cmd_seo(store, args)
+
+
+def cmd_add_post(store, args):
+    post = post_ops.new_post(store.get_languages(), post_id=args.id, title=args.title, encode=args.encode)
+    if args.tags:
+        post["tags"] = [t.strip() for t in args.tags.split(",") if t.strip()]
+    return _insert_posts(store, args, [post])
+
+
+def cmd_import(store, args):
+    new_posts = [post_ops.post_from_markdown(path, store.get_languages(), encode=not args.plain)
+                 for path in args.files]
+    return _insert_posts(store, args, new_posts)
+
+
+def _insert_posts(store, args, new_posts):
+    existing = {p.get("id") for p in store.get_posts()}
+    for post in new_posts:
+        if post["id"] in existing:
+            print(f"❌ Post id '{post['id']}' already exists.", file=sys.stderr)
+            return 1
+        existing.add(post["id"])
+
+    # Newest first, same as the GUI "+ New Post" button
+    store.get_posts()[0:0] = new_posts
+    for post in new_posts:
+        store.mark_post_dirty(post)
+        print(f"➕ Added post '{post['id']}'")
+    return _save(store, args)
+
+
+def cmd_storage(store, args):
+    if args.mode is None:
+        print(store.storage)
+        return 0
+    store.set_storage(args.mode)
+    print(f"🗂️  Storage set to '{args.mode}'")
+    return _save(store, args)
+
+
+def cmd_search(store, args):
+    index = PostSearchIndex()
+    index.build(store.get_posts())
+    results = index.search(args.query, limit=args.limit)
+    for post in results:
+        title = (post.get("title") or {}).get("en", "")
+        print(f"{post.get('id')}\t{title.strip()}")
+    return 0 if results else 1
+
+
+def cmd_images(store, args):
+    jobs = [dict(src_path=path, dest_dir=os.path.join(args.public, args.dest), web_prefix=args.dest,
+                 max_width=args.max_width, avif=args.avif, keep_format=args.keep_format)
+            for path in args.files]
+    try:
+        results = optimize_images(jobs, workers=args.workers)
+    except ImportError:
+        print("❌ Pillow is required: pip install -r manager/requirements.txt", file=sys.stderr)
+        return 1
+    pending = PendingChanges(args.repo)
+    if args.content_addressed:
+        assets = AssetStore(args.public)
+        results = [assets.store_image_result(r) for r in results]
+    for path, result in zip(args.files, results):
+        pending.record(*result.files)
+        size = f"{result.width}x{result.height}" if result.width else "copied"
+        print(f"🖼️  {os.path.basename(path)} -> {result.src} ({size}, {len(result.files)} files)")
+        if result.variants:
+            print(f"    srcset: {result.srcset()}")
+            if args.avif:
+                print(f"    srcset (avif): {result.srcset('image/avif')}")
+    return 0
+
+
+def cmd_icons(store, args):
+    try:
+        written = generate_icons(args.master, args.public, store.manifest_data, workers=args.workers)
+    except ImportError:
+        print("❌ Pillow is required: pip install -r manager/requirements.txt", file=sys.stderr)
+        return 1
+    print(f"🖼️  Generated {len(written)} icons from {args.master}")
+    PendingChanges(args.repo).record(*written)
+    store.mark_dirty(SECTION_MANIFEST)
+    return _save(store, args)
+
+
+def cmd_dedupe(store, args):
+    assets = AssetStore(args.public)
+    report = assets.migrate(store, prune=args.prune)
+    PendingChanges(args.repo).record(*report["written"], *report["removed"])
+    print(f"📦 {report['adopted']} referenced files -> {len(report['written'])} new blobs in media/, "
+          f"{report['deduplicated']} duplicates ({report['bytes_saved'] / 1024:.1f} KiB saved)")
+    for path in report["removed"]:
+        print(f"🗑️  Removed {path}")
+    return _save(store, args)
+
+
+def cmd_import_pwa(store, args):
+    try:
+        report = import_pwa_zip(args.zip, args.public, store.manifest_data, update_favicon=not args.keep_favicon)
+    except (ValueError, OSError, zipfile.BadZipFile) as e:
+        print(f"❌ Failed to import ZIP: {e}", file=sys.stderr)
+        return 1
+    for name in report.rejected:
+        print(f"⚠️  Skipped unsafe or missing member: {name}")
+    print(f"📦 {report.summary()}")
+    PendingChanges(args.repo).record(*report.written)
+    if report.icons_merged:
+        store.mark_dirty(SECTION_MANIFEST)
+    return _save(store, args)
+
+
+def cmd_sync_sources(store, args):
+    local_paths = {}
+    for pair in args.local:
+        url, sep, path = pair.partition("=")
+        if not sep:
+            print(f"❌ --from expects URL=PATH, got {pair!r}", file=sys.stderr)
+            return 1
+        local_paths[url] = path
+    reports = materialize_sources(store, local_paths, mirror_dir=args.mirror_dir, offline=args.offline,
+                                  workers=args.workers)
+    for report in reports:
+        # A failed source only warns: the deploy still builds with its previous posts
+        print(f"⚠️  {report.summary()}" if report.error else f"🔄 {report.summary()}")
+    if not reports:
+        print("No GitHub URLs in blog.externalSources.")
+    return _save(store, args)
+
+
+def cmd_localize_media(store, args):
+    report = localize_media(store, args.public, workers=args.workers, offline=args.offline,
+                            hosts=set(args.host) if args.host else None)
+    for url, error in report.failed.items():
+        print(f"⚠️  {url}: {error}")
+    for url, local in report.localized.items():
+        print(f"🖼️  {url} -> {local}")
+    print(f"📥 {report.summary()}")
+    PendingChanges(args.repo).record(*report.written)
+    return _save(store, args)
+
+
+def cmd_probe_images(store, args):
+    try:
+        report = probe_posts(store, args.public)
+    except ImportError:
+        print("❌ Pillow is required: pip install -r manager/requirements.txt", file=sys.stderr)
+        return 1
+    for url, error in report.failed.items():
+        print(f"⚠️  {url}: {error}")
+    if args.verbose:
+        for url in report.missing:
+            print(f"·  not local: {url}")
+    print(f"📐 {report.summary()}")
+    return _save(store, args)
+
+
+def cmd_push(store, args):
+    try:
+        check_git(args.repo)
+        if not has_git_identity(args.repo):
+            raise GitError("Git user.name/email not set.")
+        pending = PendingChanges(args.repo)
+        paths = pending.paths()
+        committed = push_changes(args.repo, args.message, paths=None if args.all else paths)
+        if args.all:
+            pending.clear()
+        else:
+            # Files a running GUI recorded meanwhile stay pending
+            pending.discard(paths)
+    except GitError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"❌ Failed to push changes: {e}", file=sys.stderr)
+        return 1
+    print("✅ Pushed" + (" (new commit)" if committed else " (nothing to commit)"))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m manager", description="Sahb data manager (headless)")
+    parser.add_argument("--data", default=PATH_TO_JSON, help="Path to template.json")
+    parser.add_argument("--manifest", default=PATH_MANIFEST, help="Path to manifest.json")
+    parser.add_argument("--public", default=PATH_CLIENT_PUBLIC, help="Output dir for sitemap.xml/robots.txt")
+    parser.add_argument("--repo", default=PATH_REPO_ROOT, help="Git repository root used by `push`")
+    parser.add_argument("--time", action="store_true", help="Print elapsed time of the command")
+    parser.add_argument("--profile", metavar="REPORT", help="Write a Chrome-trace JSON of timing spans and memory snapshots")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("validate", help="Check template.json for common problems").set_defaults(func=cmd_validate)
+    sub.add_parser("seo", help="Regenerate sitemap.xml and robots.txt").set_defaults(func=cmd_seo)
+    p_pre = sub.add_parser("prerender", help="Write per-route index.html with OG/JSON-LD tags into the built site")
+    p_pre.add_argument("--dist", default=PATH_DIST, help="Vite output dir containing index.html")
+    p_pre.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    p_pre.add_argument("--force", action="store_true", help="Re-render pages even if their inputs are unchanged")
+    p_pre.set_defaults(func=cmd_prerender)
+    p_idx = sub.add_parser("search-index", help="Write the blog's sharded search index into the built site")
+    p_idx.add_argument("--dist", default=PATH_DIST, help="Vite output dir (the index goes to <dist>/search)")
+    p_idx.set_defaults(func=cmd_search_index)
+    sub.add_parser("save", help="Write changed template.json/manifest.json/shards and regenerate SEO files").set_defaults(func=cmd_save)
+
+    p_add = sub.add_parser("add-post", help="Add an empty post")
+    p_add.add_argument("--id", help="Post id (slug)")
+    p_add.add_argument("--title", help="Title used for every language")
+    p_add.add_argument("--tags", help="Comma separated tags")
+    p_add.add_argument("--encode", action="store_true", help="Store content as Base64")
+    p_add.set_defaults(func=cmd_add_post)
+
+    p_imp = sub.add_parser("import", help="Import markdown files as posts")
+    p_imp.add_argument("files", nargs="+")
+    p_imp.add_argument("--plain", action="store_true", help="Store content as plain markdown instead of Base64")
+    p_imp.set_defaults(func=cmd_import)
+
+    p_store = sub.add_parser("storage", help="Show or switch the post storage layout")
+    p_store.add_argument("mode", nargs="?", choices=[STORAGE_INLINE, STORAGE_SHARDED],
+                         help="inline: content inside template.json, sharded: one posts/<id>.md per post")
+    p_store.set_defaults(func=cmd_storage)
+
+    p_search = sub.add_parser("search", help="Search posts (title/excerpt in all languages, tags, content)")
+    p_search.add_argument("query")
+    p_search.add_argument("--limit", type=int, default=20)
+    p_search.set_defaults(func=cmd_search)
+
+    p_img = sub.add_parser("images", help="Optimize images into client/public (resize, WebP/AVIF, srcset widths)")
+    p_img.add_argument("files", nargs="+")
+    p_img.add_argument("--dest", default="images/posts", help="Folder under --public (also the web path prefix)")
+    p_img.add_argument("--max-width", type=int, default=PHOTO_MAX_WIDTH)
+    p_img.add_argument("--avif", action="store_true", help="Also write AVIF variants")
+    p_img.add_argument("--keep-format", action="store_true", help="Icons: keep format and size, only strip metadata")
+    p_img.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    p_img.add_argument("--content-addressed", action="store_true", help="Store results under media/<hash> instead of --dest")
+    p_img.set_defaults(func=cmd_images)
+
+    p_icons = sub.add_parser("icons", help="Render every PWA/platform icon from one master image")
+    p_icons.add_argument("master", help="Square, high resolution source (1024px+ recommended)")
+    p_icons.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    p_icons.set_defaults(func=cmd_icons)
+
+    p_dedupe = sub.add_parser("dedupe", help="Move referenced public files into the content-addressed media/ store")
+    p_dedupe.add_argument("--prune", action="store_true", help="Delete originals that are no longer referenced")
+    p_dedupe.set_defaults(func=cmd_dedupe)
+
+    p_pwa = sub.add_parser("import-pwa", help="Import a PWABuilder icon ZIP (only listed files, merges manifest icons)")
+    p_pwa.add_argument("zip")
+    p_pwa.add_argument("--keep-favicon", action="store_true", help="Do not refresh favicon.png from the bundle")
+    p_pwa.set_defaults(func=cmd_import_pwa)
+
+    p_sync = sub.add_parser("sync-sources", help="Turn blog.externalSources READMEs into static posts")
+    p_sync.add_argument("--from", dest="local", action="append", default=[], metavar="URL=PATH",
+                        help="Read this source from an existing clone/bare repo instead of the cached mirror")
+    p_sync.add_argument("--mirror-dir", help="Where mirrors are kept (default: manager/.cache/sources)")
+    p_sync.add_argument("--offline", action="store_true", help="Use existing mirrors without fetching")
+    p_sync.add_argument("--workers", type=int, help="Sources fetched and diffed at once (default: 4)")
+    p_sync.set_defaults(func=cmd_sync_sources)
+
+    p_loc = sub.add_parser("localize-media", help="Download hotlinked post images into media/ and rewrite the posts")
+    p_loc.add_argument("--workers", type=int, default=DOWNLOAD_WORKERS, help="Concurrent downloads")
+    p_loc.add_argument("--offline", action="store_true", help="Only use previously downloaded copies")
+    p_loc.add_argument("--host", action="append", help="Only localize images on this host (repeatable)")
+    p_loc.set_defaults(func=cmd_localize_media)
+
+    p_probe = sub.add_parser("probe-images", help="Store width/height and a blurred placeholder for post images")
+    p_probe.add_argument("-v", "--verbose", action="store_true", help="List images that are not available locally")
+    p_probe.set_defaults(func=cmd_probe_images)
+
+    p_push = sub.add_parser("push", help="Commit and push changes to the remote")
+    p_push.add_argument("-m", "--message", help="Commit message")
+    p_push.add_argument("--all", action="store_true",
+                        help="Stage every change in the checkout (git add .) instead of only files the manager wrote")
+    p_push.set_defaults(func=cmd_push)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        profiler.enable(args.profile)
+    start = time.perf_counter()
+
+    store = ContentStore(args.data, args.manifest)
+    try:
+        with span("load_data"):
+            store.load_data()
+    except Exception as e:
+        print(f"❌ Failed to load JSON: {e}", file=sys.stderr)
+        return 1
+    try:
+        with span("load_manifest"):
+            store.load_manifest()
+    except Exception as e:
+        print(f"⚠️  Failed to load manifest.json: {e}", file=sys.stderr)
+    profiler.snapshot("loaded")
+
+    with span(args.command):
+        code = args.func(store, args)
+    if args.time:
+        print(f"⏱️  {args.command} took {(time.perf_counter() - start) * 1000:.1f} ms")
+    return code
@@ -0,0 +1,23 @@
+import os
+
+# Shared paths for the GUI and the headless CLI
+PATH_MANAGER = os.path.dirname(os.path.abspath(__file__))
+PATH_REPO_ROOT = os.path.abspath(os.path.join(PATH_MANAGER, ".."))
+
+PATH_TO_JSON = os.path.join(PATH_REPO_ROOT, "client", "src", "data", "template.json")
+PATH_CLIENT_DATA = os.path.join(PATH_REPO_ROOT, "client", "src", "data")
+PATH_CLIENT_PUBLIC = os.path.join(PATH_REPO_ROOT, "client", "public")
+PATH_MANIFEST = os.path.join(PATH_CLIENT_PUBLIC, "manifest.json")
+PATH_IMAGES = os.path.join(PATH_REPO_ROOT, "images")
+# Local, regenerable data (thumbnails...); ignored by git
+PATH_CACHE = os.path.join(PATH_MANAGER, ".cache")
+# Vite build output (see vite.config.github.ts)
+PATH_DIST = os.path.join(PATH_REPO_ROOT, "dist", "public")
+
+# Sharded storage: post bodies live in <data dir>/posts/<id>.md
+POSTS_DIRNAME = "posts"
+STORAGE_INLINE = "inline"
+STORAGE_SHARDED = "sharded"
+
+DEFAULT_SITE_URL = "https://shulkwisec.github.io"
+DEFAULT_LANGUAGES = ["en", "ar"]
@@ -0,0 +1,43 @@
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_open(path):
+    """Binary file handle on a temp file in the same dir, renamed over `path`
+    on success, so readers (Vite dev server, git) never see a half written file."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+        # mkstemp creates 0600 files; keep the permissions a normal open() would give
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_bytes(path, payload: bytes):
+    with atomic_open(path) as f:
+        f.write(payload)
+
+
+def atomic_write_text(path, text: str):
+    atomic_write_bytes(path, text.encode('utf-8'))
+
+
+def dump_json(obj) -> str:
+    # Same formatting the manager has always used for template.json/manifest.json
+    return json.dumps(obj, indent=2, ensure_ascii=False)
@@ -0,0 +1,190 @@
+"""Local PWA icon generator: one master image -> every icon the site ships.
+
+Replaces the PWABuilder ZIP round trip. Targets are the platform sets listed
+in `client/public/icons.json` (windows11/android/ios, the same layout
+PWABuilder produces; a built-in table is used if the file is missing) plus
+every PNG referenced by `manifest.json` `icons`. Each distinct size is
+rendered once on a process pool and written as an optimized PNG.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+ICONS_LISTING = "icons.json"
+FAVICON = "favicon.png"
+FAVICON_SIZE = 64
+DEFAULT_BACKGROUND = "#ffffff"
+# Logo size relative to the short side on non-square tiles (wide tile, splash screen)
+TILE_LOGO_RATIO = 0.8
+
+_WIN_SCALES = (100, 125, 150, 200, 400)
+_WIN_TILES = {
+    "SmallTile": (71, 71), "Square150x150Logo": (150, 150), "Wide310x150Logo": (310, 150),
+    "LargeTile": (310, 310), "Square44x44Logo": (44, 44), "StoreLogo": (50, 50), "SplashScreen": (620, 300),
+}
+_WIN_TARGET_SIZES = (16, 20, 24, 30, 32, 36, 40, 44, 48, 60, 64, 72, 80, 96, 256)
+_ANDROID_SIZES = (48, 72, 96, 144, 192, 512)
+_IOS_SIZES = (16, 20, 29, 32, 40, 50, 57, 58, 60, 64, 72, 76, 80, 87, 100, 114, 120, 128,
+              144, 152, 167, 180, 192, 256, 512, 1024)
+
+
+@dataclass(frozen=True)
+class IconTarget:
+    path: str  # relative to the public dir, forward slashes
+    width: int
+    height: int
+    # iOS and Windows tiles must be opaque: composite onto the manifest background
+    opaque: bool = False
+
+
+def _half_up(value):
+    return int(value + 0.5)
+
+
+def default_listing() -> List[Dict[str, str]]:
+    """Same entries PWABuilder's image generator writes to icons.json."""
+    icons = []
+    for name, (w, h) in _WIN_TILES.items():
+        for scale in _WIN_SCALES:
+            icons.append({"src": f"windows11/{name}.scale-{scale}.png",
+                          "sizes": f"{_half_up(w * scale / 100)}x{_half_up(h * scale / 100)}"})
+    for variant in ("targetsize", "altform-unplated_targetsize", "altform-lightunplated_targetsize"):
+        for size in _WIN_TARGET_SIZES:
+            icons.append({"src": f"windows11/Square44x44Logo.{variant}-{size}.png", "sizes": f"{size}x{size}"})
+    for size in _ANDROID_SIZES:
+        icons.append({"src": f"android/android-launchericon-{size}-{size}.png", "sizes": f"{size}x{size}"})
+    for size in _IOS_SIZES:
+        icons.append({"src": f"ios/{size}.png", "sizes": f"{size}x{size}"})
+    return icons
+
+
+def _largest_size(sizes):
+    best = None
+    for token in str(sizes or "").split():
+        try:
+            w, h = (int(v) for v in token.lower().split("x"))
+        except ValueError:
+            continue
+        if best is None or w * h > best[0] * best[1]:
+            best = (w, h)
+    return best
+
+
+def icon_targets(public_dir, manifest: Dict[str, Any]) -> List[IconTarget]:
+    listing_path = os.path.join(public_dir, ICONS_LISTING)
+    listing = None
+    if os.path.exists(listing_path):
+        with open(listing_path, 'r', encoding='utf-8') as f:
+            listing = json.load(f).get("icons")
+    entries = list(listing or default_listing())
+    # Manifest icons may point anywhere under public/ (and favicon.png lists several sizes)
+    entries += [dict(icon, src=icon.get("src", "").lstrip("/")) for icon in manifest.get("icons", [])]
+    entries.append({"src": FAVICON, "sizes": f"{FAVICON_SIZE}x{FAVICON_SIZE}"})
+
+    targets = {}
+    for entry in entries:
+        src = entry.get("src", "")
+        size = _largest_size(entry.get("sizes"))
+        if not src.lower().endswith(".png") or size is None or "://" in src:
+            continue
+        opaque = src.startswith(("ios/", "windows11/"))
+        targets[src] = IconTarget(src, size[0], size[1], opaque)
+    return list(targets.values())
+
+
+# --- Rendering (runs in worker processes) ---
+_master = {}
+
+
+def _init_worker(master_path, background):
+    from PIL import Image, ImageOps
+
+    with Image.open(master_path) as img:
+        img = ImageOps.exif_transpose(img).convert("RGBA")
+    # Square master: centre-crop anything that is not
+    side = min(img.size)
+    left, top = (img.width - side) // 2, (img.height - side) // 2
+    _master.update(image=img.crop((left, top, left + side, top + side)), background=background)
+
+
+def _render(target: IconTarget):
+    from PIL import Image
+
+    master, background = _master["image"], _master["background"]
+    w, h = target.width, target.height
+    if w == h:
+        canvas = master.resize((w, h), Image.LANCZOS)
+    else:
+        logo_side = _half_up(min(w, h) * TILE_LOGO_RATIO)
+        canvas = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+        logo = master.resize((logo_side, logo_side), Image.LANCZOS)
+        canvas.alpha_composite(logo, ((w - logo_side) // 2, (h - logo_side) // 2))
+
+    if target.opaque or w != h:
+        flat = Image.new("RGBA", (w, h), background)
+        flat.alpha_composite(canvas)
+        canvas = flat.convert("RGB")
+    return canvas
+
+
+def _render_group(job):
+    public_dir, targets = job
+    image = _render(targets[0])
+    written = []
+    for target in targets:
+        dest = os.path.join(public_dir, *target.path.split("/"))
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        image.save(dest, "PNG", optimize=True)
+        written.append(dest)
+    return written
+
+
+def generate_icons(master_path, public_dir, manifest: Dict[str, Any], workers=None) -> List[str]:
+    """Renders every icon target from `master_path` and updates `manifest["icons"]` in place.
+
+    Returns the paths written. Raises ImportError if Pillow is missing.
+    """
+    from PIL import Image  # fail fast, before spawning workers
+    del Image
+
+    background = manifest.get("background_color") or DEFAULT_BACKGROUND
+    targets = icon_targets(public_dir, manifest)
+
+    # Identical renders (same size and opacity) are produced once and saved to every path
+    groups = {}
+    for target in targets:
+        groups.setdefault((target.width, target.height, target.opaque or target.width != target.height), []).append(target)
+    jobs = [(public_dir, group) for group in groups.values()]
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        _init_worker(master_path, background)
+        results = [_render_group(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(master_path, background)) as pool:
+            results = list(pool.map(_render_group, jobs))
+
+    update_manifest_icons(manifest)
+    return [path for group in results for path in group]
+
+
+def update_manifest_icons(manifest: Dict[str, Any]):
+    """Makes sure the manifest lists the favicon and the 192/512 launcher icons with correct types."""
+    icons = manifest.setdefault("icons", [])
+    by_src = {icon.get("src"): icon for icon in icons}
+    wanted = [
+        {"src": f"/{FAVICON}", "sizes": f"{FAVICON_SIZE}x{FAVICON_SIZE}", "type": "image/png", "purpose": "any"},
+        {"src": "/android/android-launchericon-192-192.png", "sizes": "192x192", "type": "image/png", "purpose": "any maskable"},
+        {"src": "/android/android-launchericon-512-512.png", "sizes": "512x512", "type": "image/png", "purpose": "any maskable"},
+    ]
+    for entry in wanted:
+        icon = by_src.get(entry["src"])
+        if icon is None:
+            icons.append(entry)
+        else:
+            icon["sizes"] = entry["sizes"]
+            icon["type"] = entry["type"]
+            icon.setdefault("purpose", entry["purpose"])
@@ -0,0 +1,135 @@
+"""Image ingest pipeline for uploads (banners, PWA screenshots/icons, favicon).
+
+Photos are downscaled, re-encoded to WebP (and AVIF when asked and supported),
+stripped of EXIF/ICC metadata and written in several widths for `srcset`.
+Icons keep their format and size but are still stripped and recompressed.
+Pillow is imported lazily so the rest of the manager works without it.
+"""
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+PHOTO_MAX_WIDTH = 1920
+SRCSET_WIDTHS = (480, 960, 1440)
+WEBP_QUALITY = 80
+AVIF_QUALITY = 55
+# Vector/animated/multi-size formats are copied untouched
+PASSTHROUGH_EXTS = {".svg", ".ico", ".gif"}
+
+MIME_TYPES = {
+    ".webp": "image/webp", ".avif": "image/avif", ".png": "image/png",
+    ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".svg": "image/svg+xml",
+    ".ico": "image/x-icon", ".gif": "image/gif",
+}
+
+
+@dataclass
+class ImageResult:
+    src: str  # web path of the main (largest) file
+    width: int = 0
+    height: int = 0
+    type: str = ""
+    # [{"src", "width", "type"}] for every encoded width/format, smallest first
+    variants: List[Dict[str, Any]] = field(default_factory=list)
+    files: List[str] = field(default_factory=list)  # absolute paths written
+
+    def srcset(self, mime=None) -> str:
+        mime = mime or self.type
+        return ", ".join(f"{v['src']} {v['width']}w" for v in self.variants if v["type"] == mime)
+
+
+def _web_path(web_prefix, filename):
+    web_prefix = "/" + web_prefix.strip("/") if web_prefix.strip("/") else ""
+    return f"{web_prefix}/{filename}"
+
+
+def _clean(img, keep_alpha=True):
+    """Applies EXIF orientation and drops all metadata (EXIF, ICC, text chunks)."""
+    from PIL import ImageOps
+
+    img = ImageOps.exif_transpose(img)
+    has_alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+    img = img.convert("RGBA" if has_alpha and keep_alpha else "RGB")
+    img.info = {}
+    return img
+
+
+def avif_supported():
+    try:
+        from PIL import features
+        return bool(features.check("avif"))
+    except Exception:
+        return False
+
+
+def optimize_image(src_path, dest_dir, web_prefix="", name=None, max_width=PHOTO_MAX_WIDTH,
+                   widths=SRCSET_WIDTHS, avif=False, keep_format=False) -> ImageResult:
+    """Processes one upload into `dest_dir` and returns what was written.
+
+    keep_format=True (icons, favicon): same format and pixel size, metadata
+    stripped. Otherwise: WebP (+ AVIF) at every width in `widths` that is
+    smaller than the image, plus the image itself capped at `max_width`.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    stem, ext = os.path.splitext(name or os.path.basename(src_path))
+    ext = ext.lower()
+
+    if ext in PASSTHROUGH_EXTS:
+        filename = stem + ext
+        dest = os.path.join(dest_dir, filename)
+        if os.path.abspath(src_path) != os.path.abspath(dest):
+            shutil.copy2(src_path, dest)
+        return ImageResult(src=_web_path(web_prefix, filename), type=MIME_TYPES.get(ext, ""), files=[dest])
+
+    from PIL import Image
+
+    with Image.open(src_path) as opened:
+        img = _clean(opened, keep_alpha=not (keep_format and ext in (".jpg", ".jpeg")))
+
+    if keep_format:
+        filename = stem + ext
+        dest = os.path.join(dest_dir, filename)
+        if ext in (".jpg", ".jpeg"):
+            img.save(dest, "JPEG", quality=85, optimize=True, progressive=True)
+        else:
+            img.save(dest, optimize=True)
+        return ImageResult(src=_web_path(web_prefix, filename), width=img.width, height=img.height,
+                           type=MIME_TYPES.get(ext, ""), files=[dest])
+
+    if img.width > max_width:
+        img = img.resize((max_width, round(img.height * max_width / img.width)), Image.LANCZOS)
+
+    formats = [("webp", ".webp", {"quality": WEBP_QUALITY, "method": 6})]
+    if avif and avif_supported():
+        formats.append(("avif", ".avif", {"quality": AVIF_QUALITY}))
+
+    # A variant within 10% of the full width saves too little to be worth a file
+    targets = sorted({w for w in widths if w < img.width * 0.9} | {img.width})
+    result = ImageResult(src="", width=img.width, height=img.height, type="image/webp")
+    for width in targets:
+        scaled = img if width == img.width else img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+        for fmt, fext, opts in formats:
+            # The full-size file keeps the plain name, smaller ones get a -<width> suffix
+            filename = f"{stem}{fext}" if width == img.width else f"{stem}-{width}{fext}"
+            dest = os.path.join(dest_dir, filename)
+            scaled.save(dest, fmt.upper(), **opts)
+            result.files.append(dest)
+            result.variants.append({"src": _web_path(web_prefix, filename), "width": width, "type": MIME_TYPES[fext]})
+
+    result.src = _web_path(web_prefix, f"{stem}.webp")
+    return result
+
+
+def _optimize_job(job):
+    return optimize_image(**job)
+
+
+def optimize_images(jobs: List[Dict[str, Any]], workers=None) -> List[ImageResult]:
+    """Runs `optimize_image(**job)` for every job, on a process pool when there is more than one."""
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        return [_optimize_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_optimize_job, jobs))
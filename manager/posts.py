@@ -0,0 +1,220 @@
+import base64
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+# Date formats accepted in `post.date` (first one is what the manager writes)
+DATE_FORMATS = ("%B %d, %Y", "%Y-%m-%d")
+
+
+# Decoded bodies are cached per content hash so reopening a post or
+# re-indexing it does not base64-decode (or run the heuristic) again
+DECODE_CACHE_SIZE = 256
+
+
+class DecodeCache:
+    """Small LRU of (raw content, flags) -> (markdown_text, is_encoded).
+
+    Keys use Python's str hash, which is computed once per string object and
+    then stored on it, so a lookup for an unchanged post costs O(1). The raw
+    text is kept in the entry to rule out hash collisions.
+    """
+
+    def __init__(self, max_entries=DECODE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[str, str, bool]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(raw_content, was_encoded, sharded):
+        return (hash(raw_content), len(raw_content), bool(was_encoded), bool(sharded))
+
+    def get(self, raw_content, was_encoded, sharded):
+        key = self._key(raw_content, was_encoded, sharded)
+        entry = self._entries.get(key)
+        if entry is None or (entry[0] is not raw_content and entry[0] != raw_content):
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def put(self, raw_content, was_encoded, sharded, text, is_encoded):
+        key = self._key(raw_content, was_encoded, sharded)
+        self._entries[key] = (raw_content, text, is_encoded)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+decode_cache = DecodeCache()
+
+
+def decode_content(post: Dict[str, Any]) -> Tuple[str, bool]:
+    """Returns (markdown_text, is_encoded) for a post's `content` field."""
+    raw_content = post.get("content", "")
+    was_encoded = post.get("encoding", False)
+    sharded = bool(post.get("contentFile"))
+
+    if not raw_content or (sharded and not was_encoded):
+        # Sharded posts are plain markdown on disk, no need to guess
+        return raw_content, False
+
+    cached = decode_cache.get(raw_content, was_encoded, sharded)
+    if cached is not None:
+        return cached
+    result = _decode_uncached(raw_content, was_encoded)
+    decode_cache.put(raw_content, was_encoded, sharded, *result)
+    return result
+
+
+def remember_decoded(post: Dict[str, Any], text: str):
+    """Seeds the cache after the editor stored `text` on `post` (skips the next decode)."""
+    raw_content = post.get("content", "")
+    if raw_content and post.get("encoding"):
+        decode_cache.put(raw_content, True, bool(post.get("contentFile")), text, True)
+
+
+def _decode_uncached(raw_content, was_encoded):
+    if not was_encoded:
+        # Auto-detect Base64 (heuristic)
+        try:
+            candidate_str = base64.b64decode(raw_content).decode('utf-8')
+            return candidate_str.replace('\r\n', '\n'), True
+        except Exception:
+            return raw_content, False
+    try:
+        candidate_str = base64.b64decode(raw_content).decode('utf-8')
+        return candidate_str.replace('\r\n', '\n'), True
+    except Exception as e:
+        return f"Error decoding: {e}\n\n{raw_content}", True
+
+
+def encode_content(text: str, encode: bool) -> Tuple[str, bool]:
+    """Returns (content, encoding) ready to be stored on a post."""
+    if encode:
+        try:
+            # STRICT Base64 encoding (No URL Quote)
+            return base64.b64encode(text.encode('utf-8')).decode('utf-8'), True
+        except Exception:
+            return text, False
+    return text, False
+
+
+def stored_body(post: Dict[str, Any]) -> str:
+    """Plain markdown for a post, trusting its `encoding` flag (no heuristics)."""
+    content = post.get("content", "")
+    if post.get("encoding"):
+        try:
+            return base64.b64decode(content).decode('utf-8').replace('\r\n', '\n')
+        except Exception:
+            return content
+    return content
+
+
+def parse_post_date(raw):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(raw, fmt)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def new_post(langs, post_id=None, title=None, content="# Content", encode=False):
+    # Initial empty values for all configured languages
+    title_dict = {l: (title or (f"New Post ({l.upper()})" if l == 'en' else f"New Post ({l})")) for l in langs}
+    excerpt_dict = {l: "Summary..." for l in langs}
+    stored, encoding = encode_content(content, encode)
+
+    post = {
+        "id": post_id or "new-post-" + datetime.now().strftime("%Y%m%d%H%M%S"),
+        "date": datetime.now().strftime("%B %d, %Y"),
+        "title": title_dict,
+        "excerpt": excerpt_dict,
+        "content": stored,
+        "tags": [],
+        "pin": False
+    }
+    if encoding:
+        post["encoding"] = True
+    return post
+
+
+def slugify(text):
+    slug = re.sub(r"[^\w\s-]", "", text.lower()).strip()
+    return re.sub(r"[\s_]+", "-", slug)
+
+
+def post_from_markdown(path, langs, encode=True):
+    """Builds a post from a markdown file. Title comes from the first `# ` heading."""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read().replace('\r\n', '\n')
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    heading = re.search(r"^#\s+(.*)", text, re.M)
+    title = heading.group(1).strip() if heading else name
+
+    # First paragraph that is not a heading/image becomes the excerpt
+    excerpt = ""
+    for line in text.split('\n'):
+        line = line.strip()
+        if line and not line.startswith('#') and not line.startswith('!['):
+            excerpt = line[:200]
+            break
+
+    post = new_post(langs, post_id=slugify(name), title=title, content=text, encode=encode)
+    post["excerpt"] = {l: excerpt for l in langs}
+    return post
+
+
+def validate_data(data: Dict[str, Any]) -> List[str]:
+    """Returns a list of human readable problems found in template.json data."""
+    problems = []
+    for section in ("site", "owner", "about", "blog"):
+        if section not in data:
+            problems.append(f"Missing top-level section '{section}'")
+
+    langs = data.get("site", {}).get("languages", [])
+    seen = set()
+    for i, post in enumerate(data.get("blog", {}).get("posts", [])):
+        label = post.get("id") or f"#{i}"
+        p_id = post.get("id")
+        if not p_id:
+            problems.append(f"Post {label}: missing id")
+        elif p_id in seen:
+            problems.append(f"Post {label}: duplicate id")
+        seen.add(p_id)
+
+        if parse_post_date(post.get("date")) is None:
+            problems.append(f"Post {label}: unparseable date {post.get('date')!r}")
+
+        title = post.get("title")
+        if not isinstance(title, dict):
+            problems.append(f"Post {label}: title is not a language map")
+        else:
+            for lang in langs:
+                if not title.get(lang):
+                    problems.append(f"Post {label}: missing title for '{lang}'")
+
+        if post.get("encoding"):
+            try:
+                base64.b64decode(post.get("content", ""), validate=True).decode('utf-8')
+            except Exception:
+                problems.append(f"Post {label}: content is marked encoded but is not valid Base64/UTF-8")
+
+    for key, value in data.get("translations", {}).items():
+        missing = [l for l in langs if l not in value]
+        if missing:
+            problems.append(f"Translation '{key}': missing {', '.join(missing)}")
+    return problems
@@ -0,0 +1,171 @@
+"""Image dimensions and LQIP placeholders for post banners and body images.
+
+Sizes come from the image header (Pillow opens lazily, so nothing is
+decoded for them); the placeholder is a 16px blurred WebP data: URI decoded
+at reduced scale where the format allows it (JPEG draft mode). Results are
+cached in `manager/.cache/probe.json` by file content hash, with a
+path/mtime/size index in front so unchanged files are not even re-hashed.
+
+Banners get `width`, `height` and `placeholder`; body images are listed in
+the post's `images` map (src -> {width, height, placeholder}) so the post
+page can reserve their space before they load.
+"""
+import base64
+import io
+import json
+import os
+import re
+import urllib.parse
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from manager.config import PATH_CACHE, PATH_CLIENT_PUBLIC
+from manager.assets import file_digest
+from manager.fileio import atomic_write_text
+from manager.posts import stored_body
+from manager.remote import RemoteCache
+
+PROBE_CACHE_NAME = "probe.json"
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_BLUR = 1
+PLACEHOLDER_QUALITY = 40
+
+_IMAGE_SRC_RE = re.compile(r"!\[[^\]]*\]\(([^)\s]+)|<img\b[^>]*?\ssrc=[\"']([^\"']+)", re.IGNORECASE)
+_NON_IMAGE_BANNERS = {"video", "embed", "slides", "doc"}
+
+
+@dataclass
+class ProbeReport:
+    probed: int = 0  # images decoded this run
+    cached: int = 0
+    missing: List[str] = field(default_factory=list)  # urls with no local or mirrored file
+    failed: Dict[str, str] = field(default_factory=dict)
+    posts: List[str] = field(default_factory=list)
+
+    def summary(self):
+        return (f"{self.probed + self.cached} images sized in {len(self.posts)} changed posts "
+                f"({self.probed} probed, {self.cached} cached), {len(self.missing)} not available locally"
+                + (f", {len(self.failed)} failed" if self.failed else ""))
+
+
+def probe_image(path) -> Dict[str, Any]:
+    from PIL import Image, ImageFilter, ImageOps
+
+    with Image.open(path) as img:
+        width, height = img.size
+        # EXIF rotation swaps what the browser displays
+        if img.getexif().get(0x0112) in (5, 6, 7, 8):
+            width, height = height, width
+        img.draft("RGB", (PLACEHOLDER_SIZE * 4, PLACEHOLDER_SIZE * 4))
+        small = ImageOps.exif_transpose(img)
+        small = small.convert("RGBA" if "A" in small.getbands() or "transparency" in small.info else "RGB")
+        small.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    small = small.filter(ImageFilter.GaussianBlur(PLACEHOLDER_BLUR))
+    buf = io.BytesIO()
+    small.save(buf, "WEBP", quality=PLACEHOLDER_QUALITY)
+    return {"width": width, "height": height,
+            "placeholder": "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode("ascii")}
+
+
+class ProbeCache:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(PATH_CACHE, PROBE_CACHE_NAME)
+        self.files: Dict[str, List[Any]] = {}  # abs path -> [mtime_ns, size, sha256]
+        self.images: Dict[str, Dict[str, Any]] = {}  # sha256 -> probe result
+        self.dirty = False
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                doc = json.load(f)
+            self.files, self.images = doc.get("files", {}), doc.get("images", {})
+
+    def get(self, path, report: ProbeReport) -> Dict[str, Any]:
+        st = os.stat(path)
+        known = self.files.get(path)
+        if known and known[:2] == [st.st_mtime_ns, st.st_size]:
+            digest = known[2]
+        else:
+            digest = file_digest(path)
+            self.files[path] = [st.st_mtime_ns, st.st_size, digest]
+            self.dirty = True
+        if digest in self.images:
+            report.cached += 1
+        else:
+            self.images[digest] = probe_image(path)
+            self.dirty = True
+            report.probed += 1
+        return self.images[digest]
+
+    def save(self):
+        if self.dirty:
+            atomic_write_text(self.path, json.dumps({"files": self.files, "images": self.images}))
+            self.dirty = False
+
+
+def local_file(url, public_dir, remote: RemoteCache) -> Optional[str]:
+    """File behind an image URL: under `public_dir` for site paths, the download cache for remote ones."""
+    if url.startswith(("http://", "https://")):
+        return remote.body_path(url) if remote.meta(url) else None
+    if not url.startswith("/") or url.startswith("//"):
+        return None
+    rel = urllib.parse.unquote(urllib.parse.urlsplit(url).path).lstrip("/")
+    path = os.path.join(public_dir, *rel.split("/"))
+    return path if os.path.isfile(path) else None
+
+
+def _banner_url(post):
+    banner = post.get("banner")
+    if isinstance(banner, dict):
+        return None if banner.get("type") in _NON_IMAGE_BANNERS else banner.get("url")
+    return banner if isinstance(banner, str) and banner else None
+
+
+def probe_posts(store, public_dir=PATH_CLIENT_PUBLIC, cache: ProbeCache = None,
+                remote: RemoteCache = None) -> ProbeReport:
+    """Sizes every banner and body image of every post. Marks changed posts dirty; the caller saves."""
+    cache = cache or ProbeCache()
+    remote = remote or RemoteCache()
+    report = ProbeReport()
+
+    def lookup(url):
+        path = local_file(url, public_dir, remote)
+        if path is None:
+            report.missing.append(url)
+            return None
+        try:
+            return cache.get(path, report)
+        except Exception as e:  # not an image Pillow reads (svg...), unreadable file
+            report.failed[url] = str(e)
+            return None
+
+    for post in store.get_posts():
+        changed = False
+        url = _banner_url(post)
+        meta = lookup(url) if url else None
+        if meta:
+            banner = post["banner"]
+            new = dict(banner) if isinstance(banner, dict) else {"url": banner, "type": "image"}
+            new.update(meta)
+            if new != banner:
+                post["banner"] = new
+                changed = True
+
+        sizes = {}
+        for match in _IMAGE_SRC_RE.finditer(stored_body(post)):
+            src = match.group(1) or match.group(2)
+            if src not in sizes:
+                sizes[src] = lookup(src)
+        sizes = {src: meta for src, meta in sizes.items() if meta}
+        if sizes != post.get("images", {}):
+            if sizes:
+                post["images"] = sizes
+            else:
+                post.pop("images", None)
+            changed = True
+
+        if changed:
+            store.mark_post_dirty(post)
+            report.posts.append(post.get("id"))
+
+    report.missing = list(dict.fromkeys(report.missing))
+    cache.save()
+    return report
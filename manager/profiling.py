@@ -0,0 +1,175 @@
+"""Opt-in timing and memory instrumentation.
+
+Set `SAHB_PROFILE=<report.json>` (or pass `--profile <report.json>` to the
+CLI / app.py) and every instrumented call is recorded as a span. tracemalloc
+runs alongside, so each span also carries the traced memory at its end, and
+labelled snapshots keep the top allocation sites. The report is written at
+exit in Chrome's trace-event format: open it in chrome://tracing or
+https://ui.perfetto.dev, or read the JSON directly.
+
+When profiling is off every hook is a flag check and a direct call.
+"""
+import atexit
+import fnmatch
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+ENV_VAR = "SAHB_PROFILE"
+# SAHB_PROFILE_MEMORY=0 keeps timing but skips tracemalloc (it slows Python down noticeably)
+ENV_MEMORY = "SAHB_PROFILE_MEMORY"
+TRACE_FRAMES = 1
+TOP_ALLOCATIONS = 20
+
+
+def _kib(value):
+    return round(value / 1024, 1)
+
+
+class Profiler:
+    def __init__(self):
+        self.output: Optional[str] = None
+        self.trace_memory = False
+        self.events: List[Dict[str, Any]] = []
+        self.snapshots: List[Dict[str, Any]] = []
+        self._last_snapshot = None
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    @property
+    def enabled(self):
+        return self.output is not None
+
+    def enable(self, output, trace_memory=True):
+        """Starts recording; the report is written to `output` at exit (or on `dump()`)."""
+        if self.enabled:
+            return
+        self.output = output
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+        atexit.register(self.dump)
+        self.snapshot("start")
+
+    def _now_us(self):
+        return (time.perf_counter() - self._origin) * 1e6
+
+    @contextmanager
+    def span(self, name, **args):
+        if not self.enabled:
+            yield
+            return
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            end = self._now_us()
+            event = {"name": name, "ph": "X", "ts": round(start, 1), "dur": round(end - start, 1),
+                     "pid": self._pid, "tid": threading.get_ident()}
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                args = dict(args, memory_kib=_kib(current), peak_kib=_kib(peak))
+                self.events.append({"name": "memory", "ph": "C", "ts": round(end, 1), "pid": self._pid,
+                                    "args": {"current_kib": _kib(current)}})
+            if args:
+                event["args"] = args
+            self.events.append(event)
+
+    def traced(self, name=None):
+        """Decorator recording every call of the function as a span."""
+        def decorate(fn):
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*a, **kw):
+                if not self.enabled:
+                    return fn(*a, **kw)
+                with self.span(label):
+                    return fn(*a, **kw)
+            return wrapper
+        return decorate
+
+    def instrument(self, cls, *patterns):
+        """Wraps the methods of `cls` whose names match any fnmatch pattern (e.g. "setup_*")."""
+        for attr, value in list(vars(cls).items()):
+            if callable(value) and any(fnmatch.fnmatchcase(attr, p) for p in patterns):
+                setattr(cls, attr, self.traced(f"{cls.__name__}.{attr}")(value))
+        return cls
+
+    def snapshot(self, label):
+        """Records the biggest allocation sites now and how they grew since the previous snapshot."""
+        if not (self.enabled and self.trace_memory):
+            return
+        snap = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+
+        def site(stat):
+            frame = stat.traceback[0]
+            return f"{frame.filename}:{frame.lineno}"
+
+        entry = {
+            "label": label, "ts": round(self._now_us(), 1),
+            "current_kib": _kib(current), "peak_kib": _kib(peak),
+            "top": [{"site": site(s), "size_kib": _kib(s.size), "count": s.count}
+                    for s in snap.statistics("lineno")[:TOP_ALLOCATIONS]],
+        }
+        if self._last_snapshot is not None:
+            entry["growth"] = [{"site": site(s), "size_diff_kib": _kib(s.size_diff), "count_diff": s.count_diff}
+                               for s in snap.compare_to(self._last_snapshot, "lineno")[:TOP_ALLOCATIONS]]
+        self._last_snapshot = snap
+        self.snapshots.append(entry)
+        self.events.append({"name": f"snapshot: {label}", "ph": "i", "s": "g", "ts": entry["ts"], "pid": self._pid,
+                            "tid": threading.get_ident(), "args": {"current_kib": entry["current_kib"]}})
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Total/count/max per span name, slowest first."""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for event in self.events:
+            if event["ph"] != "X":
+                continue
+            row = totals.setdefault(event["name"], {"name": event["name"], "calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+            row["calls"] += 1
+            row["total_ms"] += event["dur"] / 1000
+            row["max_ms"] = max(row["max_ms"], event["dur"] / 1000)
+        rows = sorted(totals.values(), key=lambda r: r["total_ms"], reverse=True)
+        for row in rows:
+            row["total_ms"] = round(row["total_ms"], 3)
+            row["max_ms"] = round(row["max_ms"], 3)
+        return rows
+
+    def dump(self, path=None):
+        path = path or self.output
+        if not path:
+            return None
+        self.snapshot("exit")
+        report = {
+            "traceEvents": self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {"summary": self.summary(), "snapshots": self.snapshots},
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+        print(f"⏱️  Profile written to {path}")
+        return path
+
+
+profiler = Profiler()
+span = profiler.span
+traced = profiler.traced
+
+
+def enable_from_env():
+    output = os.environ.get(ENV_VAR)
+    if output:
+        profiler.enable(output, trace_memory=os.environ.get(ENV_MEMORY, "1") != "0")
+
+
+enable_from_env()
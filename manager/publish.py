@@ -0,0 +1,153 @@
+import os
+import re
+import subprocess
+import threading
+from datetime import datetime
+
+from manager.config import PATH_REPO_ROOT
+
+
+class GitError(Exception):
+    pass
+
+
+def check_git(repo_root=PATH_REPO_ROOT):
+    """Raises GitError if git is missing or the checkout has no remote."""
+    try:
+        subprocess.check_output(["git", "--version"], cwd=repo_root)
+    except Exception:
+        raise GitError("Git is not installed or not in PATH.")
+
+    try:
+        remote = subprocess.check_output(["git", "remote", "-v"], cwd=repo_root).strip()
+    except Exception:
+        raise GitError("Not a git repository.")
+    if not remote:
+        raise GitError("No remote repository configured. Please add a remote origin manually.")
+
+
+def has_git_identity(repo_root=PATH_REPO_ROOT):
+    try:
+        user_name = subprocess.check_output(["git", "config", "user.name"], cwd=repo_root).strip()
+        user_email = subprocess.check_output(["git", "config", "user.email"], cwd=repo_root).strip()
+    except subprocess.CalledProcessError:
+        # `git config <key>` exits 1 when the key is unset
+        return False
+    return bool(user_name and user_email)
+
+
+def set_default_identity(repo_root=PATH_REPO_ROOT):
+    subprocess.check_call(["git", "config", "user.name", "Ghost"], cwd=repo_root)
+    subprocess.check_call(["git", "config", "user.email", "ghost@sahb.local"], cwd=repo_root)
+
+
+class PushCancelled(GitError):
+    pass
+
+
+def _run(cmd, repo_root, on_output=None, cancel_event=None, stdin=None):
+    """Runs a git command. Without `on_output` it inherits stdout/stderr like
+    check_call(); with it every output line (or progress update) is passed on
+    as it arrives. Setting `cancel_event` terminates the process."""
+    if on_output is None:
+        subprocess.run(cmd, cwd=repo_root, input=stdin, check=True)
+        return
+
+    on_output("$ " + " ".join(cmd))
+    proc = subprocess.Popen(cmd, cwd=repo_root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            stdin=subprocess.PIPE if stdin is not None else subprocess.DEVNULL)
+    if stdin is not None:
+        proc.stdin.write(stdin)
+        proc.stdin.close()
+    watcher = None
+    if cancel_event is not None:
+        def watch():
+            while proc.poll() is None:
+                if cancel_event.wait(0.2):
+                    proc.terminate()
+                    return
+        watcher = threading.Thread(target=watch, daemon=True)
+        watcher.start()
+
+    # git progress redraws lines with \r, so split on both
+    buf = b""
+    while True:
+        chunk = proc.stdout.read1(4096)
+        if not chunk:
+            break
+        buf += chunk
+        parts = re.split(rb"[\r\n]", buf)
+        buf = parts.pop()
+        for part in parts:
+            if part.strip():
+                on_output(part.decode('utf-8', 'replace'))
+    if buf.strip():
+        on_output(buf.decode('utf-8', 'replace'))
+
+    code = proc.wait()
+    if watcher is not None:
+        watcher.join()
+    if cancel_event is not None and cancel_event.is_set():
+        raise PushCancelled("Push cancelled.")
+    if code != 0:
+        raise GitError(f"`{' '.join(cmd)}` failed with exit code {code}")
+
+
+def _pathspec_input(paths):
+    # NUL separated for --pathspec-from-file, so any file name (and list length) is safe
+    return b"".join(p.encode('utf-8') + b"\0" for p in paths)
+
+
+# Recorded paths are file names, never globs or ":(magic)": "a*.md" must not stage "ab.md"
+_GIT_LITERAL = ["git", "--literal-pathspecs"]
+
+
+def push_changes(repo_root=PATH_REPO_ROOT, message=None, on_output=None, cancel_event=None, paths=None):
+    """Stages, commits (if anything changed) and pushes. Returns True if a commit was made.
+
+    With `paths` (repo-relative, see `PendingChanges`) only those files are
+    staged and committed; other changes in the checkout are left alone and
+    git never walks the whole tree. Without it everything is staged (`git add .`).
+
+    `on_output`/`cancel_event` let a caller on another thread stream git's
+    output and stop the pipeline (see `_run`).
+    """
+    message = message or f"Update from Manager {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+
+    def step(cmd, stdin=None):
+        if cancel_event is not None and cancel_event.is_set():
+            raise PushCancelled("Push cancelled.")
+        _run(cmd, repo_root, on_output, cancel_event, stdin)
+
+    committed = False
+    if paths is None:
+        # Execute git add from the repository root to include all changes
+        step(["git", "add", "."])
+
+        # Check if there are changes to commit
+        status = subprocess.check_output(["git", "status", "--porcelain"], cwd=repo_root)
+        if status:
+            step(["git", "commit", "-m", message])
+            committed = True
+    elif paths:
+        present = [p for p in paths if os.path.exists(os.path.join(repo_root, p))]
+        missing = [p for p in paths if p not in present]
+        if present:
+            step(_GIT_LITERAL + ["add", "-A", "--pathspec-from-file=-", "--pathspec-file-nul"], _pathspec_input(present))
+        if missing:
+            # Deleted files (e.g. removed post shards); untracked ones are simply ignored
+            step(_GIT_LITERAL + ["rm", "-q", "--cached", "--ignore-unmatch", "--pathspec-from-file=-", "--pathspec-file-nul"],
+                 _pathspec_input(missing))
+
+        # Only the index vs HEAD is compared here, the working tree is not scanned
+        wanted = set(paths)
+        staged = subprocess.check_output(["git", "diff", "--cached", "--name-only", "-z"], cwd=repo_root)
+        changed = [p for p in staged.decode('utf-8').split("\0") if p in wanted]
+        if changed:
+            # --only semantics: unrelated staged changes stay out of this commit
+            step(_GIT_LITERAL + ["commit", "-m", message, "--pathspec-from-file=-", "--pathspec-file-nul"],
+                 _pathspec_input(changed))
+            committed = True
+
+    step(["git", "push", "--progress"] if on_output else ["git", "push"])
+    return committed
@@ -0,0 +1,242 @@
+"""Localize hotlinked post images into `client/public/media/`.
+
+Banners and `![]()` / `<img src>` links that point at third-party hosts
+(postimg.cc, medium, sanity.io, raw.githubusercontent...) are downloaded on a
+bounded thread pool, run through the image pipeline and stored in the
+content-addressed media store, then the post is rewritten to the local copy.
+
+Downloads are cached under `manager/.cache/remote/` together with their
+ETag/Last-Modified, and re-fetched conditionally: a 304 reuses the cached
+bytes. `offline=True` uses the cache only.
+"""
+import hashlib
+import json
+import os
+import re
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from manager.config import PATH_CACHE, PATH_CLIENT_PUBLIC
+from manager.assets import AssetStore
+from manager.fileio import atomic_write_bytes, atomic_write_text
+from manager import images
+from manager.posts import encode_content, stored_body
+from manager.seo import get_site_url
+
+REMOTE_DIRNAME = "remote"
+# Pipeline output folder under client/public; files move on into media/
+STAGING_PREFIX = "images/posts"
+DOWNLOAD_WORKERS = 8
+TIMEOUT = 20
+MAX_BYTES = 25 * 1024 * 1024
+USER_AGENT = "SahbManager/1.0 (+https://github.com/ShulkwiSEC/shulkwisec.github.io)"
+
+_EXT_BY_TYPE = {
+    "image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp", "image/avif": ".avif",
+    "image/gif": ".gif", "image/svg+xml": ".svg", "image/x-icon": ".ico", "image/vnd.microsoft.icon": ".ico",
+}
+_MD_IMAGE_RE = re.compile(r"(!\[[^\]]*\]\()(https?://[^)\s]+)")
+_HTML_IMAGE_RE = re.compile(r"""(<img\b[^>]*?\ssrc=["'])(https?://[^"']+)""", re.IGNORECASE)
+# Banner types whose url is not an image file
+_NON_IMAGE_BANNERS = {"video", "embed", "slides", "doc"}
+
+
+@dataclass
+class Download:
+    url: str
+    path: Optional[str] = None  # cached bytes
+    content_type: str = ""
+    status: str = ""  # downloaded | revalidated | cached | failed
+    error: str = ""
+
+
+@dataclass
+class LocalizeReport:
+    downloaded: int = 0
+    revalidated: int = 0  # 304 Not Modified
+    cached: int = 0  # offline hits
+    failed: Dict[str, str] = field(default_factory=dict)
+    localized: Dict[str, str] = field(default_factory=dict)  # remote url -> local web path
+    posts: List[str] = field(default_factory=list)
+    written: List[str] = field(default_factory=list)
+
+    def summary(self):
+        return (f"{len(self.localized)} images localized in {len(self.posts)} posts "
+                f"({self.downloaded} downloaded, {self.revalidated} not modified, {self.cached} from cache)"
+                + (f", {len(self.failed)} failed" if self.failed else ""))
+
+
+class RemoteCache:
+    """Bytes + validators of every fetched URL, keyed by the URL's sha256."""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or os.path.join(PATH_CACHE, REMOTE_DIRNAME)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        base = os.path.join(self.cache_dir, key)
+        return base + ".bin", base + ".json"
+
+    def body_path(self, url):
+        return self._paths(url)[0]
+
+    def meta(self, url) -> Dict[str, Any]:
+        body, meta = self._paths(url)
+        if not (os.path.exists(body) and os.path.exists(meta)):
+            return {}
+        with open(meta, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def fetch(self, url, offline=False, timeout=TIMEOUT) -> Download:
+        body_path, meta_path = self._paths(url)
+        meta = self.meta(url)
+        if offline:
+            if not meta:
+                return Download(url, status="failed", error="not in cache")
+            return Download(url, body_path, meta.get("content_type", ""), "cached")
+
+        request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, "Accept": "image/*,*/*;q=0.5"})
+        if meta.get("etag"):
+            request.add_header("If-None-Match", meta["etag"])
+        if meta.get("last_modified"):
+            request.add_header("If-Modified-Since", meta["last_modified"])
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                content_type = response.headers.get_content_type()
+                payload = response.read(MAX_BYTES + 1)
+                headers = response.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and meta:
+                return Download(url, body_path, meta.get("content_type", ""), "revalidated")
+            return Download(url, status="failed", error=f"HTTP {e.code}")
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            return Download(url, status="failed", error=str(getattr(e, "reason", e)))
+
+        if len(payload) > MAX_BYTES:
+            return Download(url, status="failed", error=f"larger than {MAX_BYTES // (1024 * 1024)} MB")
+        if not content_type.startswith("image/"):
+            return Download(url, status="failed", error=f"not an image ({content_type})")
+
+        atomic_write_bytes(body_path, payload)
+        atomic_write_text(meta_path, json.dumps({
+            "url": url, "content_type": content_type,
+            "etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified"),
+        }, indent=2))
+        return Download(url, body_path, content_type, "downloaded")
+
+
+def _banner_url(post) -> Optional[str]:
+    banner = post.get("banner")
+    if isinstance(banner, dict):
+        if banner.get("type") in _NON_IMAGE_BANNERS:
+            return None
+        banner = banner.get("url")
+    return banner if isinstance(banner, str) and banner.startswith(("http://", "https://")) else None
+
+
+def remote_image_urls(post) -> List[str]:
+    """Every remote image a post shows: its banner plus images in the markdown body."""
+    body = stored_body(post)
+    urls = [_banner_url(post)]
+    urls += [m.group(2) for m in _MD_IMAGE_RE.finditer(body)]
+    urls += [m.group(2) for m in _HTML_IMAGE_RE.finditer(body)]
+    return list(dict.fromkeys(u for u in urls if u))
+
+
+def _optimize(download: Download, public_dir):
+    """Runs a cached download through the image pipeline into the staging folder."""
+    ext = _EXT_BY_TYPE.get(download.content_type, ".img")
+    name = "remote-" + hashlib.sha256(download.url.encode("utf-8")).hexdigest()[:12] + ext
+    dest_dir = os.path.join(public_dir, *STAGING_PREFIX.split("/"))
+    try:
+        return images.optimize_image(download.path, dest_dir, web_prefix=STAGING_PREFIX, name=name)
+    except ImportError:
+        # No Pillow: keep the original bytes
+        os.makedirs(dest_dir, exist_ok=True)
+        dest = os.path.join(dest_dir, name)
+        with open(download.path, 'rb') as src:
+            atomic_write_bytes(dest, src.read())
+        return images.ImageResult(src=f"/{STAGING_PREFIX}/{name}", type=download.content_type, files=[dest])
+
+
+def localize_media(store, public_dir=PATH_CLIENT_PUBLIC, workers=DOWNLOAD_WORKERS, offline=False,
+                   cache: RemoteCache = None, hosts=None) -> LocalizeReport:
+    """Downloads, optimizes and stores every remote post image, then rewrites the posts.
+
+    `hosts` limits the run to URLs on those hostnames. Marks changed posts
+    dirty; the caller saves. Images that fail keep their remote URL.
+    """
+    cache = cache or RemoteCache()
+    report = LocalizeReport()
+    posts = store.get_posts()
+    own_host = urllib.parse.urlsplit(get_site_url(store.data)).hostname
+    wanted = {}
+    for post in posts:
+        for url in remote_image_urls(post):
+            host = urllib.parse.urlsplit(url).hostname
+            if host != own_host and (hosts is None or host in hosts):
+                wanted.setdefault(url, None)
+
+    def work(url):
+        download = cache.fetch(url, offline=offline)
+        if download.status == "failed":
+            return download, None
+        try:
+            return download, _optimize(download, public_dir)
+        except Exception as e:  # undecodable image, disk errors...
+            download.status, download.error = "failed", str(e)
+            return download, None
+
+    results = []
+    if wanted:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(wanted)))) as pool:
+            results = list(pool.map(work, wanted))
+
+    assets = AssetStore(public_dir)
+    by_url = {}
+    for download, result in results:
+        if result is None:
+            report.failed[download.url] = download.error
+            continue
+        setattr(report, download.status, getattr(report, download.status) + 1)
+        # Moved into media/ here, on one thread: the store is not thread safe
+        by_url[download.url] = assets.store_image_result(result)
+        report.localized[download.url] = by_url[download.url].src
+    report.written = assets.written
+
+    for post in posts:
+        if _rewrite_post(post, by_url):
+            store.mark_post_dirty(post)
+            report.posts.append(post.get("id"))
+    return report
+
+
+def _rewrite_post(post, by_url) -> bool:
+    changed = False
+    banner_url = _banner_url(post)
+    result = by_url.get(banner_url)
+    if result is not None:
+        banner = post.get("banner")
+        old = banner if isinstance(banner, dict) else {}
+        new = {k: v for k, v in old.items() if k in ("alt", "thumbnail")}
+        new.update(url=result.src, type="gif" if result.type == "image/gif" else old.get("type", "image"))
+        if result.variants:
+            new.update(srcSet=result.srcset(), width=result.width, height=result.height)
+        post["banner"] = new
+        changed = True
+
+    body = stored_body(post)
+
+    def repl(match):
+        result = by_url.get(match.group(2))
+        return match.group(1) + result.src if result is not None else match.group(0)
+
+    new_body = _HTML_IMAGE_RE.sub(repl, _MD_IMAGE_RE.sub(repl, body))
+    if new_body != body:
+        post["content"], post["encoding"] = encode_content(new_body, bool(post.get("encoding")))
+        changed = True
+    return changed
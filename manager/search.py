@@ -0,0 +1,323 @@
+import bisect
+import hashlib
+import json
+import os
+import re
+import shutil
+from collections import defaultdict
+from typing import Any, Dict, List, Set, Tuple
+
+from manager.fileio import atomic_write_bytes
+from manager.posts import decode_content
+
+# Field -> ranking weight
+FIELD_WEIGHTS = {"title": 3, "tags": 2, "excerpt": 2, "content": 1}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# CJK has no spaces between words, index those runs per character instead
+_CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]")
+
+
+def tokenize(text) -> List[str]:
+    tokens = []
+    for word in _WORD_RE.findall(str(text).lower()):
+        if _CJK_RE.search(word):
+            tokens.extend(ch for ch in word if not ch.isspace())
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def token_set(text) -> Set[str]:
+    """set(tokenize(text)), deduplicating words before the CJK check (much faster on long bodies)."""
+    tokens = set()
+    for word in set(_WORD_RE.findall(str(text).lower())):
+        if _CJK_RE.search(word):
+            tokens.update(ch for ch in word if not ch.isspace())
+        else:
+            tokens.add(word)
+    return tokens
+
+
+def field_text(post: Dict[str, Any], field: str) -> str:
+    value = post.get(field)
+    if field == "content":
+        return decode_content(post)[0]
+    if isinstance(value, dict):
+        # Multilingual field: index every configured language at once
+        return " ".join(str(v) for v in value.values())
+    if isinstance(value, list):
+        return " ".join(str(v) for v in value)
+    return str(value or "")
+
+
+class PostSearchIndex:
+    """In-memory inverted index over posts (title/excerpt in every language, tags, decoded content).
+
+    Posts are keyed by object identity so the index follows edits made
+    through the GUI; call `update_field()` when a single field changes.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        self.posts: Dict[int, Dict[str, Any]] = {}
+        self.fields: Dict[int, Dict[str, Set[str]]] = {}
+        self._vocab = None  # sorted token list, rebuilt lazily for prefix queries
+
+    def build(self, posts):
+        self.postings.clear()
+        self.posts.clear()
+        self.fields.clear()
+        self._vocab = None
+        for post in posts:
+            self.add_post(post)
+
+    def add_post(self, post):
+        key = id(post)
+        self.posts[key] = post
+        self.fields[key] = {}
+        for field in FIELD_WEIGHTS:
+            self._index_field(key, post, field)
+
+    def remove_post(self, post):
+        key = id(post)
+        for tokens in self.fields.pop(key, {}).values():
+            self._unlink(key, tokens)
+        self.posts.pop(key, None)
+
+    def update_field(self, post, field):
+        key = id(post)
+        if key not in self.posts:
+            self.add_post(post)
+            return
+        if field not in FIELD_WEIGHTS:
+            return
+        self._unlink(key, self.fields[key].get(field, set()))
+        self._index_field(key, post, field)
+
+    def _index_field(self, key, post, field):
+        tokens = set(tokenize(field_text(post, field)))
+        self.fields[key][field] = tokens
+        for token in tokens:
+            if token not in self.postings:
+                self._vocab = None
+            self.postings[token].add(key)
+
+    def _unlink(self, key, tokens):
+        for token in tokens:
+            docs = self.postings.get(token)
+            if docs is None:
+                continue
+            # Still referenced by another field of the same post?
+            if any(token in f for f in self.fields.get(key, {}).values() if f is not tokens):
+                continue
+            docs.discard(key)
+            if not docs:
+                del self.postings[token]
+                self._vocab = None
+
+    def _expand_prefix(self, prefix):
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        i = bisect.bisect_left(self._vocab, prefix)
+        matches = []
+        while i < len(self._vocab) and self._vocab[i].startswith(prefix):
+            matches.append(self._vocab[i])
+            i += 1
+        return matches
+
+    def search(self, query, limit=None) -> List[Dict[str, Any]]:
+        """All terms must match; the last term also matches as a prefix of any length (search-as-you-type).
+
+        The site's client/src/services/blog/searchIndex.ts applies the same rules to the static index.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        term_groups = [[t] for t in terms[:-1]]
+        term_groups.append(self._expand_prefix(terms[-1]))
+
+        candidates = None
+        for group in term_groups:
+            docs = set()
+            for token in group:
+                docs |= self.postings.get(token, set())
+            candidates = docs if candidates is None else candidates & docs
+            if not candidates:
+                return []
+
+        order = {key: i for i, key in enumerate(self.posts)}
+
+        def score(key):
+            total = 0
+            for group in term_groups:
+                for field, weight in FIELD_WEIGHTS.items():
+                    if any(t in self.fields[key][field] for t in group):
+                        total += weight
+            return (-total, order[key])
+
+        ranked = sorted(candidates, key=score)
+        if limit:
+            ranked = ranked[:limit]
+        return [self.posts[key] for key in ranked]
+
+
+# --- Static index for the site ---
+# Build output, written into dist by `python -m manager search-index` (npm's
+# postbuild); the blog page fetches meta.json and then only the shards holding
+# the terms of the query
+SEARCH_DIRNAME = "search"
+# Terms are sharded by their first character; a shard past this size is split
+# again by the first two, so small sites get a few dozen files and big ones
+# still never load much for one query. Neighbouring small shards (one per CJK
+# character...) are packed into shared files up to SHARD_PACK_BYTES
+SHARD_TARGET_BYTES = 32 * 1024
+SHARD_PACK_BYTES = 8 * 1024
+STATIC_INDEX_VERSION = 1
+# Link/image targets and HTML tags would only add noise terms
+_MARKUP_RE = re.compile(r"\]\([^)]*\)|<[^>]+>")
+
+
+def _localized(value, lang):
+    if isinstance(value, dict):
+        return value.get(lang) or value.get("en") or next(iter(value.values()), "")
+    return value or ""
+
+
+def _shard_name(key, payload: bytes):
+    # Content hash in the name: a shard URL never changes meaning, so it can be cached forever
+    return f"{key.encode('utf-8').hex()}-{hashlib.sha256(payload).hexdigest()[:8]}.json"
+
+
+def shared_terms(post) -> Set[str]:
+    """Terms every language indexes for a post: its tags and decoded body."""
+    return token_set(field_text(post, "tags") + " " + _MARKUP_RE.sub(" ", field_text(post, "content")))
+
+
+def source_digest(posts, lang) -> str:
+    """Hash of everything the `lang` index is built from, to skip rebuilding unchanged ones."""
+    h = hashlib.sha256(f"{STATIC_INDEX_VERSION}:{SHARD_TARGET_BYTES}:{SHARD_PACK_BYTES}".encode("utf-8"))
+    for post in posts:
+        h.update(json.dumps([post.get("id"), _localized(post.get("title"), lang), _localized(post.get("excerpt"), lang),
+                             post.get("tags"), post.get("encoding")], ensure_ascii=False).encode("utf-8"))
+        h.update(str(post.get("content", "")).encode("utf-8"))
+    return h.hexdigest()
+
+
+def build_static_index(posts, lang, shared=None) -> Tuple[Dict[str, Any], Dict[str, Dict[str, List[int]]]]:
+    """(meta, shards) for one language.
+
+    Titles and excerpts are taken in `lang` (falling back to en); tags and
+    the decoded body are shared by every language (pass `shared`, one
+    `shared_terms()` set per post, to tokenize them once for all languages).
+    Postings are the sorted positions of the posts in `meta["docs"]`,
+    delta-encoded. Shard keys are the one or two leading characters every
+    term in the shard starts with.
+    """
+    docs, postings = [], defaultdict(list)
+    for doc, post in enumerate(posts):
+        docs.append(post.get("id"))
+        own = token_set(f"{_localized(post.get('title'), lang)} {_localized(post.get('excerpt'), lang)}")
+        for token in own.union(shared[doc] if shared is not None else shared_terms(post)):
+            postings[token].append(doc)
+
+    by_initial: Dict[str, Dict[str, List[int]]] = defaultdict(dict)
+    for token in sorted(postings):
+        previous, deltas = 0, []
+        for doc in postings[token]:
+            deltas.append(doc - previous)
+            previous = doc
+        by_initial[token[0]][token] = deltas
+
+    shards: Dict[str, Dict[str, List[int]]] = {}
+    for initial, terms in by_initial.items():
+        if len(_shard_payload(terms)) <= SHARD_TARGET_BYTES:
+            shards[initial] = terms
+            continue
+        for token, deltas in terms.items():
+            shards.setdefault(token[:2], {})[token] = deltas
+
+    meta = {"version": STATIC_INDEX_VERSION, "lang": lang, "docs": docs, "shards": {}}
+    return meta, shards
+
+
+def _shard_payload(terms) -> bytes:
+    return json.dumps(terms, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _pack(shards):
+    """Groups shards in key order into files of up to SHARD_PACK_BYTES: [(keys, merged terms)]."""
+    files, keys, terms, size = [], [], {}, 0
+    for key in sorted(shards):
+        shard_size = len(_shard_payload(shards[key]))
+        if keys and size + shard_size > SHARD_PACK_BYTES:
+            files.append((keys, terms))
+            keys, terms, size = [], {}, 0
+        keys.append(key)
+        terms.update(shards[key])
+        size += shard_size
+    if keys:
+        files.append((keys, terms))
+    return files
+
+
+def write_static_index(data: Dict[str, Any], public_dir, removed: List[str] = None) -> List[str]:
+    """Writes `search/<lang>/meta.json` plus term-prefix shards for every site language.
+
+    Files whose content did not change are left alone; shards and language
+    folders nothing references any more are deleted and appended to `removed`.
+    Returns the paths written.
+    """
+    posts = data.get("blog", {}).get("posts", [])
+    langs = data.get("site", {}).get("languages") or ["en"]
+    root = os.path.join(public_dir, SEARCH_DIRNAME)
+    written, deleted = [], []
+
+    def write(path, payload: bytes):
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                if f.read() == payload:
+                    return
+        atomic_write_bytes(path, payload)
+        written.append(path)
+
+    shared = None
+    for lang in langs:
+        lang_dir = os.path.join(root, lang)
+        meta_path = os.path.join(lang_dir, "meta.json")
+        digest = source_digest(posts, lang)
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                current = json.load(f)
+            if current.get("source") == digest and all(
+                    os.path.exists(os.path.join(lang_dir, n)) for n in set(current.get("shards", {}).values())):
+                continue
+
+        if shared is None:
+            shared = [shared_terms(post) for post in posts]
+        meta, shards = build_static_index(posts, lang, shared)
+        meta["source"] = digest
+        for keys, terms in _pack(shards):
+            payload = _shard_payload(terms)
+            name = _shard_name(keys[0], payload)
+            meta["shards"].update(dict.fromkeys(keys, name))
+            write(os.path.join(lang_dir, name), payload)
+        write(meta_path, json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+        keep = set(meta["shards"].values()) | {"meta.json"}
+        for name in os.listdir(lang_dir):
+            if name not in keep and name.endswith(".json"):
+                os.remove(os.path.join(lang_dir, name))
+                deleted.append(os.path.join(lang_dir, name))
+
+    if os.path.isdir(root):
+        for name in os.listdir(root):
+            if name not in langs and os.path.isdir(os.path.join(root, name)):
+                stale = os.path.join(root, name)
+                deleted.extend(os.path.join(stale, n) for n in os.listdir(stale))
+                shutil.rmtree(stale)
+
+    if removed is not None:
+        removed.extend(deleted)
+    return written
@@ -0,0 +1,360 @@
+"""Sitemap, robots.txt and per-route social cards, built from one parsed model.
+
+`build_site_model()` reads template.json data once into a list of `Page`s.
+`generate_seo_files()` writes sitemap.xml/robots.txt from it and
+`render_social_cards()` writes `<route>/index.html` with OG/Twitter/JSON-LD
+tags into the built site (the work `prerender.js` used to do).
+"""
+import hashlib
+import html
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from manager.config import PATH_CACHE, PATH_CLIENT_PUBLIC, PATH_CLIENT_DATA, PATH_DIST, DEFAULT_SITE_URL
+from manager.fileio import atomic_write_text, dump_json
+from manager.posts import parse_post_date
+from manager.sitemap import SitemapWriter
+
+# Below this many changed pages the process pool costs more than it saves
+PARALLEL_MIN_PAGES = 32
+# Remembers the input hash of every rendered route, next to the output
+# Render state lives in the manager cache (one file per dist dir), never in the deployed output
+CARDS_STATE_DIRNAME = "social-cards"
+_LEGACY_CARDS_STATE_FILE = ".social-cards.json"
+
+
+@dataclass
+class Page:
+    route: str
+    title: Optional[str] = None
+    description: str = ""
+    images: List[str] = field(default_factory=list)
+    date: Optional[datetime] = None
+    # Sitemap entry; pages without `in_sitemap` still get a social card
+    lastmod: Optional[str] = None
+    changefreq: Optional[str] = None
+    priority: str = "0.5"
+    in_sitemap: bool = True
+    social_card: bool = True
+
+
+@dataclass
+class SiteModel:
+    url: str
+    lang: str
+    title: str
+    description: str
+    author: str
+    pages: List[Page]
+
+
+def get_site_url(data: Dict[str, Any]) -> str:
+    site_url = data.get("site", {}).get("url", DEFAULT_SITE_URL)
+    if site_url.endswith('/'):
+        site_url = site_url[:-1]
+    return site_url
+
+
+def _image_url(img):
+    # Banners are either a plain URL or a BannerMedia object
+    if isinstance(img, str):
+        return img or None
+    if isinstance(img, dict):
+        return img.get("url") or None
+    return None
+
+
+def meta_from_markdown(content: str) -> Dict[str, Any]:
+    """Title, description and images of a markdown page (same rules as the old prerender.js)."""
+    images = re.findall(r"!\[.*?\]\((.*?)\)", content)
+    images += re.findall(r"<img[^>]+src=[\"']([^\"']+)[\"']", content)
+
+    title_match = re.search(r"^#\s+(.*)", content, re.M) or re.search(r"^\*\*?(.*?)\*\*?$", content, re.M)
+    title = title_match.group(1).strip() if title_match else None
+
+    text = re.sub(r"<style[\s\S]*?</style>", "", content, flags=re.I)
+    text = re.sub(r"<script[\s\S]*?</script>", "", text, flags=re.I)
+    text = re.sub(r"```mermaid[\s\S]*?```", "", text)
+    text = re.sub(r"!\[.*?\]\(.*?\)", "", text)
+    text = re.sub(r"<img[^>]+>", "", text)
+    text = re.sub(r"#+\s+.*$", "", text, flags=re.M)
+    text = re.sub(r"<[^>]+>", " ", text)
+    text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
+    text = re.sub(r"[*_`~-]", "", text)
+    text = re.sub(r"\s+", " ", text).strip()
+
+    description = text[:200] + ("..." if len(text) > 200 else "")
+    return {"title": title, "description": description, "images": [i for i in images if i]}
+
+
+def _localizer(lang):
+    def localized(value, default=""):
+        if isinstance(value, dict):
+            value = value.get(lang) or value.get("en")
+        return str(value).strip() if value else default
+    return localized
+
+
+def _primary_language(data):
+    return (data.get("site", {}).get("languages") or ["en"])[0]
+
+
+def iter_pages(data: Dict[str, Any], data_dir=PATH_CLIENT_DATA, read_markdown=True) -> Iterator[Page]:
+    """Yields every route of the site one at a time (home, about, external pages, posts).
+
+    With `read_markdown=False` the `/page/` markdown files are not opened,
+    which is all the sitemap needs.
+    """
+    site = data.get("site", {})
+    localized = _localizer(_primary_language(data))
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    yield Page("/", lastmod=today, changefreq="daily", priority="1.0", social_card=False)
+    yield Page("/about", lastmod=today, changefreq="monthly", priority="0.8", social_card=False)
+
+    for ext in site.get("external", []):
+        p_url = ext.get("url")
+        if not p_url:
+            continue
+        if not p_url.startswith('/'):
+            p_url = '/' + p_url
+        page = Page(p_url, title=localized(ext.get("name")) or None,
+                    lastmod=today, changefreq="monthly", priority="0.8",
+                    social_card=p_url.startswith("/page/"))
+        if page.social_card and read_markdown:
+            md_path = os.path.join(data_dir, p_url[len("/page/"):] + ".md")
+            if os.path.exists(md_path):
+                with open(md_path, 'r', encoding='utf-8') as f:
+                    meta = meta_from_markdown(f.read())
+                page.title = meta["title"] or page.title
+                page.description = meta["description"]
+                page.images = meta["images"]
+        yield page
+
+    for post in data.get("blog", {}).get("posts", []):
+        p_id = post.get("id")
+        if not p_id:
+            continue
+        dt = parse_post_date(post.get("date"))
+        banner = _image_url(post.get("banner"))
+        yield Page(
+            f"/post/{p_id}",
+            title=localized(post.get("title")) or None,
+            description=localized(post.get("excerpt")),
+            images=[banner] if banner else [],
+            date=dt,
+            # Fallback to today if parsing fails
+            lastmod=dt.strftime("%Y-%m-%d") if dt else today,
+            priority="0.7",
+        )
+
+
+def build_site_model(data: Dict[str, Any], data_dir=PATH_CLIENT_DATA) -> SiteModel:
+    site = data.get("site", {})
+    lang = _primary_language(data)
+    localized = _localizer(lang)
+    return SiteModel(
+        url=get_site_url(data),
+        lang=lang,
+        title=localized(site.get("title"), "shulkwisec"),
+        description=localized(site.get("description")),
+        author=localized(data.get("owner", {}).get("name")),
+        pages=list(iter_pages(data, data_dir)),
+    )
+
+
+def generate_seo_files(data: Dict[str, Any], public_dir=PATH_CLIENT_PUBLIC, pages: Iterable[Page] = None,
+                       removed: List[str] = None) -> List[str]:
+    """Generates sitemap.xml (split into gzip'd parts + index when large) and robots.txt.
+
+    Entries are streamed straight from `pages` (default: walked lazily from
+    `data`), so memory stays flat however many posts there are.
+    Returns the paths written; deleted stale parts are appended to `removed`.
+    """
+    site_url = get_site_url(data)
+    if pages is None:
+        pages = iter_pages(data, read_markdown=False)
+
+    # 1. Sitemap.xml
+    with SitemapWriter(public_dir, site_url) as sitemap:
+        for page in pages:
+            if page.in_sitemap:
+                sitemap.add(site_url + page.route, page.lastmod, page.changefreq, page.priority)
+
+    # 2. Robots.txt
+    robots_path = os.path.join(public_dir, "robots.txt")
+    robots_content = f"User-agent: *\nAllow: /\n\nSitemap: {site_url}/sitemap.xml"
+    with open(robots_path, 'w', encoding='utf-8') as f:
+        f.write(robots_content)
+
+    if removed is not None:
+        removed.extend(sitemap.removed)
+    return sitemap.written + [robots_path]
+
+
+# --- Social cards ---
+# Existing tags in the built index.html that each card replaces
+_STRIP_ONCE = [re.compile(p) for p in (
+    r"<title>.*?</title>", r'<meta name="description".*?>', r'<meta property="og:title".*?>',
+    r'<meta property="og:description".*?>', r'<meta property="og:url".*?>',
+    r'<meta name="twitter:title".*?>', r'<meta name="twitter:description".*?>',
+)]
+_STRIP_ALL = [re.compile(p) for p in (r'<meta property="og:image".*?>', r'<meta name="twitter:image".*?>')]
+
+# Per-worker render context, set once by _init_worker instead of pickled per page
+_ctx: Dict[str, Any] = {}
+
+
+def _init_worker(base_html, site, out_dir):
+    for pattern in _STRIP_ONCE:
+        base_html = pattern.sub("", base_html, count=1)
+    for pattern in _STRIP_ALL:
+        base_html = pattern.sub("", base_html)
+    _ctx.update(base_html=base_html, site=site, out_dir=out_dir)
+
+
+def _absolute(site_url, img):
+    if img.startswith("http"):
+        return img
+    return f"{site_url}{'' if img.startswith('/') else '/'}{img}"
+
+
+def render_card_html(page: Dict[str, Any]) -> str:
+    site = _ctx["site"]
+    base_html = _ctx["base_html"]
+    site_url = site["url"]
+
+    full_title = f"{page['title']} | {site['title']}" if page["title"] else site["title"]
+    url = f"{site_url}{page['route']}"
+    # Fallback description only if extracted one is empty
+    desc = page["description"] if page["description"] and len(page["description"]) > 10 else site["description"]
+    images = [_absolute(site_url, img) for img in page["images"]] or [f"{site_url}/favicon.png"]
+    is_article = bool(page["date"])
+
+    json_ld = {
+        "@context": "https://schema.org",
+        "@type": "BlogPosting" if is_article else "WebPage",
+        "headline": full_title,
+        "description": desc,
+        "image": images[0],
+        "url": url,
+        "author": {"@type": "Person", "name": site["author"], "url": site_url},
+    }
+    if is_article:
+        json_ld["datePublished"] = json_ld["dateModified"] = page["date"]
+
+    def attr(value):
+        return html.escape(value, quote=True)
+
+    image_tags = "".join(
+        f'<meta property="og:image" content="{attr(img)}">\n    '
+        f'<meta name="twitter:image" content="{attr(img)}">\n    '
+        for img in images
+    )
+    ld_text = json.dumps(json_ld, indent=2, ensure_ascii=False).replace("</", "<\\/")
+    seo_tags = f"""
+    <title>{html.escape(full_title, quote=False)}</title>
+    <meta name="description" content="{attr(desc)}">
+    <meta property="og:type" content="{'article' if is_article else 'website'}">
+    <meta property="og:title" content="{attr(full_title)}">
+    <meta property="og:description" content="{attr(desc)}">
+    <meta property="og:url" content="{attr(url)}">
+    <meta name="twitter:card" content="summary_large_image">
+    <meta name="twitter:title" content="{attr(full_title)}">
+    <meta name="twitter:description" content="{attr(desc)}">
+    {image_tags}
+    <script type="application/ld+json">
+    {ld_text}
+    </script>"""
+    return base_html.replace("</head>", f"{seo_tags}\n</head>", 1)
+
+
+def card_path(dist_dir, route) -> Optional[str]:
+    """`<dist>/<route>/index.html`, or None when the route (from a post id...) would leave `dist_dir`."""
+    root = os.path.abspath(dist_dir)
+    target = os.path.normpath(os.path.join(root, *route.replace("\\", "/").split("/")))
+    if os.path.isabs(route.lstrip("/")) or os.path.commonpath([root, target]) != root or target == root:
+        return None
+    return os.path.join(target, "index.html")
+
+
+def _render_and_write(page: Dict[str, Any]) -> str:
+    path = card_path(_ctx["out_dir"], page["route"])
+    if path is None:
+        raise ValueError(f"Route {page['route']!r} points outside {_ctx['out_dir']}")
+    atomic_write_text(path, render_card_html(page))
+    return page["route"]
+
+
+def _card_payload(page: Page) -> Dict[str, Any]:
+    payload = asdict(page)
+    # JSON-LD wants ISO dates; only the fields a card depends on are kept
+    payload["date"] = page.date.strftime("%Y-%m-%dT00:00:00.000Z") if page.date else None
+    for key in ("lastmod", "changefreq", "priority", "in_sitemap", "social_card"):
+        payload.pop(key)
+    return payload
+
+
+def _load_state(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def cards_state_path(dist_dir, cache_dir=None):
+    key = hashlib.sha1(os.path.abspath(dist_dir).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir or PATH_CACHE, CARDS_STATE_DIRNAME, f"{key}.json")
+
+
+def render_social_cards(model: SiteModel, dist_dir=PATH_DIST, workers=None, force=False) -> Tuple[List[str], int]:
+    """Writes `<dist>/<route>/index.html` for every post and /page/ route.
+
+    Pages whose inputs (built index.html, site fields, page meta) hash the same
+    as on the previous run are skipped. Changed pages are rendered on a process
+    pool when there are enough of them. Returns (routes written, routes skipped).
+    """
+    index_path = os.path.join(dist_dir, "index.html")
+    with open(index_path, 'r', encoding='utf-8') as f:
+        base_html = f.read()
+
+    site = {"url": model.url, "title": model.title, "description": model.description, "author": model.author}
+    common = hashlib.sha1((base_html + json.dumps(site, sort_keys=True)).encode('utf-8')).hexdigest()
+
+    state_path = cards_state_path(dist_dir)
+    old_state = {} if force else _load_state(state_path)
+    legacy = os.path.join(dist_dir, _LEGACY_CARDS_STATE_FILE)
+    if os.path.exists(legacy):
+        os.remove(legacy)
+    state, todo = {}, []
+    for page in model.pages:
+        if not page.social_card:
+            continue
+        out_file = card_path(dist_dir, page.route)
+        if out_file is None:
+            print(f"⚠️  Skipping social card for unsafe route {page.route!r}")
+            continue
+        payload = _card_payload(page)
+        digest = hashlib.sha1((common + json.dumps(payload, sort_keys=True)).encode('utf-8')).hexdigest()
+        state[page.route] = digest
+        if old_state.get(page.route) != digest or not os.path.exists(out_file):
+            todo.append(payload)
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(todo) >= PARALLEL_MIN_PAGES:
+        chunksize = max(1, len(todo) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(base_html, site, dist_dir)) as pool:
+            written = list(pool.map(_render_and_write, todo, chunksize=chunksize))
+    else:
+        _init_worker(base_html, site, dist_dir)
+        written = [_render_and_write(page) for page in todo]
+
+    atomic_write_text(state_path, dump_json(state))
+    return written, len(state) - len(written)
@@ -0,0 +1,141 @@
+"""Streaming sitemap writer.
+
+Entries are written as they are produced, so memory does not grow with the
+number of posts. While everything fits the sitemap protocol limits the output
+is a single plain `sitemap.xml` (as before). Past 50,000 URLs or 50 MB the
+writer rolls over into `sitemap-<n>.xml.gz` parts and `sitemap.xml` becomes a
+sitemap index pointing at them, so robots.txt never has to change.
+"""
+import glob
+import gzip
+import html
+import os
+import re
+import shutil
+from datetime import datetime
+
+from manager.fileio import atomic_open
+
+MAX_URLS = 50000
+MAX_BYTES = 50 * 1024 * 1024  # uncompressed, per file
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+_HEADER = f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n'.encode('utf-8')
+_FOOTER = b'</urlset>'
+_PART_RE = re.compile(r"sitemap-(\d+)\.xml\.gz$")
+
+
+def _gzip(fileobj):
+    # mtime=0 keeps the bytes stable between runs, so unchanged parts diff clean in git
+    return gzip.GzipFile(filename="", mode="wb", fileobj=fileobj, mtime=0)
+
+
+class SitemapWriter:
+    """Usage: `with SitemapWriter(public_dir, site_url) as w: w.add(url, lastmod, ...)`."""
+
+    def __init__(self, public_dir, site_url, max_urls=MAX_URLS, max_bytes=MAX_BYTES):
+        self.public_dir = public_dir
+        self.site_url = site_url
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(public_dir, "sitemap.xml")
+        self.parts = []  # finished sitemap-<n>.xml.gz paths
+        self.written = []
+        self.removed = []  # stale parts from a previous, larger run
+        self._ctx = None
+        self._out = None
+        self._count = 0
+        self._bytes = 0
+
+    def __enter__(self):
+        self._open_part()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._abort()
+            return False
+        self.close()
+        return False
+
+    # --- parts ---
+    def _part_path(self, n):
+        return os.path.join(self.public_dir, f"sitemap-{n}.xml.gz")
+
+    def _open_part(self):
+        # The first part goes to sitemap.xml uncompressed until we know a split is needed
+        target = self.index_path if not self.parts else self._part_path(len(self.parts) + 1)
+        self._ctx = atomic_open(target)
+        raw = self._ctx.__enter__()
+        self._out = raw if not self.parts else _gzip(raw)
+        self._raw = raw
+        self._target = target
+        self._count = 0
+        self._bytes = len(_HEADER) + len(_FOOTER)
+        self._out.write(_HEADER)
+
+    def _close_part(self):
+        self._out.write(_FOOTER)
+        if self._out is not self._raw:
+            self._out.close()
+        self._ctx.__exit__(None, None, None)
+        self._ctx = None
+
+    def _abort(self):
+        if self._ctx is not None:
+            self._ctx.__exit__(RuntimeError, RuntimeError("aborted"), None)
+            self._ctx = None
+
+    def _roll_over(self):
+        self._close_part()
+        if not self.parts:
+            # Compress what was streamed into sitemap.xml as part 1; the index replaces it at close()
+            first = self._part_path(1)
+            with open(self.index_path, 'rb') as src, atomic_open(first) as raw, _gzip(raw) as dst:
+                shutil.copyfileobj(src, dst)
+            self.parts.append(first)
+        else:
+            self.parts.append(self._target)
+        self._open_part()
+
+    # --- entries ---
+    def add(self, loc, lastmod=None, changefreq=None, priority=None):
+        entry = f'  <url>\n    <loc>{html.escape(loc, quote=False)}</loc>\n'
+        if lastmod:
+            entry += f'    <lastmod>{lastmod}</lastmod>\n'
+        if changefreq:
+            entry += f'    <changefreq>{changefreq}</changefreq>\n'
+        if priority:
+            entry += f'    <priority>{priority}</priority>\n'
+        payload = (entry + '  </url>\n').encode('utf-8')
+
+        if self._count and (self._count >= self.max_urls or self._bytes + len(payload) > self.max_bytes):
+            self._roll_over()
+        self._out.write(payload)
+        self._count += 1
+        self._bytes += len(payload)
+
+    def close(self):
+        self._close_part()
+        if self.parts:
+            self.parts.append(self._target)
+            self._write_index()
+        self._remove_stale_parts()
+        self.written = self.parts + [self.index_path]
+        return self.written
+
+    def _write_index(self):
+        today = datetime.now().strftime("%Y-%m-%d")
+        with atomic_open(self.index_path) as f:
+            f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">\n'.encode('utf-8'))
+            for path in self.parts:
+                loc = html.escape(f"{self.site_url}/{os.path.basename(path)}", quote=False)
+                f.write(f'  <sitemap>\n    <loc>{loc}</loc>\n    <lastmod>{today}</lastmod>\n  </sitemap>\n'.encode('utf-8'))
+            f.write(b'</sitemapindex>')
+
+    def _remove_stale_parts(self):
+        keep = set(self.parts)
+        for path in glob.glob(os.path.join(self.public_dir, "sitemap-*.xml.gz")):
+            if _PART_RE.search(path) and path not in keep:
+                os.remove(path)
+                self.removed.append(path)
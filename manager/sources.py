@@ -0,0 +1,357 @@
+"""Build-time sync of `blog.externalSources` into static posts.
+
+The SPA used to call the GitHub API on every visit (repo info, recursive
+tree, then one raw fetch per README). Here the same READMEs are read from a
+local git repository instead: either a clone/bare repo the user points at,
+or a mirror kept under `manager/.cache/sources/` and refreshed with
+`git remote update`. Blobs are read straight from the object store
+(`ls-tree` + `cat-file --batch`), so no checkout is needed.
+
+Syncs are incremental: the `source` fields of a repo's posts form the
+manifest (README path -> blob sha) of the previous run, so only added,
+changed or deleted READMEs are read and rebuilt, and a repo whose HEAD did
+not move is skipped after one `rev-parse`.
+
+Posts are built exactly like `fetchGitHubPosts` builds them (id, title,
+excerpt, tags, relative image links made absolute against
+raw.githubusercontent.com) and stored with a `source` field. Synced sources
+are listed in `blog.syncedSources`, which tells the SPA not to fetch them.
+"""
+import os
+import re
+import subprocess
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from manager.config import PATH_CACHE
+from manager.posts import encode_content
+from manager.publish import GitError
+from manager.store import STORAGE_INLINE
+
+SOURCES_DIRNAME = "sources"
+README_NAME = "README.md"
+RAW_BASE = "https://raw.githubusercontent.com"
+SYNC_WORKERS = 4  # sources fetched/diffed at once
+
+_GITHUB_RE = re.compile(r"github\.com/([^/]+)/([^/]+)")
+_MD_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+_HTML_IMAGE_RE = re.compile(r'<img([^>]*)src="([^"]+)"([^>]*)>')
+
+
+@dataclass
+class SyncReport:
+    url: str
+    commit: str = ""
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    error: str = ""  # set when the source could not be fetched or read; its posts were kept
+
+    def summary(self):
+        if self.error:
+            return f"{self.url}: sync failed, keeping the posts from {self.commit[:10] or 'no earlier sync'} ({self.error})"
+        return (f"{self.url} @ {self.commit[:10]}: {len(self.added)} added, {len(self.updated)} updated, "
+                f"{len(self.removed)} removed, {self.unchanged} unchanged")
+
+
+def parse_github_url(url) -> Optional[Tuple[str, str]]:
+    """(owner, repo) of a GitHub URL, or None (same parsing as fetchGitHubPosts)."""
+    match = _GITHUB_RE.search(url or "")
+    if not match:
+        return None
+    owner, repo = match.groups()
+    repo = re.sub(r"\.git$", "", repo.rstrip("/"))
+    return owner, repo
+
+
+def _git(repo, *args, stdin=None) -> bytes:
+    try:
+        return subprocess.run(["git", *args], cwd=repo, input=stdin, capture_output=True, check=True).stdout
+    except FileNotFoundError:
+        raise GitError("Git is not installed or not in PATH.")
+    except subprocess.CalledProcessError as e:
+        raise GitError(f"git {args[0]} failed in {repo}: {e.stderr.decode(errors='replace').strip()}")
+
+
+def mirror_path(url, mirror_dir=None):
+    owner, repo = parse_github_url(url)
+    return os.path.join(mirror_dir or os.path.join(PATH_CACHE, SOURCES_DIRNAME), owner, f"{repo}.git")
+
+
+def update_mirror(url, mirror_dir=None, offline=False) -> str:
+    """Clones (or refreshes) a bare mirror of `url` and returns its path."""
+    path = mirror_path(url, mirror_dir)
+    if os.path.isdir(path):
+        if not offline:
+            _git(path, "remote", "update", "--prune")
+    elif offline:
+        raise GitError(f"No local mirror of {url} at {path} (run without --offline first).")
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _git(os.path.dirname(path), "clone", "--mirror", "--quiet", url, path)
+    return path
+
+
+def default_branch(repo) -> str:
+    """Branch HEAD points at: the remote's default branch in a mirror, the current one in a clone."""
+    return _git(repo, "symbolic-ref", "--short", "HEAD").decode().strip()
+
+
+def list_readmes(repo, ref) -> List[Tuple[str, str]]:
+    """[(path, blob sha)] of every README.md in the tree of `ref`."""
+    found = []
+    for entry in _git(repo, "ls-tree", "-r", "-z", "--full-tree", ref).split(b"\0"):
+        if not entry:
+            continue
+        meta, path = entry.split(b"\t", 1)
+        _mode, kind, sha = meta.split()
+        path = path.decode("utf-8", "surrogateescape")
+        if kind == b"blob" and path.endswith(README_NAME):
+            found.append((path, sha.decode()))
+    return found
+
+
+def read_blobs(repo, shas) -> Dict[str, bytes]:
+    """Contents of many blobs from one `git cat-file --batch` process."""
+    shas = list(dict.fromkeys(shas))
+    if not shas:
+        return {}
+    out = _git(repo, "cat-file", "--batch", stdin="".join(f"{s}\n" for s in shas).encode())
+    blobs, pos = {}, 0
+    for sha in shas:
+        header_end = out.index(b"\n", pos)
+        header = out[pos:header_end].split()
+        if header[-1] == b"missing":
+            pos = header_end + 1
+            continue
+        size = int(header[2])
+        blobs[sha] = out[header_end + 1:header_end + 1 + size]
+        pos = header_end + 1 + size + 1  # content is followed by a newline
+    return blobs
+
+
+def last_changed(repo, ref, paths) -> Dict[str, str]:
+    """path -> date (YYYY-MM-DD) of the newest commit touching it.
+
+    One `git log` walk, stopped as soon as every path was seen, so recently
+    changed files cost a few commits rather than the whole history.
+    """
+    wanted, dates, current = set(paths), {}, None
+    if not wanted:
+        return dates
+    proc = subprocess.Popen(["git", "log", "-z", "--format=%x01%cs", "--name-only", ref, "--", f"*{README_NAME}"],
+                            cwd=repo, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    buf = b""
+    try:
+        while len(dates) < len(wanted):
+            chunk = proc.stdout.read1(65536)
+            if not chunk:
+                break
+            *tokens, buf = (buf + chunk).split(b"\0")
+            for token in tokens:
+                token = token.decode("utf-8", "surrogateescape")
+                if token.startswith("\x01"):
+                    current = token[1:].strip()
+                    continue
+                path = token[1:] if token.startswith("\n") else token
+                if path in wanted and path not in dates:
+                    dates[path] = current
+    finally:
+        proc.kill()
+        proc.wait()
+        proc.stdout.close()
+    return dates
+
+
+def _absolute(src, parent_url):
+    if "://" in src or src.startswith("//"):
+        return None
+    return urllib.parse.urljoin(parent_url + "/", src)
+
+
+def rewrite_readme(content, parent_url) -> str:
+    """Makes relative image links absolute, like fetchGitHubPosts does in the browser."""
+    def md(match):
+        url = _absolute(match.group(2), parent_url)
+        return f"![{match.group(1)}]({url})" if url else match.group(0)
+
+    def html(match):
+        url = _absolute(match.group(2), parent_url)
+        return f'<img{match.group(1)}src="{url}"{match.group(3)}>' if url else match.group(0)
+
+    return _HTML_IMAGE_RE.sub(html, _MD_IMAGE_RE.sub(md, content))
+
+
+def _preview(content):
+    lines = [line.strip() for line in content.split("\n")]
+    lines = [line for line in lines if line and not line.startswith("![")][:2]
+    return " ".join(re.sub(r"[*_~`]", "", re.sub(r"^#+\s*", "", line)) for line in lines)
+
+
+def readme_post(owner, repo, branch, path, sha, text, langs, date=None, encode=True) -> Dict[str, Any]:
+    raw_url = f"{RAW_BASE}/{owner}/{repo}/{branch}/{path}"
+    content = rewrite_readme(text, raw_url[:raw_url.rfind("/")])
+
+    dir_path = path[:path.rfind("/")] if "/" in path else ""
+    title = f"{repo}/{dir_path}" if dir_path else repo
+    excerpt = f"Imported from {repo} - {_preview(content)}"
+    id_path = path.replace("/", "-").replace(".md", "", 1).lower()
+    when = datetime.strptime(date, "%Y-%m-%d") if date else datetime.now()
+
+    stored, encoding = encode_content(content, encode)
+    post = {
+        "id": f"gh-{owner}-{repo}-{id_path}",
+        "date": when.strftime("%B %d, %Y"),
+        "title": {l: title for l in langs},
+        "excerpt": {l: excerpt for l in langs},
+        "content": stored,
+        "tags": ["GitHub", repo],
+        "pin": False,
+        "source": {"repo": f"https://github.com/{owner}/{repo}", "path": path, "sha": sha},
+    }
+    if encoding:
+        post["encoding"] = True
+    return post
+
+
+def known_files(posts, url) -> Dict[str, str]:
+    """Manifest of the last sync of `url`: README path -> blob sha, read off the posts' `source` field.
+
+    Keeping it on the posts means it can never disagree with what is stored.
+    """
+    key = _source_key(url)
+    return {p["source"]["path"]: p["source"]["sha"] for p in posts
+            if (p.get("source") or {}).get("repo") == key and p["source"].get("path")}
+
+
+@dataclass
+class SourceDelta:
+    """What changed in one source since its manifest; computed off the main thread."""
+    url: str
+    commit: str
+    changed: List[Dict[str, Any]] = field(default_factory=list)  # new posts for added/changed READMEs
+    deleted: List[str] = field(default_factory=list)  # paths
+    unchanged: int = 0
+
+
+def diff_source(url, repo_path, known: Dict[str, str], langs, encode, last_sync=None) -> SourceDelta:
+    """Walks the tree and builds posts only for READMEs whose blob sha differs from `known`.
+
+    `last_sync` is the source's `blog.syncedSources` entry: if HEAD is still
+    that commit and every post is present, the tree is not even listed.
+    """
+    owner, repo = parse_github_url(url)
+    branch = default_branch(repo_path)
+    commit = _git(repo_path, "rev-parse", branch).decode().strip()
+    last_sync = last_sync or {}
+    if commit == last_sync.get("commit") and known and len(known) == last_sync.get("posts"):
+        return SourceDelta(url, commit, unchanged=len(known))
+
+    readmes = dict(list_readmes(repo_path, branch))
+    todo = {path: sha for path, sha in readmes.items() if known.get(path) != sha}
+    delta = SourceDelta(url, commit, deleted=sorted(set(known) - set(readmes)),
+                        unchanged=len(readmes) - len(todo))
+    if todo:
+        blobs = read_blobs(repo_path, todo.values())
+        dates = last_changed(repo_path, branch, todo)
+        delta.changed = [readme_post(owner, repo, branch, path, sha, blobs[sha].decode("utf-8", "replace"),
+                                     langs, dates.get(path), encode)
+                         for path, sha in sorted(todo.items()) if sha in blobs]
+    return delta
+
+
+def _source_key(url):
+    owner, repo = parse_github_url(url)
+    return f"https://github.com/{owner}/{repo}"
+
+
+def apply_delta(store, delta: SourceDelta) -> SyncReport:
+    """Replaces changed posts in place, drops deleted ones and appends new ones."""
+    report = SyncReport(delta.url, delta.commit, unchanged=delta.unchanged)
+    key = _source_key(delta.url)
+    by_path = {p["source"]["path"]: p for p in delta.changed}
+    deleted = set(delta.deleted)
+    posts = store.get_posts()
+    kept = []
+    for post in posts:
+        path = (post.get("source") or {}).get("path") if (post.get("source") or {}).get("repo") == key else None
+        if path in deleted:
+            report.removed.append(post["id"])
+            store.mark_dirty()
+            continue
+        new = by_path.pop(path, None) if path else None
+        if new is not None:
+            # Same object, so an open editor keeps pointing at the post
+            post.clear()
+            post.update(new)
+            store.mark_post_dirty(post)
+            report.updated.append(post["id"])
+        kept.append(post)
+    for post in by_path.values():
+        kept.append(post)
+        store.mark_post_dirty(post)
+        report.added.append(post["id"])
+    posts[:] = kept
+    return report
+
+
+def materialize_sources(store, local_paths: Dict[str, str] = None, mirror_dir=None,
+                        offline=False, workers=None) -> List[SyncReport]:
+    """Syncs every GitHub URL in `blog.externalSources` into static posts.
+
+    `local_paths` maps a source URL to an existing clone/bare repo to read
+    instead of the cached mirror. Sources are fetched and diffed on a thread
+    pool (the work is git subprocesses); only the resulting changes are
+    applied to the store, on the calling thread. The pool is per source, not
+    per README: a source's READMEs are already read by one `cat-file --batch`
+    and one `git log` walk, and building their posts is pure Python that
+    threads would only serialize on the GIL. A source that fails (repo
+    gone, network down) keeps the posts of its last sync and gets a report
+    with `error` set. Marks the store dirty; the caller saves.
+    """
+    local_paths = {_source_key(u): p for u, p in (local_paths or {}).items() if parse_github_url(u)}
+    blog = store.data.get("blog", {})
+    # Only stored once a source has synced, so a site without sources keeps its data untouched
+    synced = blog.get("syncedSources", {})
+    urls = list(dict.fromkeys(u for u in blog.get("externalSources", []) if parse_github_url(u)))
+    langs = store.get_languages()
+    encode = store.storage == STORAGE_INLINE
+    posts = store.get_posts()
+
+    def work(url):
+        try:
+            repo_path = local_paths.get(_source_key(url)) or update_mirror(url, mirror_dir, offline)
+            return diff_source(url, repo_path, known_files(posts, url), langs, encode, synced.get(url))
+        except GitError as e:
+            return SyncReport(url, commit=(synced.get(url) or {}).get("commit", ""), error=str(e))
+
+    reports = []
+    if urls:
+        with ThreadPoolExecutor(max_workers=min(workers or SYNC_WORKERS, len(urls))) as pool:
+            deltas = list(pool.map(work, urls))
+        for delta in deltas:
+            if isinstance(delta, SyncReport):
+                reports.append(delta)
+                continue
+            report = apply_delta(store, delta)
+            entry = {"commit": delta.commit, "posts": len(known_files(posts, delta.url))}
+            if {k: synced.get(delta.url, {}).get(k) for k in entry} != entry:
+                synced[delta.url] = dict(entry, syncedAt=datetime.now().strftime("%Y-%m-%d"))
+                blog["syncedSources"] = synced
+                store.mark_dirty()
+            reports.append(report)
+
+    # Sources removed from the list: drop their posts and state
+    active = {_source_key(u) for u in urls}
+    for url in [u for u in synced if not parse_github_url(u) or _source_key(u) not in active]:
+        del synced[url]
+        store.mark_dirty()
+    kept = [p for p in posts if (p.get("source") or {}).get("repo") in (None, *active)]
+    if len(kept) != len(posts):
+        posts[:] = kept
+        store.mark_dirty()
+    return reports
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, List, Set
+
+from manager.config import (
+    PATH_TO_JSON, PATH_MANIFEST, DEFAULT_LANGUAGES,
+    POSTS_DIRNAME, STORAGE_INLINE, STORAGE_SHARDED,
+)
+from manager.posts import encode_content, stored_body
+from manager.fileio import atomic_write_text, dump_json
+
+# Dirty-tracking sections (one per file on disk, post bodies are tracked per post)
+SECTION_DATA = "data"
+SECTION_MANIFEST = "manifest"
+
+
+def _hash_text(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def shard_filename(post_id):
+    # Post ids are slugs, but never let one escape the posts dir
+    raw = str(post_id)
+    safe = re.sub(r"[^\w.-]", "_", raw).strip(".")
+    if safe != raw:
+        # "a b" and "a_b" must not share a file: suffix anything sanitizing changed with its raw id's hash
+        safe = f"{safe or 'post'}-{_hash_text(raw)[:8]}"
+    return safe + ".md"
+
+
+class ContentStore:
+    """Owns template.json and manifest.json without any GUI dependency.
+
+    DataManagerApp and the `python -m manager` CLI both load and save through
+    this class, so the same files are produced whichever one is used.
+
+    With `blog.storage == "sharded"` each post body is kept in
+    `posts/<id>.md` next to template.json and the JSON only holds metadata
+    plus a `contentFile` pointer. In memory posts always carry `content`,
+    so callers never need to know which layout is on disk.
+
+    Edits are change-tracked: callers mark what they touched with
+    `mark_dirty()` / `mark_post_dirty()` and `save()` only serializes those
+    sections. Files whose bytes did not change are not rewritten; the rest
+    are replaced atomically.
+    """
+
+    def __init__(self, json_path=PATH_TO_JSON, manifest_path=PATH_MANIFEST):
+        self.json_path = json_path
+        self.manifest_path = manifest_path
+        self.data: Dict[str, Any] = {}
+        self.manifest_data: Dict[str, Any] = {}
+        # contentFile -> hash of the body last read/written, to skip unchanged shards
+        self._shard_hashes: Dict[str, str] = {}
+        # path -> hash of the JSON last read/written
+        self._file_hashes: Dict[str, str] = {}
+        self._dirty: Set[str] = set()
+        self._dirty_posts: Set[int] = set()
+        # Files deleted by the last save() (orphaned shards)
+        self.removed: List[str] = []
+
+    @property
+    def posts_dir(self):
+        return os.path.join(os.path.dirname(self.json_path), POSTS_DIRNAME)
+
+    @property
+    def storage(self):
+        return self.data.get("blog", {}).get("storage", STORAGE_INLINE)
+
+    # --- Change tracking ---
+    def mark_dirty(self, section=SECTION_DATA):
+        self._dirty.add(section)
+
+    def mark_post_dirty(self, post):
+        # Post metadata lives in template.json, the body may live in a shard
+        self._dirty.add(SECTION_DATA)
+        self._dirty_posts.add(id(post))
+
+    def mark_all_dirty(self):
+        self._dirty.update((SECTION_DATA, SECTION_MANIFEST))
+        self._dirty_posts.update(id(p) for p in self.data.get("blog", {}).get("posts", []))
+
+    def is_dirty(self):
+        return bool(self._dirty or self._dirty_posts)
+
+    def assign(self, container, key, value, section=SECTION_DATA):
+        """Sets container[key] and marks `section` dirty only if the value changed."""
+        if container.get(key) != value:
+            container[key] = value
+            self.mark_dirty(section)
+
+    def load_data(self):
+        with open(self.json_path, 'r', encoding='utf-8') as f:
+            raw = f.read()
+        self.data = json.loads(raw)
+        self._file_hashes[self.json_path] = _hash_text(raw)
+        self._dirty.discard(SECTION_DATA)
+        self._dirty_posts.clear()
+
+        self._shard_hashes = {}
+        data_dir = os.path.dirname(self.json_path)
+        for post in self.data.get("blog", {}).get("posts", []):
+            rel = post.get("contentFile")
+            if not rel:
+                continue
+            try:
+                with open(os.path.join(data_dir, rel), 'r', encoding='utf-8') as f:
+                    text = f.read()
+            except FileNotFoundError:
+                text = ""
+            post["content"] = text
+            post["encoding"] = False
+            self._shard_hashes[rel] = _hash_text(text)
+        return self.data
+
+    def load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                raw = f.read()
+            self.manifest_data = json.loads(raw)
+            self._file_hashes[self.manifest_path] = _hash_text(raw)
+        else:
+            self.manifest_data = {}
+        self._dirty.discard(SECTION_MANIFEST)
+        return self.manifest_data
+
+    def save(self, force=False) -> List[str]:
+        """Writes the dirty files (all of them with force=True). Returns the paths written."""
+        if force:
+            self.mark_all_dirty()
+
+        written = []
+        self.removed = []
+        if SECTION_DATA in self._dirty:
+            if self.storage == STORAGE_SHARDED:
+                index, written = self._write_shards()
+            else:
+                index = self.data
+                # Only does something right after switching back from sharded
+                self._remove_orphan_shards(set())
+            if self._write_json(self.json_path, index):
+                written.append(self.json_path)
+
+        if SECTION_MANIFEST in self._dirty and self.manifest_data:
+            if self._write_json(self.manifest_path, self.manifest_data):
+                written.append(self.manifest_path)
+
+        self._dirty.clear()
+        self._dirty_posts.clear()
+        return written
+
+    def _write_json(self, path, obj):
+        text = dump_json(obj)
+        digest = _hash_text(text)
+        if self._file_hashes.get(path) == digest and os.path.exists(path):
+            return False
+        atomic_write_text(path, text)
+        self._file_hashes[path] = digest
+        return True
+
+    def set_storage(self, mode):
+        """Switches between inline and sharded layouts. Takes effect on the next save()."""
+        blog = self.data.setdefault("blog", {})
+        self.mark_all_dirty()
+        if mode == STORAGE_SHARDED:
+            blog["storage"] = STORAGE_SHARDED
+            return
+
+        blog.pop("storage", None)
+        for post in blog.get("posts", []):
+            if post.pop("contentFile", None) is not None:
+                # Back to the default inline format (Base64)
+                post["content"], post["encoding"] = encode_content(stored_body(post), True)
+
+    def _write_shards(self):
+        os.makedirs(self.posts_dir, exist_ok=True)
+        written = []
+        used = set()
+        index_posts = []
+
+        for post in self.data.get("blog", {}).get("posts", []):
+            filename = shard_filename(post.get("id"))
+            rel = f"{POSTS_DIRNAME}/{filename}"
+            if filename in used:
+                raise ValueError(f"Posts share the shard file {rel} (duplicate id {post.get('id')!r})")
+            used.add(filename)
+
+            path = os.path.join(self.posts_dir, filename)
+            known = rel in self._shard_hashes and os.path.exists(path)
+            if id(post) in self._dirty_posts or not known:
+                body = stored_body(post)
+                digest = _hash_text(body)
+                if self._shard_hashes.get(rel) != digest or not known:
+                    atomic_write_text(path, body)
+                    self._shard_hashes[rel] = digest
+                    written.append(path)
+
+            post["contentFile"] = rel
+            entry = {k: v for k, v in post.items() if k not in ("content", "encoding")}
+            index_posts.append(entry)
+
+        self._remove_orphan_shards(used)
+
+        index = dict(self.data)
+        index["blog"] = dict(self.data.get("blog", {}), posts=index_posts)
+        return index, written
+
+    def _remove_orphan_shards(self, used):
+        """Deletes shards this store read or wrote that no post uses any more; other files are left alone."""
+        for rel in list(self._shard_hashes):
+            name = rel.split("/")[-1]
+            if name in used:
+                continue
+            del self._shard_hashes[rel]
+            # contentFile comes from template.json: never delete outside posts/
+            if rel != f"{POSTS_DIRNAME}/{name}" or not name.endswith(".md") or name.startswith("."):
+                continue
+            path = os.path.join(self.posts_dir, name)
+            if os.path.exists(path):
+                os.remove(path)
+                self.removed.append(path)
+
+    # --- Helpers shared by GUI & CLI ---
+    def get_languages(self):
+        return self.data.get("site", {}).get("languages", list(DEFAULT_LANGUAGES))
+
+    def get_posts(self):
+        if "blog" not in self.data:
+            self.data["blog"] = {"posts": []}
+        if "posts" not in self.data["blog"]:
+            self.data["blog"]["posts"] = []
+        return self.data["blog"]["posts"]
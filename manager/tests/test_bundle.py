@@ -0,0 +1,75 @@
+import json
+import stat
+import zipfile
+
+from manager.bundle import import_pwa_zip, safe_member_path
+
+ICON_192 = "android/android-launchericon-192-192.png"
+ICON_512 = "android/android-launchericon-512-512.png"
+
+
+def _icon(src, size):
+    return {"src": src, "sizes": f"{size}x{size}"}
+
+
+def _bundle(path, icons, members):
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("icons.json", json.dumps({"icons": icons}))
+        for info, payload in members:
+            zf.writestr(info, payload)
+    return path
+
+
+def _symlink(name, target):
+    info = zipfile.ZipInfo(name)
+    info.external_attr = (stat.S_IFLNK | 0o777) << 16
+    return info, target
+
+
+def test_safe_member_path():
+    assert safe_member_path("ios/180.png") == "ios/180.png"
+    assert safe_member_path("a/./b/../c.png") == "a/c.png"
+    for name in ("../x.png", "a/../../x.png", "/etc/passwd", "\\..\\x.png", "C:/x.png", ".."):
+        assert safe_member_path(name) is None, name
+
+
+def test_unsafe_members_are_rejected(tmp_path):
+    public = tmp_path / "site" / "public"
+    public.mkdir(parents=True)
+    icons = [_icon("../escape.png", 192), _icon("/abs.png", 192), _icon("android/link.png", 192)]
+    zip_path = _bundle(tmp_path / "bundle.zip", icons, [
+        (zipfile.ZipInfo("../escape.png"), b"x"),
+        (zipfile.ZipInfo("/abs.png"), b"x"),
+        _symlink("android/link.png", "../../../escape.png"),
+    ])
+
+    manifest = {}
+    report = import_pwa_zip(str(zip_path), str(public), manifest, update_favicon=False)
+
+    assert report.written == [str(public / "icons.json")] and report.icons_merged == 0
+    assert {"../escape.png", "/abs.png", "android/link.png"} <= set(report.rejected)
+    assert not (tmp_path / "site" / "escape.png").exists() and not (tmp_path / "escape.png").exists()
+    assert not (public / "android" / "link.png").exists()
+    assert manifest.get("icons", []) == []
+
+
+def test_only_icons_on_disk_are_merged(tmp_path):
+    public = tmp_path / "public"
+    (public / "android").mkdir(parents=True)
+    (public / "ios").mkdir()
+    (public / "ios" / "180.png").write_bytes(b"kept")
+    icons = [_icon(ICON_192, 192), _icon(ICON_512, 512), _icon("ios/180.png", 180)]
+    zip_path = _bundle(tmp_path / "bundle.zip", icons, [(zipfile.ZipInfo(ICON_192), b"png")])
+
+    manifest = {}
+    report = import_pwa_zip(str(zip_path), str(public), manifest, update_favicon=False)
+
+    assert ICON_512 in report.rejected
+    # The 512 icon is missing from the ZIP and not on disk; ios/180 is not a launcher icon
+    assert [icon["src"] for icon in manifest["icons"]] == ["/" + ICON_192]
+
+    # Once the site has the file, a bundle missing it may still list it
+    (public / "android" / "android-launchericon-512-512.png").write_bytes(b"png")
+    report = import_pwa_zip(str(zip_path), str(public), manifest, update_favicon=False)
+    assert report.skipped and report.icons_merged == 1
+    assert sorted(icon["src"] for icon in manifest["icons"]) == ["/" + ICON_192, "/" + ICON_512]
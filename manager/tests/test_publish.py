@@ -0,0 +1,84 @@
+import subprocess
+
+import pytest
+
+from manager.changes import PendingChanges
+from manager.publish import push_changes
+
+
+def _git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def repo(tmp_path):
+    remote = tmp_path / "remote.git"
+    work = tmp_path / "work"
+    _git(tmp_path, "init", "-q", "--bare", str(remote))
+    _git(tmp_path, "init", "-q", str(work))
+    for key, value in (("user.name", "Test"), ("user.email", "test@example.com"), ("commit.gpgsign", "false")):
+        _git(work, "config", key, value)
+    _git(work, "remote", "add", "origin", str(remote))
+
+    (work / "posts").mkdir()
+    for name in ("a*.md", "ab.md", "gone.md"):
+        (work / "posts" / name).write_text("v1", encoding="utf-8")
+    (work / "notes.txt").write_text("v1", encoding="utf-8")
+    _git(work, "add", "-A")
+    _git(work, "commit", "-q", "-m", "init")
+    _git(work, "push", "-q", "-u", "origin", "HEAD")
+    return work
+
+
+def _committed(repo):
+    return sorted(_git(repo, "show", "--name-only", "--format=", "HEAD").split())
+
+
+def test_only_pending_paths_are_committed(repo):
+    for name in ("a*.md", "ab.md"):
+        (repo / "posts" / name).write_text("v2", encoding="utf-8")
+    (repo / "posts" / "gone.md").unlink()
+    (repo / "notes.txt").write_text("unrelated edit", encoding="utf-8")
+    (repo / "new.txt").write_text("untracked", encoding="utf-8")
+
+    assert push_changes(str(repo), message="update", paths=["posts/a*.md", "posts/gone.md"]) is True
+
+    assert _committed(repo) == ["posts/a*.md", "posts/gone.md"]
+    # The glob-looking name did not pull in ab.md; nothing unrelated was staged either
+    assert sorted(_git(repo, "status", "--porcelain").splitlines()) == [" M notes.txt", " M posts/ab.md", "?? new.txt"]
+    assert _git(repo, "rev-parse", "HEAD") == _git(repo, "rev-parse", "@{u}")
+
+
+def test_nothing_to_commit(repo):
+    (repo / "notes.txt").write_text("unrelated edit", encoding="utf-8")
+    assert push_changes(str(repo), paths=["posts/ab.md"]) is False
+    assert _git(repo, "log", "--format=%s") == "init\n"
+
+
+def test_pathspec_magic_is_literal(repo):
+    (repo / "notes.txt").write_text("unrelated edit", encoding="utf-8")
+    (repo / ":(glob)*").write_text("odd name", encoding="utf-8")
+    assert push_changes(str(repo), message="odd", paths=[":(glob)*"]) is True
+    assert _committed(repo) == [":(glob)*"]
+
+
+def test_paths_recorded_during_a_push_stay_pending(repo):
+    pending = PendingChanges(str(repo))
+    pending.record("posts/ab.md", "posts/gone.md")
+    (repo / "posts" / "ab.md").write_text("v2", encoding="utf-8")
+    paths, generation = pending.paths(), pending.generation
+
+    def save_while_pushing(line):
+        # The GUI saving again while git runs: one new file, one file already in the snapshot
+        if line.startswith("$ git push"):
+            (repo / "notes.txt").write_text("saved during push", encoding="utf-8")
+            pending.record("notes.txt", "posts/ab.md")
+
+    push_changes(str(repo), message="update", on_output=save_while_pushing, paths=paths)
+    pending.discard(paths, since=generation)
+
+    assert pending.paths() == ["notes.txt", "posts/ab.md"]
+    assert PendingChanges(str(repo)).paths() == ["notes.txt", "posts/ab.md"]
+
+    pending.discard(pending.paths(), since=pending.generation)
+    assert pending.paths() == [] and PendingChanges(str(repo)).paths() == []
@@ -0,0 +1,113 @@
+import base64
+import functools
+import http.server
+import threading
+
+import pytest
+
+from manager.remote import RemoteCache, localize_media
+from manager.store import ContentStore
+
+Image = pytest.importorskip("PIL.Image")
+
+
+class _Handler(http.server.SimpleHTTPRequestHandler):
+    requests = []
+
+    def end_headers(self):
+        self.requests.append((self.path, self.headers.get("If-Modified-Since")))
+        super().end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Local stand-in for the image hosts: serves tmp_path/www on 127.0.0.1."""
+    www = tmp_path / "www"
+    www.mkdir()
+    Image.new("RGB", (1200, 800), (200, 40, 40)).save(www / "banner.png")
+    Image.new("RGB", (300, 200), (40, 200, 40)).save(www / "inline.jpg")
+    (www / "page.txt").write_text("not an image", encoding="utf-8")
+
+    _Handler.requests = []
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_Handler, directory=str(www)))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _store(tmp_path, base):
+    body = f"# Post\n\n![inline]({base}/inline.jpg)\n\n<img src=\"{base}/page.txt\" alt=\"x\">\n"
+    store = ContentStore(str(tmp_path / "template.json"), str(tmp_path / "manifest.json"))
+    store.data = {"site": {"url": "https://example.github.io"}, "blog": {"posts": [{
+        "id": "post", "banner": {"url": f"{base}/banner.png", "type": "image", "alt": "Banner"},
+        "content": base64.b64encode(body.encode("utf-8")).decode("ascii"), "encoding": True}]}}
+    return store
+
+
+def _body(store):
+    return base64.b64decode(store.get_posts()[0]["content"]).decode("utf-8")
+
+
+def test_localize_downloads_then_revalidates(tmp_path, server):
+    cache = RemoteCache(str(tmp_path / "cache"))
+    public = tmp_path / "public"
+
+    store = _store(tmp_path, server)
+    report = localize_media(store, str(public), cache=cache)
+    assert (report.downloaded, report.revalidated, report.cached) == (2, 0, 0)
+    assert list(report.failed) == [f"{server}/page.txt"]
+    assert "not an image" in report.failed[f"{server}/page.txt"]
+    assert report.posts == ["post"] and store.is_dirty()
+
+    banner = store.get_posts()[0]["banner"]
+    assert banner["url"].startswith("/media/") and banner["alt"] == "Banner"
+    assert (banner["width"], banner["height"]) == (1200, 800)
+    assert banner["srcSet"].count("w,") == 2  # 480w and 960w variants next to the full size
+    for web_path in [banner["url"]] + [part.split()[0] for part in banner["srcSet"].split(", ")]:
+        assert (public / web_path.lstrip("/")).is_file()
+
+    body = _body(store)
+    assert f"![inline]({report.localized[server + '/inline.jpg']})" in body
+    assert report.localized[server + "/inline.jpg"].startswith("/media/")
+    assert f'<img src="{server}/page.txt"' in body  # failures keep their remote URL
+
+    # Second run on the original posts: conditional requests, answered 304
+    _Handler.requests.clear()
+    report = localize_media(_store(tmp_path, server), str(public), cache=cache)
+    assert (report.downloaded, report.revalidated, report.cached) == (0, 2, 0)
+    conditional = {path: ims for path, ims in _Handler.requests}
+    assert conditional["/banner.png"] and conditional["/inline.jpg"]
+
+
+def test_offline_uses_only_the_cache(tmp_path, server):
+    cache = RemoteCache(str(tmp_path / "cache"))
+    public = tmp_path / "public"
+
+    report = localize_media(_store(tmp_path, server), str(public), cache=cache, offline=True)
+    assert report.localized == {}
+    assert set(report.failed.values()) == {"not in cache"}
+
+    localize_media(_store(tmp_path, server), str(public), cache=cache)
+    _Handler.requests.clear()
+    store = _store(tmp_path, server)
+    report = localize_media(store, str(public), cache=cache, offline=True)
+    assert (report.downloaded, report.revalidated, report.cached) == (0, 0, 2)
+    assert _Handler.requests == []
+    assert store.get_posts()[0]["banner"]["url"].startswith("/media/")
+
+
+def test_site_host_and_host_filter(tmp_path, server):
+    store = _store(tmp_path, server)
+    report = localize_media(store, str(tmp_path / "public"), cache=RemoteCache(str(tmp_path / "cache")),
+                            hosts={"elsewhere.example"})
+    assert report.localized == {} and report.failed == {} and not store.is_dirty()
+
+    store = _store(tmp_path, server)
+    store.data["site"]["url"] = server
+    report = localize_media(store, str(tmp_path / "public"), cache=RemoteCache(str(tmp_path / "cache")))
+    assert report.localized == {} and _Handler.requests == []
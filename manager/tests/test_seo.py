@@ -0,0 +1,29 @@
+import os
+
+from manager import seo
+from manager.seo import build_site_model, card_path, render_social_cards
+
+
+def test_card_path_stays_inside_dist(tmp_path):
+    dist = str(tmp_path / "dist")
+    assert card_path(dist, "/post/abc") == os.path.join(dist, "post", "abc", "index.html")
+    assert card_path(dist, "/page/a/../b") == os.path.join(dist, "page", "b", "index.html")
+    for route in ("/post/../../escape", "/../escape", "/post/..", "/post/a\\..\\..\\..\\escape", "/"):
+        assert card_path(dist, route) is None, route
+
+
+def test_crafted_post_ids_are_not_rendered(tmp_path, monkeypatch):
+    monkeypatch.setattr(seo, "PATH_CACHE", str(tmp_path / "cache"))
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    (dist / "index.html").write_text("<html><head><title>x</title></head><body></body></html>", encoding="utf-8")
+    data = {"site": {"title": {"en": "Site"}, "url": "https://example.github.io", "languages": ["en"]},
+            "blog": {"posts": [{"id": "fine", "title": {"en": "Fine"}, "date": "January 01, 2024"},
+                               {"id": "../../escape", "title": {"en": "Bad"}, "date": "January 01, 2024"}]}}
+
+    written, skipped = render_social_cards(build_site_model(data, str(tmp_path)), str(dist), workers=1)
+    assert written == ["/post/fine"] and skipped == 0
+    assert (dist / "post" / "fine" / "index.html").exists()
+    assert not (tmp_path / "escape").exists()
+    # Render state goes to the cache, not into the deployed output
+    assert os.listdir(tmp_path / "cache" / "social-cards") and not (dist / ".social-cards.json").exists()
@@ -0,0 +1,66 @@
+import gzip
+import os
+import xml.etree.ElementTree as ET
+
+from manager.sitemap import SITEMAP_NS, SitemapWriter
+
+NS = {"sm": SITEMAP_NS}
+SITE = "https://example.github.io"
+
+
+def _write(public_dir, count, **limits):
+    with SitemapWriter(str(public_dir), SITE, **limits) as sitemap:
+        for i in range(count):
+            sitemap.add(f"{SITE}/post/{i}", lastmod="2024-01-01", priority="0.8")
+    return sitemap
+
+
+def _locs(xml_bytes, tag):
+    return [el.text for el in ET.fromstring(xml_bytes).findall(f"sm:{tag}/sm:loc", NS)]
+
+
+def test_small_site_is_one_plain_sitemap(tmp_path):
+    sitemap = _write(tmp_path, 3, max_urls=3)
+    assert sitemap.parts == [] and sitemap.written == [str(tmp_path / "sitemap.xml")]
+    assert _locs((tmp_path / "sitemap.xml").read_bytes(), "url") == [f"{SITE}/post/{i}" for i in range(3)]
+    assert not list(tmp_path.glob("sitemap-*.xml.gz"))
+
+
+def test_rolls_over_into_gzip_parts_with_an_index(tmp_path):
+    sitemap = _write(tmp_path, 7, max_urls=3)
+    parts = [str(tmp_path / f"sitemap-{n}.xml.gz") for n in (1, 2, 3)]
+    assert sitemap.parts == parts
+    assert sitemap.written == parts + [str(tmp_path / "sitemap.xml")]
+
+    urls = [_locs(gzip.decompress((tmp_path / os.path.basename(p)).read_bytes()), "url") for p in parts]
+    assert [len(u) for u in urls] == [3, 3, 1]
+    assert sum(urls, []) == [f"{SITE}/post/{i}" for i in range(7)]
+
+    index = (tmp_path / "sitemap.xml").read_bytes()
+    assert ET.fromstring(index).tag == f"{{{SITEMAP_NS}}}sitemapindex"
+    assert _locs(index, "sitemap") == [f"{SITE}/sitemap-{n}.xml.gz" for n in (1, 2, 3)]
+
+
+def test_byte_limit_also_rolls_over(tmp_path):
+    sitemap = _write(tmp_path, 4, max_bytes=400)
+    assert len(sitemap.parts) == 2
+    for path in sitemap.parts:
+        xml_bytes = gzip.decompress((tmp_path / os.path.basename(path)).read_bytes())
+        assert len(xml_bytes) <= 400 and len(_locs(xml_bytes, "url")) == 2
+
+
+def test_stale_parts_are_removed_when_the_site_shrinks(tmp_path):
+    _write(tmp_path, 7, max_urls=3)
+    (tmp_path / "sitemap-9.xml.gz").write_bytes(b"")  # from an even older run
+
+    sitemap = _write(tmp_path, 2, max_urls=3)
+    assert not list(tmp_path.glob("sitemap-*.xml.gz"))
+    assert sorted(sitemap.removed) == sorted(str(tmp_path / f"sitemap-{n}.xml.gz") for n in (1, 2, 3, 9))
+    assert _locs((tmp_path / "sitemap.xml").read_bytes(), "url") == [f"{SITE}/post/0", f"{SITE}/post/1"]
+
+
+def test_gzip_parts_are_byte_stable(tmp_path):
+    _write(tmp_path, 5, max_urls=2)
+    first = (tmp_path / "sitemap-1.xml.gz").read_bytes()
+    _write(tmp_path, 5, max_urls=2)
+    assert (tmp_path / "sitemap-1.xml.gz").read_bytes() == first
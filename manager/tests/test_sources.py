@@ -0,0 +1,132 @@
+import base64
+import subprocess
+
+import pytest
+
+from manager.sources import materialize_sources
+from manager.store import ContentStore
+
+URL = "https://github.com/octo/tools"
+
+
+def _git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+def _commit(repo, files, message):
+    for path, text in files.items():
+        target = repo / path
+        if text is None:
+            target.unlink()
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(text, encoding="utf-8")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", message)
+
+
+@pytest.fixture
+def source(tmp_path):
+    repo = tmp_path / "tools"
+    _git(tmp_path, "init", "-q", "-b", "main", str(repo))
+    for key, value in (("user.name", "Test"), ("user.email", "test@example.com"), ("commit.gpgsign", "false")):
+        _git(repo, "config", key, value)
+    _commit(repo, {"README.md": "# Tools\n\nTop level", "scanner/README.md": "# Scanner\n\n![logo](logo.png)",
+                   "fuzzer/README.md": "# Fuzzer"}, "init")
+    return repo
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ContentStore(str(tmp_path / "data" / "template.json"), str(tmp_path / "data" / "manifest.json"))
+    store.data = {"site": {"languages": ["en", "ar"]},
+                  "blog": {"externalSources": [URL], "posts": [{"id": "own-post", "title": {"en": "Mine"}}]}}
+    return store
+
+
+def _ids(store):
+    return sorted(p["id"] for p in store.get_posts())
+
+
+def test_failing_source_keeps_its_posts(tmp_path, source, store):
+    [report] = materialize_sources(store, {URL: str(source)})
+    assert not report.error and len(report.added) == 3
+    before = [dict(p) for p in store.get_posts()]
+    synced = dict(store.data["blog"]["syncedSources"][URL])
+
+    not_a_repo = tmp_path / "empty"
+    not_a_repo.mkdir()
+    [report] = materialize_sources(store, {URL: str(not_a_repo)})
+    assert report.error and report.commit == synced["commit"]
+    assert "sync failed" in report.summary()
+    assert store.get_posts() == before
+    assert store.data["blog"]["syncedSources"][URL] == synced
+
+
+def test_first_sync_materializes_every_readme(source, store):
+    [report] = materialize_sources(store, {URL: str(source)})
+    assert sorted(report.added) == ["gh-octo-tools-fuzzer-readme", "gh-octo-tools-readme", "gh-octo-tools-scanner-readme"]
+    assert (report.updated, report.removed, report.unchanged) == ([], [], 0)
+    assert _ids(store) == ["gh-octo-tools-fuzzer-readme", "gh-octo-tools-readme", "gh-octo-tools-scanner-readme",
+                           "own-post"]
+
+    scanner = next(p for p in store.get_posts() if p["id"] == "gh-octo-tools-scanner-readme")
+    assert scanner["source"] == {"repo": URL, "path": "scanner/README.md",
+                                 "sha": _git(source, "rev-parse", "main:scanner/README.md").strip()}
+    assert scanner["title"] == {"en": "tools/scanner", "ar": "tools/scanner"}
+    # Stored base64 for the inline layout; relative images point at raw.githubusercontent
+    assert "https://raw.githubusercontent.com/octo/tools/main/scanner/logo.png" in \
+        base64.b64decode(scanner["content"]).decode("utf-8")
+    assert store.data["blog"]["syncedSources"][URL]["commit"] == _git(source, "rev-parse", "main").strip()
+    assert store.data["blog"]["syncedSources"][URL]["posts"] == 3
+
+
+def test_resync_applies_only_the_changes(source, store):
+    materialize_sources(store, {URL: str(source)})
+    fuzzer = next(p for p in store.get_posts() if p["id"] == "gh-octo-tools-fuzzer-readme")
+    top = next(p for p in store.get_posts() if p["id"] == "gh-octo-tools-readme")
+    top_content = top["content"]
+
+    _commit(source, {"scanner/README.md": None, "fuzzer/README.md": "# Fuzzer\n\nNow with docs",
+                     "proxy/README.md": "# Proxy"}, "change")
+    [report] = materialize_sources(store, {URL: str(source)})
+    assert report.added == ["gh-octo-tools-proxy-readme"]
+    assert report.updated == ["gh-octo-tools-fuzzer-readme"]
+    assert report.removed == ["gh-octo-tools-scanner-readme"]
+    assert report.unchanged == 1
+
+    assert _ids(store) == ["gh-octo-tools-fuzzer-readme", "gh-octo-tools-proxy-readme", "gh-octo-tools-readme",
+                           "own-post"]
+    # Updated in place (an open editor keeps its object); untouched posts are left as they were
+    assert next(p for p in store.get_posts() if p["id"] == "gh-octo-tools-fuzzer-readme") is fuzzer
+    assert fuzzer["source"]["sha"] == _git(source, "rev-parse", "main:fuzzer/README.md").strip()
+    assert top["content"] == top_content
+    assert store.data["blog"]["syncedSources"][URL]["posts"] == 3
+
+
+def test_noop_resync_changes_nothing(source, store):
+    materialize_sources(store, {URL: str(source)})
+    store.save(force=True)
+    before = [dict(p) for p in store.get_posts()]
+
+    [report] = materialize_sources(store, {URL: str(source)})
+    assert (report.added, report.updated, report.removed, report.unchanged) == ([], [], [], 3)
+    assert store.get_posts() == before
+    assert not store.is_dirty()
+
+
+def test_removed_source_drops_its_posts(source, store):
+    materialize_sources(store, {URL: str(source)})
+    store.data["blog"]["externalSources"] = []
+    assert materialize_sources(store, {URL: str(source)}) == []
+    assert _ids(store) == ["own-post"]
+    assert store.data["blog"]["syncedSources"] == {}
+
+
+def test_site_without_sources_is_left_untouched(store):
+    store.data["blog"] = {"posts": [{"id": "own-post", "title": {"en": "Mine"}}]}
+    store.save(force=True)
+
+    assert materialize_sources(store) == []
+    assert "syncedSources" not in store.data["blog"]
+    assert not store.is_dirty()
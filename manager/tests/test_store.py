@@ -0,0 +1,161 @@
+import base64
+import json
+import os
+
+import pytest
+
+from manager.config import STORAGE_SHARDED
+from manager.store import ContentStore, shard_filename
+
+
+def _post(post_id, body):
+    return {"id": post_id, "title": {"en": post_id}, "excerpt": {"en": ""}, "date": "January 01, 2024",
+            "tags": [], "content": base64.b64encode(body.encode("utf-8")).decode("ascii"), "encoding": True}
+
+
+def _store(tmp_path, posts, sharded=False):
+    store = ContentStore(str(tmp_path / "template.json"), str(tmp_path / "manifest.json"))
+    store.data = {"site": {"languages": ["en"]}, "blog": {"posts": posts}}
+    store.manifest_data = {"name": "site"}
+    if sharded:
+        store.set_storage(STORAGE_SHARDED)
+    store.save(force=True)
+    return store
+
+
+def _reload(tmp_path):
+    store = ContentStore(str(tmp_path / "template.json"), str(tmp_path / "manifest.json"))
+    store.load_data()
+    store.load_manifest()
+    return store
+
+
+def _bodies(store):
+    return {p["id"]: p["content"] for p in store.get_posts()}
+
+
+def test_sharded_round_trip(tmp_path):
+    _store(tmp_path, [_post("first", "# One"), _post("second", "# Two\n\nBody")], sharded=True)
+
+    index = json.loads((tmp_path / "template.json").read_text(encoding="utf-8"))
+    assert [p["contentFile"] for p in index["blog"]["posts"]] == ["posts/first.md", "posts/second.md"]
+    assert all("content" not in p for p in index["blog"]["posts"])
+    assert (tmp_path / "posts" / "second.md").read_text(encoding="utf-8") == "# Two\n\nBody"
+    assert _bodies(_reload(tmp_path)) == {"first": "# One", "second": "# Two\n\nBody"}
+
+
+def test_switching_storage_modes(tmp_path):
+    store = _store(tmp_path, [_post("first", "# One")], sharded=True)
+    assert (tmp_path / "posts" / "first.md").exists()
+
+    store.set_storage("inline")
+    store.save()
+    assert not (tmp_path / "posts" / "first.md").exists()
+    assert str(tmp_path / "posts" / "first.md") in store.removed
+    post = _reload(tmp_path).get_posts()[0]
+    assert "contentFile" not in post and post["encoding"] is True
+    assert base64.b64decode(post["content"]).decode("utf-8") == "# One"
+
+    store = _reload(tmp_path)
+    store.set_storage(STORAGE_SHARDED)
+    store.save()
+    assert _bodies(_reload(tmp_path)) == {"first": "# One"}
+
+
+def test_colliding_ids_keep_their_own_body(tmp_path):
+    assert shard_filename("a b") != shard_filename("a_b")
+    assert shard_filename("a_b") == "a_b.md"
+    assert shard_filename("../../etc").startswith("_.._etc-")
+
+    _store(tmp_path, [_post("a b", "first body"), _post("a_b", "second body")], sharded=True)
+    assert _bodies(_reload(tmp_path)) == {"a b": "first body", "a_b": "second body"}
+
+
+def test_duplicate_ids_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        _store(tmp_path, [_post("same", "one"), _post("same", "two")], sharded=True)
+
+
+def test_inline_save_leaves_unknown_markdown_alone(tmp_path):
+    notes = tmp_path / "posts" / "notes.md"
+    notes.parent.mkdir()
+    notes.write_text("not a shard", encoding="utf-8")
+
+    store = _store(tmp_path, [_post("first", "# One")])
+    store.get_posts()[0]["title"]["en"] = "Changed"
+    store.mark_post_dirty(store.get_posts()[0])
+    store.save()
+    assert notes.read_text(encoding="utf-8") == "not a shard"
+    assert store.removed == []
+
+
+def test_deleted_post_removes_its_shard(tmp_path):
+    _store(tmp_path, [_post("first", "one"), _post("second", "two")], sharded=True)
+    store = _reload(tmp_path)
+    store.get_posts().pop()
+    store.mark_dirty()
+    store.save()
+    assert not os.path.exists(tmp_path / "posts" / "second.md")
+    assert _bodies(_reload(tmp_path)) == {"first": "one"}
+
+
+# --- Change-tracked saves ---
+def _mtimes(tmp_path):
+    return {p: os.stat(p).st_mtime_ns for p in map(str, tmp_path.rglob("*")) if os.path.isfile(p)}
+
+
+def test_untouched_save_writes_nothing(tmp_path):
+    _store(tmp_path, [_post("first", "one"), _post("second", "two")], sharded=True)
+    before = _mtimes(tmp_path)
+    store = _reload(tmp_path)
+    assert store.save() == []
+    store.mark_all_dirty()
+    assert store.save() == []
+    assert _mtimes(tmp_path) == before
+
+
+def test_editing_one_post_rewrites_only_its_shard_and_the_index(tmp_path):
+    _store(tmp_path, [_post("first", "one"), _post("second", "two")], sharded=True)
+    store = _reload(tmp_path)
+    post = store.get_posts()[1]
+    post["content"] = "two, edited"
+    post["title"]["en"] = "Second, edited"
+    store.mark_post_dirty(post)
+    assert store.save() == [str(tmp_path / "posts" / "second.md"), str(tmp_path / "template.json")]
+    assert _bodies(_reload(tmp_path)) == {"first": "one", "second": "two, edited"}
+
+    # A body-only edit leaves the index bytes unchanged, so only the shard is written
+    post["content"] = "two, again"
+    store.mark_post_dirty(post)
+    assert store.save() == [str(tmp_path / "posts" / "second.md")]
+
+
+def test_force_rewrites_everything(tmp_path):
+    _store(tmp_path, [_post("first", "one"), _post("second", "two")], sharded=True)
+    for path in (tmp_path / "template.json", tmp_path / "manifest.json",
+                 tmp_path / "posts" / "first.md", tmp_path / "posts" / "second.md"):
+        path.unlink()
+    store = _reload_after_delete(tmp_path)
+    written = store.save(force=True)
+    assert sorted(written) == sorted(map(str, (tmp_path / "template.json", tmp_path / "manifest.json",
+                                               tmp_path / "posts" / "first.md", tmp_path / "posts" / "second.md")))
+
+
+def _reload_after_delete(tmp_path):
+    # Same in-memory content as before the files were deleted
+    store = ContentStore(str(tmp_path / "template.json"), str(tmp_path / "manifest.json"))
+    store.data = {"site": {"languages": ["en"]},
+                  "blog": {"storage": STORAGE_SHARDED, "posts": [_post("first", "one"), _post("second", "two")]}}
+    store.manifest_data = {"name": "site"}
+    return store
+
+
+def test_manifest_only_edit_leaves_template_alone(tmp_path):
+    _store(tmp_path, [_post("first", "one")])
+    template_mtime = os.stat(tmp_path / "template.json").st_mtime_ns
+    store = _reload(tmp_path)
+    store.assign(store.manifest_data, "name", "renamed", section="manifest")
+    store.assign(store.data["site"], "languages", ["en"])  # unchanged value: not dirty
+    assert store.save() == [str(tmp_path / "manifest.json")]
+    assert os.stat(tmp_path / "template.json").st_mtime_ns == template_mtime
+    assert json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))["name"] == "renamed"
@@ -0,0 +1,17 @@
+from manager.thumbs import _cache_name
+
+
+def test_cache_key_covers_folder_and_extension(tmp_path):
+    paths = [tmp_path / "a" / "logo.png", tmp_path / "b" / "logo.png", tmp_path / "a" / "logo.jpg"]
+    for path in paths:
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(b"same")
+
+    prefixes = [_cache_name(str(path), 200)[1] for path in paths]
+    assert len(set(prefixes)) == 3
+    # The stale sweep matches by prefix, so no key may be a prefix of another source's key
+    assert not any(a != b and b.startswith(a) for a in prefixes for b in prefixes)
+
+    name, prefix = _cache_name(str(paths[0]), 200)
+    assert name.startswith(prefix) and name.endswith(".png")
+    assert _cache_name(str(paths[0]), 400)[1] != prefix
@@ -0,0 +1,55 @@
+"""Disk cache of scaled-down preview images for the GUI.
+
+Thumbnails are keyed by source path, width and the source's mtime/size, so
+an edited image is re-scaled on next use and an unchanged one is never
+decoded at full size again.
+"""
+import hashlib
+import os
+
+from manager.config import PATH_CACHE, PATH_REPO_ROOT
+from manager.fileio import atomic_open
+
+THUMB_DIRNAME = "thumbs"
+
+
+def _cache_name(src_path, width):
+    st = os.stat(src_path)
+    # Same-named images in different folders, or with another extension, get their own entry
+    rel = os.path.relpath(os.path.abspath(src_path), PATH_REPO_ROOT).replace(os.sep, "/")
+    digest = hashlib.sha1(rel.encode("utf-8")).hexdigest()[:12]
+    prefix = f"{os.path.basename(src_path)}-{digest}-w{width}-"
+    return f"{prefix}{st.st_mtime_ns:x}-{st.st_size:x}.png", prefix
+
+
+def thumbnail_path(src_path, width, cache_dir=None) -> str:
+    """Returns a cached PNG of `src_path` scaled to `width` px, creating it if needed."""
+    cache_dir = cache_dir or os.path.join(PATH_CACHE, THUMB_DIRNAME)
+    name, prefix = _cache_name(src_path, width)
+    path = os.path.join(cache_dir, name)
+    if os.path.exists(path):
+        return path
+
+    from PIL import Image
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # Older thumbnails of the same source/width are stale now
+    for stale in os.listdir(cache_dir):
+        if stale.startswith(prefix):
+            os.remove(os.path.join(cache_dir, stale))
+    with Image.open(src_path) as img:
+        img.draft("RGB", (width, width * 4))  # JPEG: decode at reduced scale
+        height = max(1, round(img.height * width / img.width))
+        thumb = img.convert("RGBA").resize((width, height), Image.LANCZOS)
+    with atomic_open(path) as out:
+        thumb.save(out, "PNG", optimize=True)
+    return path
+
+
+def load_thumbnail(src_path, width, cache_dir=None):
+    """PIL image of the cached thumbnail (loaded eagerly, so no file handle stays open)."""
+    from PIL import Image
+
+    with Image.open(thumbnail_path(src_path, width, cache_dir)) as img:
+        img.load()
+        return img